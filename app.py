@@ -18,6 +18,7 @@
 # nuitka-project: --enable-plugin=anti-bloat
 
 
+import multiprocessing
 import os
 import sys
 from pathlib import Path
@@ -42,14 +43,17 @@ else:
     pass
 ##########################
 
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QApplication
-from app.main_window import MainWindow
+if __name__ == "__main__":
+    # Worker processes of frozen builds start here
+    multiprocessing.freeze_support()
 
-# enable dpi scale
-QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
+    # Spawned worker processes import this file as "__mp_main__". The GUI is only imported by the app itself
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtWidgets import QApplication
+    from app.main_window import MainWindow
 
-if __name__ == "__main__":
+    # enable dpi scale
+    QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
     app = QApplication(sys.argv)
     app.setAttribute(Qt.ApplicationAttribute.AA_DontCreateNativeWidgetSiblings)
 
@@ -0,0 +1,103 @@
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QTimer
+
+import traceback
+from typing import Any, Callable, Iterable, Optional
+
+from module.config.internal.app_args import AppArgs
+from module.logger import logger
+
+
+class _Subscription():
+    __slots__ = ("keys", "slot", "owner")
+
+    def __init__(self, keys: tuple[str, ...], slot: Callable[[dict[str, Any]], None], owner: Optional[QObject]) -> None:
+        self.keys = keys
+        self.slot = slot
+        self.owner = owner
+
+
+class ConfigSubscriptions(QObject):
+    """ Delivers config changes only to the slots subscribed to the changed keys.
+
+    Changes are coalesced until control returns to the event loop. A slot is then invoked once
+    with the latest value of each of its keys that changed, however many times they changed.
+    """
+    _logger = logger
+
+    def __init__(self, parent: Optional[QObject]=None) -> None:
+        super().__init__(parent)
+        self._subscriptions = {} # type: dict[str, list[_Subscription]]
+        self._pending = {}       # type: dict[str, Any]
+        self._dispatchTimer = QTimer(self)
+        self._dispatchTimer.setSingleShot(True)
+        self._dispatchTimer.setInterval(0)
+        self._dispatchTimer.timeout.connect(self.flush)
+
+    def subscribe(self, keys: str | Iterable[str], slot: Callable[[dict[str, Any]], None], owner: Optional[QObject]=None) -> None:
+        """Invoke the slot when any of the keys change.
+
+        Parameters
+        ----------
+        keys : str | Iterable[str]
+            The config keys the slot is interested in.
+
+        slot : Callable[[dict[str, Any]], None]
+            Receives the changed keys mapped to their latest value.
+
+        owner : QObject, optional
+            The subscription ends when the owner is deleted.
+            By default the object of the slot if it is a method of a QObject.
+        """
+        keys = (keys,) if isinstance(keys, str) else tuple(keys)
+        if owner is None and isinstance(getattr(slot, "__self__", None), QObject):
+            owner = slot.__self__
+        subscription = _Subscription(keys, slot, owner)
+        for key in keys:
+            self._subscriptions.setdefault(key, []).append(subscription)
+
+    def unsubscribe(self, slot: Callable[[dict[str, Any]], None]) -> None:
+        for key, subscriptions in list(self._subscriptions.items()):
+            subscriptions = [subscription for subscription in subscriptions if subscription.slot != slot]
+            if subscriptions:
+                self._subscriptions[key] = subscriptions
+            else:
+                del self._subscriptions[key]
+
+    def publish(self, key: str, value: Any) -> None:
+        """ Queue a change of the config key. It is delivered when control returns to the event loop """
+        self._pending[key] = value
+        if not self._dispatchTimer.isActive():
+            self._dispatchTimer.start()
+
+    def flush(self) -> None:
+        """ Deliver the queued changes now. Changes published by the slots are delivered on the next tick """
+        self._dispatchTimer.stop()
+        changes, self._pending = self._pending, {}
+
+        # Each subscription is invoked once, no matter how many of its keys changed
+        subscriptions = {} # type: dict[int, _Subscription]
+        for key in changes:
+            for subscription in self._subscriptions.get(key, []):
+                subscriptions.setdefault(id(subscription), subscription)
+
+        for subscription in subscriptions.values():
+            if subscription.owner is not None and sip.isdeleted(subscription.owner):
+                self._remove(subscription)
+                continue
+            try:
+                subscription.slot({key: changes[key] for key in subscription.keys if key in changes})
+            except Exception:
+                self._logger.error(f"Failed to apply config change of '{", ".join(key for key in subscription.keys if key in changes)}'\n"
+                                   + traceback.format_exc(limit=AppArgs.traceback_limit))
+
+    def _remove(self, subscription: _Subscription) -> None:
+        for key in subscription.keys:
+            subscriptions = self._subscriptions.get(key, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(key, None)
+
+
+configSubscriptions = ConfigSubscriptions()
@@ -0,0 +1,104 @@
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+import os
+from typing import Optional
+
+from module.tools.types.general import StrPath
+
+
+class FileWatcher(QObject):
+    """ Watches files, or the files of a directory, for changes made by other programs.
+
+    Editors usually emit a burst of notifications per save, e.g. when saving through a temporary file.
+    Bursts are coalesced into a single fileChanged signal per file once no changes have arrived for the debounce interval.
+    """
+    fileChanged = pyqtSignal(str) # Path of the changed file
+
+    def __init__(self, debounce: int=500, parent: Optional[QObject]=None) -> None:
+        """
+        Parameters
+        ----------
+        debounce : int, optional
+            Milliseconds without changes before the changed files are reported.
+            By default 500.
+        """
+        super().__init__(parent)
+        self._files = set()   # type: set[str]
+        self._pending = set() # type: set[str]
+        # Size and modification time of the matching files in each watched directory
+        self._directories = {} # type: dict[str, dict[str, tuple[int, int]]]
+        self._suffix = ""
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._onFileChanged)
+        self._watcher.directoryChanged.connect(self._onDirectoryChanged)
+
+        self._debounceTimer = QTimer(self)
+        self._debounceTimer.setSingleShot(True)
+        self._debounceTimer.setInterval(debounce)
+        self._debounceTimer.timeout.connect(self._emitChanges)
+
+    def watchFile(self, path: StrPath) -> None:
+        """ Watch a single file. Replaces anything watched before """
+        self.clear()
+        path = os.path.abspath(path)
+        self._files.add(path)
+        if os.path.isfile(path):
+            self._watcher.addPath(path)
+
+    def watchDirectory(self, path: StrPath, suffix: str=".xml") -> None:
+        """ Watch the files in a directory ending with suffix. Replaces anything watched before """
+        self.clear()
+        path = os.path.abspath(path)
+        self._suffix = suffix
+        self._directories[path] = self._scanDirectory(path)
+        if os.path.isdir(path):
+            self._watcher.addPath(path)
+
+    def clear(self) -> None:
+        self._debounceTimer.stop()
+        self._pending.clear()
+        self._files.clear()
+        self._directories.clear()
+        watched = self._watcher.files() + self._watcher.directories()
+        if watched:
+            self._watcher.removePaths(watched)
+
+    def _scanDirectory(self, path: str) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith(self._suffix):
+                        stat = entry.stat()
+                        snapshot[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            pass
+        return snapshot
+
+    def _onFileChanged(self, path: str) -> None:
+        # Files replaced on save are no longer watched. Watch the new file if it already exists
+        if path not in self._watcher.files() and os.path.isfile(path):
+            self._watcher.addPath(path)
+        self._pending.add(path)
+        self._debounceTimer.start()
+
+    def _onDirectoryChanged(self, path: str) -> None:
+        if path not in self._directories:
+            return
+        snapshot = self._scanDirectory(path)
+        previous = self._directories[path]
+        self._pending.update(file for file, stat in snapshot.items() if previous.get(file) != stat)
+        self._directories[path] = snapshot
+        if self._pending:
+            self._debounceTimer.start()
+
+    def _emitChanges(self) -> None:
+        # The file may have been missing when it was replaced. Watch it again
+        watched = set(self._watcher.files())
+        for path in self._files - watched:
+            if os.path.isfile(path):
+                self._watcher.addPath(path)
+        pending, self._pending = sorted(self._pending), set()
+        for path in pending:
+            if os.path.isfile(path):
+                self.fileChanged.emit(path)
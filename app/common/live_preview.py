@@ -0,0 +1,159 @@
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+
+from collections import deque
+from typing import Callable, Optional
+
+from module.logger import logger
+from module.xml_tools import XMLSubstituter
+
+
+class _RenderSignals(QObject):
+    finished = pyqtSignal(int, list) # Generation, rendered entries. Emitted even if the task was cancelled
+
+
+class _RenderTask(QRunnable):
+    """ Renders the payloads of edited entries on a worker thread """
+
+    def __init__(self, substituter: XMLSubstituter, generation: int, entries: list[tuple[int, str]],
+                 isCancelled: Callable[[int], bool]) -> None:
+        super().__init__()
+        self.signals = _RenderSignals()
+        self._substituter = substituter
+        self._generation = generation
+        self._entries = entries
+        self._isCancelled = isCancelled
+
+    def run(self) -> None:
+        rendered = [] # type: list[tuple[int, str, bool]]
+        try:
+            for row, localization in self._entries:
+                # Newer edits have arrived. Stop as the result would be discarded anyway
+                if self._isCancelled(self._generation):
+                    break
+                result = self._substituter.renderEntry(row, localization)
+                if result is not None:
+                    rendered.append((row, *result))
+        except Exception:
+            logger.warning("Failed to render the live preview", exc_info=True)
+        finally:
+            # The task is released once this is delivered
+            self.signals.finished.emit(self._generation, rendered)
+
+
+class LivePreview(QObject):
+    """ Debounces entry edits and substitutes the edited entries into the cached preview in the background.
+
+    Rendering happens on a worker thread. The rendered entries are handed back to the GUI thread
+    in batches through the entriesRendered signal, one batch per event loop iteration.
+    """
+    entriesRendered = pyqtSignal(list) # Batch of (row, payload, failed)
+
+    def __init__(self, substituter: XMLSubstituter, localizer: Callable[[int], str], debounce: int=300,
+                 batch_size: int=200, parent: Optional[QObject]=None) -> None:
+        """
+        Parameters
+        ----------
+        substituter : XMLSubstituter
+            The substituter holding the cached preview.
+
+        localizer : Callable[[int], str]
+            Returns the current translation of a row.
+
+        debounce : int, optional
+            Milliseconds without edits before rendering starts.
+            By default 300.
+
+        batch_size : int, optional
+            Maximum number of rendered entries handed to the GUI thread per event loop iteration.
+            By default 200.
+        """
+        super().__init__(parent)
+        self._substituter = substituter
+        self._localizer = localizer
+        self._batch_size = batch_size
+        self._enabled = True
+        self._generation = 0
+        self._pending_rows = set()   # type: set[int]
+        self._inflight_rows = set()  # type: set[int]
+        self._rendered = deque()     # type: deque[tuple[int, str, bool]]
+        self._tasks = {}  # type: dict[int, _RenderTask] # Started tasks by generation. Kept alive until their finished signal is delivered
+        self._threadPool = QThreadPool(self)
+        self._threadPool.setMaxThreadCount(1)
+
+        self._debounceTimer = QTimer(self)
+        self._debounceTimer.setSingleShot(True)
+        self._debounceTimer.setInterval(debounce)
+        self._debounceTimer.timeout.connect(self._startRender)
+
+        self._batchTimer = QTimer(self)
+        self._batchTimer.setInterval(0)
+        self._batchTimer.timeout.connect(self._emitBatch)
+
+    def isEnabled(self) -> bool:
+        return self._enabled
+
+    def setEnabled(self, enabled: bool) -> None:
+        self._enabled = enabled
+        if not enabled:
+            self.cancel()
+
+    def isCancelled(self, generation: int) -> bool:
+        return generation != self._generation
+
+    def isIdle(self) -> bool:
+        return not (self._pending_rows or self._inflight_rows or self._rendered)
+
+    def scheduleRows(self, rows: list[int]) -> None:
+        """ Render the rows once no new edits have arrived for the debounce interval """
+        if not self._enabled:
+            return
+        self._pending_rows.update(rows)
+        if self._inflight_rows:
+            # Cancel the in-flight render. Its rows are rendered again with the newer edits
+            self._generation += 1
+            self._pending_rows |= self._inflight_rows
+            self._inflight_rows.clear()
+        self._debounceTimer.start()
+
+    def cancel(self) -> None:
+        """ Discard all pending and in-flight work, e.g. when the preview is regenerated.
+        Returns once no task is rendering, so the substituter can be changed safely afterwards.
+        """
+        self._generation += 1
+        self._debounceTimer.stop()
+        self._batchTimer.stop()
+        self._pending_rows.clear()
+        self._inflight_rows.clear()
+        self._rendered.clear()
+        # A running task stops after the entry it is rendering
+        self._threadPool.waitForDone()
+
+    def _startRender(self) -> None:
+        if not self._pending_rows:
+            return
+        self._generation += 1
+        self._inflight_rows, self._pending_rows = self._pending_rows, set()
+        # Translations are read on the GUI thread, so the worker never touches the model
+        entries = [(row, self._localizer(row)) for row in sorted(self._inflight_rows)]
+        task = _RenderTask(self._substituter, self._generation, entries, self.isCancelled)
+        task.setAutoDelete(False)
+        task.signals.finished.connect(self._onRenderFinished)
+        self._tasks[self._generation] = task
+        self._threadPool.start(task)
+
+    def _onRenderFinished(self, generation: int, rendered: list[tuple[int, str, bool]]) -> None:
+        # The thread pool is done with the task
+        self._tasks.pop(generation, None)
+        if self.isCancelled(generation):
+            return
+        self._inflight_rows.clear()
+        self._rendered.extend(rendered)
+        if not self._batchTimer.isActive():
+            self._batchTimer.start()
+
+    def _emitBatch(self) -> None:
+        batch = [self._rendered.popleft() for _ in range(min(self._batch_size, len(self._rendered)))]
+        if not self._rendered:
+            self._batchTimer.stop()
+        if batch:
+            self.entriesRendered.emit(batch)
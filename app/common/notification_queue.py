@@ -0,0 +1,139 @@
+from PyQt6.QtCore import QObject, Qt, QTimer
+from PyQt6.QtWidgets import QWidget
+
+from typing import Callable, Optional
+
+from app.components.infobar_test import InfoBar, InfoBarIcon, InfoBarPosition
+
+
+class _Notification():
+    __slots__ = ("icon", "title", "content", "orient", "isClosable", "duration", "position", "parent", "count")
+
+    def __init__(self, icon: InfoBarIcon, title: str, content: str, orient: Qt.Orientation, isClosable: bool,
+                 duration: int, position: InfoBarPosition, parent: QWidget) -> None:
+        self.icon = icon
+        self.title = title
+        self.content = content
+        self.orient = orient
+        self.isClosable = isClosable
+        self.duration = duration
+        self.position = position
+        self.parent = parent
+        # Number of notifications merged into this one
+        self.count = 1
+
+
+class NotificationQueue(QObject):
+    """ Shows notifications as info bars without creating a bar for every event.
+
+    Notifications are coalesced by key: all notifications of a key arriving within the coalescing window
+    are merged into the latest one, which is shown with the number of merged notifications.
+    A visible bar of the same key is updated in place instead of being replaced by a new bar.
+    At most maxVisible bars are shown per parent and position. Further notifications wait until a bar closes.
+    """
+
+    def __init__(self, window: int=100, maxVisible: int=3, parent: Optional[QObject]=None) -> None:
+        """
+        Parameters
+        ----------
+        window : int, optional
+            Time in milliseconds to coalesce notifications before showing them.
+            By default 100.
+
+        maxVisible : int, optional
+            Maximum number of visible bars per parent widget and position.
+            By default 3.
+        """
+        super().__init__(parent)
+        self.maxVisible = maxVisible
+        self._pending = {} # type: dict[str, _Notification]
+        self._visible = {} # type: dict[str, InfoBar]
+        self._flushTimer = QTimer(self)
+        self._flushTimer.setSingleShot(True)
+        self._flushTimer.setInterval(window)
+        self._flushTimer.timeout.connect(self._flush)
+
+    def notify(self, key: str, icon: InfoBarIcon, title: str, content: str, orient: Qt.Orientation=Qt.Orientation.Horizontal,
+               isClosable: bool=True, duration: int=1000, position: InfoBarPosition=InfoBarPosition.TOP_RIGHT,
+               parent: Optional[QWidget]=None, singleton: bool=False) -> None:
+        """Queue a notification.
+
+        Parameters
+        ----------
+        key : str
+            Notifications of the same key are coalesced.
+
+        singleton : bool, optional
+            Drop the notification if one of the same key is visible or queued.
+            By default False.
+        """
+        if singleton and self.isActive(key):
+            return
+        notification = _Notification(icon, title, content, orient, isClosable, duration, position, parent)
+        if key in self._pending:
+            # Only the latest notification is shown
+            notification.count += self._pending[key].count
+        self._pending[key] = notification
+        if not self._flushTimer.isActive():
+            self._flushTimer.start()
+
+    def close(self, key: str) -> None:
+        self.closeWhere(lambda k: k == key)
+
+    def closeWhere(self, predicate: Callable[[str], bool]) -> None:
+        """ Drop the queued notifications and close the bars whose key matches the predicate """
+        for key in [key for key in self._pending if predicate(key)]:
+            del self._pending[key]
+        for key, bar in [(key, bar) for key, bar in self._visible.items() if predicate(key)]:
+            self._onClosed(key, bar)
+            bar.close()
+
+    def isActive(self, key: str) -> bool:
+        """ A notification of the key is visible or queued """
+        return key in self._pending or key in self._visible
+
+    def _title(self, title: str, count: int) -> str:
+        return f"{title} ({count})" if count > 1 else title
+
+    def _isFull(self, parent: QWidget, position: InfoBarPosition) -> bool:
+        count = 0
+        for bar in self._visible.values():
+            if bar.parent() is parent and bar.position == position:
+                count += 1
+        return count >= self.maxVisible
+
+    def _flush(self) -> None:
+        for key, notification in list(self._pending.items()):
+            bar = self._visible.get(key)
+            if bar is not None:
+                if bar.icon == notification.icon and bar.parent() is notification.parent and bar.position == notification.position:
+                    bar.setText(self._title(notification.title, notification.count), notification.content)
+                    del self._pending[key]
+                    continue
+                # The style changed. Replace the bar
+                self._onClosed(key, bar)
+                bar.close()
+
+            if self._isFull(notification.parent, notification.position):
+                continue
+            del self._pending[key]
+            bar = InfoBar.new(
+                icon=notification.icon,
+                title=self._title(notification.title, notification.count),
+                content=notification.content,
+                orient=notification.orient,
+                isClosable=notification.isClosable,
+                duration=notification.duration,
+                position=notification.position,
+                parent=notification.parent
+            )
+            self._visible[key] = bar
+            bar.closedpyqtSignal.connect(lambda key=key, bar=bar: self._onClosed(key, bar))
+
+    def _onClosed(self, key: str, bar: InfoBar) -> None:
+        if self._visible.get(key) is not bar:
+            return
+        del self._visible[key]
+        # A slot is free for a waiting notification
+        if self._pending and not self._flushTimer.isActive():
+            self._flushTimer.start()
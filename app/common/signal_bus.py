@@ -6,7 +6,6 @@ class SignalBus(QObject):
     # Config
     configStateChange = pyqtSignal(bool, str, str) # success/failure, title, content # Whenever a config changes state
     configValidationError = pyqtSignal(str, str, str) # config_name, title, content # If a pyqtSignal is received here, it means a validation error occured during saving
-    configUpdated = pyqtSignal(str, tuple) # configkey, tuple[value]
     doSaveConfig = pyqtSignal(str) # config_name
 
     # GUI-related
@@ -15,4 +14,7 @@ class SignalBus(QObject):
     xmlPreviewInvalid = pyqtSignal(bool, bool) # isValid, showErrors
     updateConfigSettings = pyqtSignal(str, tuple) # configkey, tuple[value]
 
+    # Diagnostics
+    metricsUpdated = pyqtSignal(dict) # metrics snapshot
+
 signalBus = SignalBus()
\ No newline at end of file
@@ -23,8 +23,8 @@ class CardStackBase(ScrollArea):
                  labeltext: Optional[str]=None, parent: Optional[QWidget]=None) -> None:
         try:
             super().__init__(parent)
-            self._cards = generator.getCards()
-            self._defaultGroup = generator.getDefaultGroup()
+            self._generator = generator
+            self._sections = {} # type: dict[str, QWidget] # Placeholder of each section. Filled on first activation
             self.titleLabel = QLabel(self.tr(labeltext)) if labeltext else None
             self.view = QWidget(self)
             self.vGeneralLayout = QVBoxLayout(self.view)
@@ -40,10 +40,29 @@ class CardStackBase(ScrollArea):
     @abstractmethod
     def _addSubInterface(self, widget: QWidget, objectName: str, title: str, *args, **kwargs) -> None: ...
 
-    # This method is adding the cards from the generator to the QStackedWidget using the method addSubInterface
+    # This method is adding the sections from the generator to the QStackedWidget using the method addSubInterface
     @abstractmethod
     def _addCards(self) -> None: ...
 
+    def _createSection(self, name: str) -> QWidget:
+        """ Create an empty page for a section. Its cards are generated when the page is first shown """
+        section = QWidget()
+        section.setObjectName(name)
+        layout = QVBoxLayout(section)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self._sections[name] = section
+        return section
+
+    def _loadSection(self, section: QWidget) -> None:
+        """ Generate the cards of a section page if not done yet """
+        name = section.objectName()
+        if self._sections.get(name) is not section:
+            return
+        del self._sections[name]
+        cardGroup = self._generator.generateSection(name)
+        if cardGroup:
+            section.layout().addWidget(cardGroup)
+
     def _initWidget(self) -> None:
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setViewportMargins(0, 0, 0, 0)
@@ -67,15 +86,21 @@ class CardStackBase(ScrollArea):
         self.vGeneralLayout.addWidget(self.stackedWidget)
         self.vGeneralLayout.setContentsMargins(0, 0, 0, 0)
 
-        self.stackedWidget.setCurrentWidget(self._defaultGroup) # Set Group shown on app start
-        self.pivot.setCurrentItem(self._defaultGroup.objectName()) # Set Group marked as selected on app start
-        qrouter.setDefaultRouteKey(self.stackedWidget, self._defaultGroup.objectName()) # Set navigation history to default Group
+        defaultName = self._generator.getDefaultSectionName()
+        if defaultName is None:
+            return
+        defaultSection = self.stackedWidget.findChild(QWidget, defaultName) # type: QWidget
+        self._loadSection(defaultSection)
+        self.stackedWidget.setCurrentWidget(defaultSection) # Set Group shown on app start
+        self.pivot.setCurrentItem(defaultName) # Set Group marked as selected on app start
+        qrouter.setDefaultRouteKey(self.stackedWidget, defaultName) # Set navigation history to default Group
 
     def _connectpyqtSignalToSlot(self) -> None:
         self.stackedWidget.currentChanged.connect(self._onCurrentIndexChanged)
 
     def _onCurrentIndexChanged(self, index) -> None:
         widget = self.stackedWidget.widget(index)
+        self._loadSection(widget)
         self.pivot.setCurrentItem(widget.objectName())
         qrouter.push(self.stackedWidget, widget.objectName())
 
@@ -115,9 +140,8 @@ class PivotCardStack(CardStackBase):
 
     @override
     def _addCards(self) -> None:
-        for group in self._cards:
-            name = group.getTitleLabel().text()
-            self._addSubInterface(widget=group, objectName=name, title=name)
+        for name in self._generator.getSectionNames():
+            self._addSubInterface(widget=self._createSection(name), objectName=name, title=name)
 
     @override
     def _addSubInterface(self, widget: QWidget, objectName: str, title: str) -> None:
@@ -177,9 +201,9 @@ class SegmentedPivotCardStack(CardStackBase):
 
     @override
     def _addCards(self) -> None:
-        for group in self._cards:
-            name = group.getTitleLabel().text()
-            self._addSubInterface(widget=group, objectName=name, title=name, icon=self.icons.get(name.lower(), FIF.CANCEL_MEDIUM))
+        for name in self._generator.getSectionNames():
+            self._addSubInterface(widget=self._createSection(name), objectName=name, title=name,
+                                  icon=self.icons.get(name.lower(), FIF.CANCEL_MEDIUM))
 
     @override
     def _addSubInterface(self, widget: QWidget, objectName: str, title: str,
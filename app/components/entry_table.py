@@ -0,0 +1,349 @@
+from qfluentwidgets import PushButton, TableView
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QHeaderView, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+
+from typing import Any, Iterable, Iterator, Optional
+
+from app.common.stylesheet import StyleSheet
+
+from module.xml_tools import XMLParser
+from module.xml_tools.color_codes import ColorCodedText, scanColorCodes
+from module.xml_tools.xml_exchange import TranslationUnit
+
+
+class EntryTableModel(QAbstractTableModel):
+    """ Table of the entries extracted by the parser. Rows are loaded lazily in batches """
+    translationChanged = pyqtSignal(int, str) # Row, translation
+    translationsChanged = pyqtSignal(list) # Rows with changed translations
+
+    ID, SOURCE, TRANSLATION, STATUS = range(4)
+    headers = ["ID", "Source", "Translation", "Status"]
+    batch_size = 256
+
+    def __init__(self, parser: XMLParser, parent: Optional[QWidget]=None) -> None:
+        super().__init__(parent)
+        self._parser = parser
+        self._parsed_lines = []  # type: list[str]
+        self._source_text = []   # type: list[str]
+        self._entry_ids = []     # type: list[str | None]
+        self._translations = []  # type: list[str]
+        self._failed_rows = set() # type: set[int]
+        self._loaded_rows = 0
+
+    def loadEntries(self) -> None:
+        """ Reset the table to the entries of the latest parse """
+        self.beginResetModel()
+        # Copied as the parser reuses its lists when parsing again
+        self._parsed_lines = list(self._parser.getParsedLines())
+        self._source_text = list(self._parser.getExtractedText())
+        self._entry_ids = [None] * len(self._parsed_lines)
+        self._translations = [""] * len(self._parsed_lines)
+        self._failed_rows.clear()
+        self._loaded_rows = min(self.batch_size, len(self._parsed_lines))
+        self.endResetModel()
+
+    def reloadEntries(self) -> list[int]:
+        """Update the table to the entries of the latest parse without resetting unchanged entries.
+        Translations are kept for entries whose line is unchanged.
+
+        Returns
+        -------
+        list[int]
+            The rows whose entry is new or changed.
+        """
+        parsed_lines = list(self._parser.getParsedLines())
+        source_text = list(self._parser.getExtractedText())
+        if parsed_lines == self._parsed_lines and source_text == self._source_text:
+            return []
+
+        if len(parsed_lines) == len(self._parsed_lines):
+            # Same layout. Only update the changed rows
+            changed_rows = [row for row, line in enumerate(parsed_lines)
+                            if line != self._parsed_lines[row] or source_text[row] != self._source_text[row]]
+            self._parsed_lines, self._source_text = parsed_lines, source_text
+            for row in changed_rows:
+                self._entry_ids[row] = None
+                self._translations[row] = ""
+                self._failed_rows.discard(row)
+                if row < self._loaded_rows:
+                    self.dataChanged.emit(self.index(row, self.ID), self.index(row, self.STATUS))
+            return changed_rows
+
+        # Entries were added or removed. Match the unchanged entries by their line
+        previous_lines = set(self._parsed_lines)
+        translations = {line: translation for line, translation in zip(self._parsed_lines, self._translations) if translation}
+        self.beginResetModel()
+        self._parsed_lines, self._source_text = parsed_lines, source_text
+        self._entry_ids = [None] * len(parsed_lines)
+        self._translations = [translations.get(line, "") for line in parsed_lines]
+        self._failed_rows.clear()
+        self._loaded_rows = min(max(self._loaded_rows, self.batch_size), len(parsed_lines))
+        self.endResetModel()
+        return [row for row, line in enumerate(parsed_lines) if line not in previous_lines]
+
+    def rowCount(self, parent: QModelIndex=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded_rows
+
+    def columnCount(self, parent: QModelIndex=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.headers)
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return not parent.isValid() and self._loaded_rows < len(self._parsed_lines)
+
+    def fetchMore(self, parent: QModelIndex) -> None:
+        if parent.isValid():
+            return
+        count = min(self.batch_size, len(self._parsed_lines) - self._loaded_rows)
+        self.beginInsertRows(QModelIndex(), self._loaded_rows, self._loaded_rows + count - 1)
+        self._loaded_rows += count
+        self.endInsertRows()
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int=Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.tr(self.headers[section])
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        flags = super().flags(index)
+        if index.isValid() and index.column() == self.TRANSLATION and self._source_text[index.row()]:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index: QModelIndex, role: int=Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        row, column = index.row(), index.column()
+        if column == self.ID:
+            return self.entryID(row)
+        elif column == self.SOURCE:
+            return self._source_text[row]
+        elif column == self.TRANSLATION:
+            return self._translations[row]
+        return self.tr(self.status(row))
+
+    def setData(self, index: QModelIndex, value: Any, role: int=Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or index.column() != self.TRANSLATION or role != Qt.ItemDataRole.EditRole:
+            return False
+        row = index.row()
+        translation = str(value).strip()
+        if translation == self._translations[row]:
+            return False
+        self._translations[row] = translation
+        self._emitRowChanged(row)
+        self.translationChanged.emit(row, translation)
+        return True
+
+    def _emitRowChanged(self, row: int) -> None:
+        if row < self._loaded_rows:
+            self.dataChanged.emit(self.index(row, self.TRANSLATION), self.index(row, self.STATUS))
+
+    def entryID(self, row: int) -> str:
+        # Entry IDs are only looked up for rows that are displayed
+        if self._entry_ids[row] is None:
+            self._entry_ids[row] = self._parser.formatEntryID(self._parsed_lines[row], "")
+        return self._entry_ids[row]
+
+    def status(self, row: int) -> str:
+        if not self._source_text[row]:
+            return "Empty"
+        elif not self._translations[row]:
+            return "Missing"
+        elif row in self._failed_rows:
+            return "Color codes mismatch"
+        return "Translated"
+
+    def setRowFailed(self, row: int, failed: bool) -> None:
+        if failed == (row in self._failed_rows):
+            return
+        if failed:
+            self._failed_rows.add(row)
+        else:
+            self._failed_rows.discard(row)
+        self._emitRowChanged(row)
+
+    def setFailedLines(self, failed_lines: list[str]) -> None:
+        """ Mark the rows of the parsed lines which failed to translate """
+        failed_lines = set(failed_lines)
+        self._failed_rows = {row for row, line in enumerate(self._parsed_lines) if line in failed_lines}
+        if self._loaded_rows:
+            self.dataChanged.emit(self.index(0, self.STATUS), self.index(self._loaded_rows - 1, self.STATUS))
+
+    def setTranslations(self, translations: list[str]) -> int:
+        """Assign translations to the rows with source text in order.
+
+        Returns
+        -------
+        int
+            The number of translations minus the number of rows with source text.
+            Negative if translations are missing, positive if there are too many.
+        """
+        translations = iter(translations)
+        excess = 0
+        changed_rows = [] # type: list[int]
+        for row, text in enumerate(self._source_text):
+            if text:
+                translation = next(translations, None)
+                if translation is None:
+                    excess -= 1
+                    translation = ""
+                # Only rows whose translation differs from the previous one are updated
+                if translation != self._translations[row]:
+                    self._translations[row] = translation
+                    changed_rows.append(row)
+        excess += sum(1 for _ in translations)
+
+        if changed_rows:
+            first, last = changed_rows[0], min(changed_rows[-1], self._loaded_rows - 1)
+            if first <= last:
+                self.dataChanged.emit(self.index(first, self.TRANSLATION), self.index(last, self.STATUS))
+            self.translationsChanged.emit(changed_rows)
+        return excess
+
+    def setTranslationsByID(self, units: Iterable[TranslationUnit]) -> tuple[int, int, int]:
+        """Assign translations to the rows of their entry id. Units without a translation are skipped.
+
+        Translations of color coded entries which kept the color codes, e.g. exported as CDATA text,
+        are converted to the delimited form of the table. They are rejected if their text does not line up with the color codes.
+
+        Returns
+        -------
+        tuple[int, int, int]
+            The number of translated rows, the number of units whose entry id is not in the table
+            and the number of rejected translations.
+        """
+        rows = {} # type: dict[str, list[int]]
+        for row, text in enumerate(self._source_text):
+            if text:
+                rows.setdefault(self.entryID(row), []).append(row)
+        entry_color_codes = self._parser.getEntryColorCodes()
+        line_numbers = self._parser.getParsedLineNumbers()
+        delimiter = self._parser.getColorCodeDelimiter()
+        translated, unknown, rejected = 0, 0, 0
+        changed_rows = [] # type: list[int]
+        for unit in units:
+            if not unit.target:
+                continue
+            if unit.entry_id not in rows:
+                unknown += 1
+                continue
+            for row in rows[unit.entry_id]:
+                target = unit.target
+                color_coded_text = entry_color_codes.get(line_numbers[row]) # type: ColorCodedText | None
+                if color_coded_text is not None and ColorCodedText.TAG in scanColorCodes(target)[::3]:
+                    target = color_coded_text.extractTranslation(target, delimiter)
+                    if target is None:
+                        rejected += 1
+                        continue
+                translated += 1
+                if target != self._translations[row]:
+                    self._translations[row] = target
+                    changed_rows.append(row)
+
+        if changed_rows:
+            changed_rows.sort()
+            first, last = changed_rows[0], min(changed_rows[-1], self._loaded_rows - 1)
+            if first <= last:
+                self.dataChanged.emit(self.index(first, self.TRANSLATION), self.index(last, self.STATUS))
+            self.translationsChanged.emit(changed_rows)
+        return translated, unknown, rejected
+
+    def iterUnits(self) -> Iterator[TranslationUnit]:
+        """ The rows with source text as units to exchange with translation tools """
+        positions = self._parser.getInputLinePositions()
+        for row, text in enumerate(self._source_text):
+            if text:
+                yield TranslationUnit(self.entryID(row), text, self._translations[row], positions.get(self._parsed_lines[row], ""))
+
+    def restoreTranslations(self, translations: dict[str, str], failed_lines: list[str]) -> None:
+        """Restore the translations of a project.
+
+        Parameters
+        ----------
+        translations : dict[str, str]
+            Translations keyed by the parsed line of their entry. Lines no longer in the table are skipped.
+
+        failed_lines : list[str]
+            The parsed lines which failed to translate.
+        """
+        changed_rows = [] # type: list[int]
+        for row, line in enumerate(self._parsed_lines):
+            translation = translations.get(line, "")
+            if translation != self._translations[row]:
+                self._translations[row] = translation
+                changed_rows.append(row)
+        self.setFailedLines(failed_lines)
+        if changed_rows:
+            if self._loaded_rows:
+                self.dataChanged.emit(self.index(0, self.TRANSLATION), self.index(self._loaded_rows - 1, self.STATUS))
+            self.translationsChanged.emit(changed_rows)
+
+    def clearTranslations(self) -> None:
+        self.setTranslations([])
+
+    def getSourceText(self) -> list[str]:
+        """ Source text of all rows with source text """
+        return [text for text in self._source_text if text]
+
+    def getLocalizedText(self) -> list[str]:
+        """ Translations of all rows with source text. Untranslated rows keep their source text """
+        return [self.localizedText(row) for row, text in enumerate(self._source_text) if text]
+
+    def getTranslations(self) -> list[str]:
+        """ Translations of all rows. Empty if untranslated """
+        return self._translations
+
+    def getFailedRows(self) -> set[int]:
+        return self._failed_rows
+
+    def localizedText(self, row: int) -> str:
+        return self._translations[row] or self._source_text[row]
+
+    def parsedLine(self, row: int) -> str:
+        return self._parsed_lines[row]
+
+    def hasTranslations(self) -> bool:
+        return any(self._translations)
+
+
+class EntryTableView(QWidget):
+    def __init__(self, label: str, model: EntryTableModel, parent: Optional[QWidget]=None) -> None:
+        super().__init__(parent)
+        self.setContentsMargins(0, 0, 0, 0)
+        self.label = QLabel(self.tr(label))
+        self.tableView = TableView(self)
+        self.clearButton = None
+        self.vBoxLayout = QVBoxLayout(self)
+        self.buttonLayout = QHBoxLayout()
+
+        self.tableView.setModel(model)
+        self.tableView.setWordWrap(False)
+        self.tableView.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.tableView.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked | QAbstractItemView.EditTrigger.EditKeyPressed)
+        self.tableView.verticalHeader().hide()
+        self.tableView.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.tableView.horizontalHeader().setSectionResizeMode(EntryTableModel.SOURCE, QHeaderView.ResizeMode.Stretch)
+        self.tableView.horizontalHeader().setSectionResizeMode(EntryTableModel.TRANSLATION, QHeaderView.ResizeMode.Stretch)
+
+        self.buttonLayout.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.buttonLayout.setSpacing(20)
+
+        self.vBoxLayout.setContentsMargins(0, 0, 0, 0)
+        self.vBoxLayout.addWidget(self.label, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.vBoxLayout.addWidget(self.tableView, stretch=2)
+        self.vBoxLayout.addLayout(self.buttonLayout)
+
+        self.label.setObjectName("Label")
+        self.setObjectName("entryTableView")
+        StyleSheet.INPUT_VIEW.apply(self)
+
+    def model(self) -> EntryTableModel:
+        return self.tableView.model()
+
+    def addButton(self, button: QWidget) -> None:
+        self.buttonLayout.addWidget(button)
+
+    def enableClearButton(self) -> None:
+        if self.clearButton is None:
+            self.clearButton = PushButton(self.tr("Clear"), self)
+            self.clearButton.clicked.connect(self.model().clearTranslations)
+            self.buttonLayout.addWidget(self.clearButton)
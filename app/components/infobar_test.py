@@ -118,6 +118,8 @@ class InfoBar(QFrame):
         self.opacityEffect = QGraphicsOpacityEffect(self)
         self.opacityAni = QPropertyAnimation(
             self.opacityEffect, b'opacity', self)
+        self.durationTimer = QTimer(self)
+        self.durationTimer.setSingleShot(True)
 
         self.lightBackgroundColor = None
         self.darkBackgroundColor = None
@@ -137,6 +139,8 @@ class InfoBar(QFrame):
         self.__initLayout()
 
         self.closeButton.clicked.connect(self.close)
+        self.durationTimer.timeout.connect(self.__fadeOut)
+        self.opacityAni.finished.connect(self.close)
 
     def __initLayout(self):
         self.hBoxLayout.setContentsMargins(6, 6, 6, 6)
@@ -189,7 +193,6 @@ class InfoBar(QFrame):
         self.opacityAni.setDuration(200)
         self.opacityAni.setStartValue(1)
         self.opacityAni.setEndValue(0)
-        self.opacityAni.finished.connect(self.close)
         self.opacityAni.start()
 
     def _adjustText(self):
@@ -204,6 +207,22 @@ class InfoBar(QFrame):
         self.contentLabel.setText(TextWrap.wrap(self.content, chars, False)[0])
         self.adjustSize()
 
+    def setText(self, title: str, content: str):
+        """ replace the title and content of a visible info bar and restart its duration """
+        self.title = title
+        self.content = content
+        self.titleLabel.setVisible(bool(self.title))
+        self.contentLabel.setVisible(bool(self.content))
+        self._adjustText()
+
+        self.opacityAni.stop()
+        self.opacityEffect.setOpacity(1)
+        if self.duration >= 0:
+            self.durationTimer.start(self.duration)
+
+        if self.position != InfoBarPosition.NONE:
+            InfoBarManager.make(self.position).relayout(self.parent())
+
     def addWidget(self, widget: QWidget, stretch=0):
         """ add widget to info bar """
         self.widgetLayout.addSpacing(6)
@@ -238,7 +257,7 @@ class InfoBar(QFrame):
         super().showEvent(e)
 
         if self.duration >= 0:
-            QTimer.singleShot(self.duration, self.__fadeOut)
+            self.durationTimer.start(self.duration)
 
         if self.position != InfoBarPosition.NONE:
             manager = InfoBarManager.make(self.position)
@@ -367,6 +386,11 @@ class InfoBarManager(QObject):
         self._updateDropAni(p)
         self.aniGroups[p].start()
 
+    def relayout(self, parent: QWidget):
+        """ move the info bars of the parent to their positions, e.g. after their size changed """
+        for bar in self.infoBars.get(parent, []):
+            bar.move(self._pos(bar))
+
     def _createSlideAni(self, infoBar: InfoBar):
         slideAni = QPropertyAnimation(infoBar, b'pos')
         slideAni.setEasingCurve(QEasingCurve.Type.OutQuad)
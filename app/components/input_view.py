@@ -1,5 +1,6 @@
 from qfluentwidgets import PushButton
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel
+from PyQt6.QtGui import QTextCursor
 from PyQt6.QtCore import Qt, pyqtBoundSignal
 
 from typing import Optional
@@ -52,4 +53,13 @@ class InputView(QWidget):
         self.textArea.textEdit.setText(text)
 
     def text(self) -> str:
-        return self.textArea.textEdit.toPlainText()
\ No newline at end of file
+        return self.textArea.textEdit.toPlainText()
+
+    def replaceLine(self, line_index: int, text: str) -> None:
+        """ Replace a single line of the text without resetting the rest of the document """
+        block = self.textArea.textEdit.document().findBlockByNumber(line_index)
+        if not block.isValid():
+            return
+        cursor = QTextCursor(block)
+        cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock, QTextCursor.MoveMode.KeepAnchor)
+        cursor.insertText(text)
\ No newline at end of file
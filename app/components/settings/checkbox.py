@@ -4,6 +4,7 @@ from PyQt6.QtCore import pyqtBoundSignal
 
 from typing import Any, Optional
 
+from app.common.config_subscriptions import configSubscriptions
 from app.common.signal_bus import signalBus
 from app.components.settings.base_setting import BaseSetting
 
@@ -58,7 +59,7 @@ class CheckBox_(BaseSetting):
             self.buttonlayout.addWidget(self.checkbox)
 
             self.__connectSignalToSlot()
-            signalBus.configUpdated.emit(self.configkey, (self.currentValue,))
+            configSubscriptions.publish(self.configkey, self.currentValue)
         except Exception:
             self.deleteLater()
             raise
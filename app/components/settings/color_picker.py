@@ -4,6 +4,7 @@ from PyQt6.QtGui import QColor
 
 from typing import Any, Optional
 
+from app.common.config_subscriptions import configSubscriptions
 from app.common.signal_bus import signalBus
 from app.components.settings.base_setting import BaseSetting
 
@@ -49,7 +50,7 @@ class ColorPicker(BaseSetting):
             self.buttonlayout.addWidget(self.colorbutton)
 
             self.__connectSignalToSlot()
-            signalBus.configUpdated.emit(self.configkey, (self.currentValue,))
+            configSubscriptions.publish(self.configkey, self.currentValue)
         except Exception:
             self.deleteLater()
             raise
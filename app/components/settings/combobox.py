@@ -3,6 +3,7 @@ from PyQt6.QtWidgets import QWidget
 
 from typing import Any, Optional, Union
 
+from app.common.config_subscriptions import configSubscriptions
 from app.common.signal_bus import signalBus
 from app.components.settings.base_setting import BaseSetting
 
@@ -65,7 +66,7 @@ class ComboBox_(BaseSetting):
             self.buttonlayout.addWidget(self.comboBox)
 
             self.__connectSignalToSlot()
-            signalBus.configUpdated.emit(self.configkey, (self.currentValue,))
+            configSubscriptions.publish(self.configkey, self.currentValue)
         except Exception:
             self.deleteLater()
             raise
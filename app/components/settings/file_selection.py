@@ -3,6 +3,7 @@ from PyQt6.QtWidgets import QWidget, QFileDialog
 
 from typing import Any, Optional
 
+from app.common.config_subscriptions import configSubscriptions
 from app.common.signal_bus import signalBus
 from app.components.settings.base_setting import BaseSetting
 
@@ -59,7 +60,7 @@ class FileSelect(BaseSetting):
             self.buttonlayout.addWidget(self.selectButton)
 
             self.__connectSignalToSlot()
-            signalBus.configUpdated.emit(self.configkey, (self.currentValue,))
+            configSubscriptions.publish(self.configkey, self.currentValue)
         except Exception:
             self.deleteLater()
             raise
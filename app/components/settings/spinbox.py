@@ -3,6 +3,7 @@ from PyQt6.QtWidgets import QWidget
 
 from typing import Any, Optional
 
+from app.common.config_subscriptions import configSubscriptions
 from app.common.signal_bus import signalBus
 from app.components.settings.base_setting import BaseSetting
 
@@ -67,7 +68,7 @@ class SpinBox_(BaseSetting):
             self.buttonlayout.addWidget(self.spinboxButton)
 
             self.__connectSignalToSlot()
-            signalBus.configUpdated.emit(self.configkey, (self.currentValue,))
+            configSubscriptions.publish(self.configkey, self.currentValue)
         except Exception:
             self.deleteLater()
             raise
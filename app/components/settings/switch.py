@@ -5,6 +5,7 @@ from PyQt6.QtCore import pyqtBoundSignal
 
 from typing import Any, Optional
 
+from app.common.config_subscriptions import configSubscriptions
 from app.common.signal_bus import signalBus
 from app.components.settings.base_setting import BaseSetting
 
@@ -60,7 +61,7 @@ class Switch(BaseSetting):
             self.buttonlayout.addWidget(self.switchButton)
 
             self.__connectSignalToSlot()
-            signalBus.configUpdated.emit(self.configkey, (self.currentValue,))
+            configSubscriptions.publish(self.configkey, self.currentValue)
         except Exception:
             self.deleteLater()
             raise
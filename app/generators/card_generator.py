@@ -76,7 +76,8 @@ class CardGenerator(GeneratorBase):
             parent=parent
         )
         self._icons = icons if icons else FIF.LEAF
-        self._cards = self._generateCards(ScrollSettingCardGroup)
+        # Card groups are created per section when requested
+        self._indexSections(ScrollSettingCardGroup)
 
     @override
     def _createCard(self, cardType: UITypes, setting: str, options: str, content: str,
@@ -2,7 +2,8 @@ from abc import abstractmethod
 from PyQt6.QtWidgets import QWidget
 from typing import Optional
 
-from app.generators.generator_tools import connectUIGroups, inferType, parseUnit, updateCardGrouping
+from app.generators.generator_tools import connectUIGroups, parseUnit, updateCardGrouping
+from app.generators.template_index import TemplateIndex
 from app.components.settings.checkbox import CheckBox_
 from app.components.settings.color_picker import ColorPicker
 from app.components.settings.combobox import ComboBox_
@@ -15,7 +16,6 @@ from app.components.settings.switch import Switch
 from module.config.internal.app_args import AppArgs
 from module.config.templates.template_enums import UITypes
 from module.config.tools.template_options.groups import Group
-from module.config.tools.template_parser import TemplateParser
 from module.logger import logger
 from module.tools.types.config import AnyConfig
 from module.tools.types.gui_cardgroups import AnyCardGroup
@@ -41,8 +41,11 @@ class GeneratorBase():
         self._hide_group_label = hide_group_label
         self._parent = parent
         self._card_sort_order = {} # type: dict[str, list]    # Mapping of the correct card sort order.
-        self._card_list = []       # type: list[AnyCardGroup] # Temp placement of unsorted cards.
         self._cards = []           # type: list[AnyCardGroup] # The cards sorted correctly.
+        self._CardGroup = None     # type: type[AnyCardGroup] | None # The card group type of each section.
+        self._template_index = None # type: TemplateIndex | None # The compiled template.
+        self._section_names = []   # type: list[str] # Sections with at least one card, in template order.
+        self._generated = {}       # type: dict[str, AnyCardGroup | None] # Card group of each generated section.
 
     @abstractmethod
     def _createCard(self, cardType: UITypes, setting: str, options: dict, content: str,
@@ -150,63 +153,84 @@ class GeneratorBase():
                                 + f"Expected one of '{iterToString(UITypes._member_names_, separator=', ')}'")
         return widget
 
-    def _generateCards(self, CardGroup: AnyCardGroup) -> list[AnyCardGroup]:
-        template = self._template.getTemplate()
-        template_parser = TemplateParser()
-        template_parser.parse(self._template_name, template)
-
-        for section_name, section in template.items():
-            card_group = CardGroup(f"{section_name}", self._parent) # type: AnyCardGroup
-            for setting, options in section.items():
-
-                if "ui_exclude" in options and options["ui_exclude"]:
-                    self._logger.debug(f"Config '{self._template_name}': Excluding setting '{setting}' from settings panel")
-                    continue
-
-                # Parse the ui_group
-                raw_group = f"{options["ui_group"]}" if "ui_group" in options else None
-
-                # Split the ui_groups associated with this setting
-                formatted_groups = template_parser.formatGroup(self._template_name, raw_group) if raw_group else None
-
-                # If multiple groups are defined for a setting, the first is considered the main group
-                main_group = template_parser.getGroup(self._template_name, formatted_groups[0]) if formatted_groups else None
-                all_groups = [template_parser.getGroup(self._template_name, group) for group in formatted_groups] if formatted_groups else None
-
-                card = self._createCard(
-                    cardType=inferType(setting, options, self._template_name),
-                    setting=setting,
-                    options=options,
-                    content=options["ui_desc"] if "ui_desc" in options else "",
-                    group=main_group,
-                    parent=card_group
-                )
-                if card:
-                        if updateCardGrouping(
-                            setting=setting,
-                            cardGroup=card_group,
-                            card=card,
-                            groups=all_groups
-                        ): self._updateCardSortOrder(card, card_group)
-                else:
-                    self._logger.warn(f"Config '{self._template_name}': Could not add setting '{setting}' to settings panel")
-
-            if self._hide_group_label:
-                card_group.getTitleLabel().setHidden(True)
-
-            if self._default_group:
-                if self._default_group == card_group.getTitleLabel().text():
-                    self._default_group = card_group
+    def _indexSections(self, CardGroup: type[AnyCardGroup]) -> None:
+        """Compile the template to find the sections which have cards and the sections linked to each by UI groups.
+        No widgets are created.
+        """
+        self._CardGroup = CardGroup
+        self._template_index = TemplateIndex.compile(self._template)
+        self._section_names = list(self._template_index.getSectionNames())
+
+        if isinstance(self._default_group, str) and self._default_group not in self._section_names:
+            self._logger.warn(f"Config '{self._template_name}': Default group '{self._default_group}' not found")
+            self._default_group = None
+        if not self._default_group and self._section_names:
+            self._default_group = self._section_names[0]
+
+    def _generateSection(self, section_name: str) -> AnyCardGroup:
+        card_group = self._CardGroup(f"{section_name}", self._parent) # type: AnyCardGroup
+        for setting in self._template_index.getSettings(section_name):
+            # If multiple groups are defined for a setting, the first is considered the main group
+            card = self._createCard(
+                cardType=setting.card_type,
+                setting=setting.name,
+                options=setting.options,
+                content=setting.options["ui_desc"] if "ui_desc" in setting.options else "",
+                group=setting.groups[0] if setting.groups else None,
+                parent=card_group
+            )
+            if card:
+                    if updateCardGrouping(
+                        setting=setting.name,
+                        cardGroup=card_group,
+                        card=card,
+                        groups=setting.groups
+                    ): self._updateCardSortOrder(card, card_group)
             else:
-                self._default_group = card_group
+                self._logger.warn(f"Config '{self._template_name}': Could not add setting '{setting.name}' to settings panel")
+
+        if self._hide_group_label:
+            card_group.getTitleLabel().setHidden(True)
+        return card_group
 
-            self._card_list.append(card_group)
+    def generateSection(self, section_name: str) -> AnyCardGroup | None:
+        """Create the card group of a section of the template.
+        Sections linked to it by UI groups are created as well, since the cards of a UI group are connected to each other.
 
-        final_all_groups = Group.getAllGroups(self._template_name)
-        if final_all_groups:
-            connectUIGroups(final_all_groups)
-        self._addCardsBySortOrder()
-        return self._card_list
+        Parameters
+        ----------
+        section_name : str
+            One of the names returned by getSectionNames.
+
+        Returns
+        -------
+        AnyCardGroup | None
+            The card group of the section. None if it has no cards.
+        """
+        if section_name in self._generated:
+            return self._generated[section_name]
+
+        card_groups = {} # type: dict[str, AnyCardGroup]
+        for linked in self._template_index.getLinkedSections(section_name):
+            card_groups[linked] = self._generateSection(linked)
+
+        # The UI groups are connected in template order, as the order of nested cards depends on it
+        groups = self._template_index.getLinkedGroups(section_name)
+        if groups:
+            connectUIGroups(groups)
+
+        for linked, card_group in card_groups.items():
+            self._generated[linked] = card_group if self._addCardsBySortOrder(card_group) else None
+        self._cards = [self._generated[name] for name in self._section_names if self._generated.get(name)]
+        return self._generated[section_name]
+
+    def _generateCards(self, CardGroup: type[AnyCardGroup]) -> list[AnyCardGroup]:
+        """ Create the card groups of all sections """
+        if self._CardGroup is None:
+            self._indexSections(CardGroup)
+        for section_name in self._section_names:
+            self.generateSection(section_name)
+        return self._cards
 
     def _updateCardSortOrder(self, card: AnySettingCard,
                             cardGroup: AnyCardGroup) -> None:
@@ -215,23 +239,27 @@ class GeneratorBase():
             self._card_sort_order |= {card_group_name: []}
         self._card_sort_order.get(card_group_name).append(card)
 
-    def _addCardsBySortOrder(self) -> None:
-        for i, card_group in enumerate(self._getCardList()):
-            cards = self._card_sort_order.get(f"{card_group}")
-            if cards:
-                for card in cards:
-                    card_group.addSettingCard(card)
-            else:
-                self._logger.warn(f"Config '{self._template_name}': Empty card group detected! Card group '{card_group.getTitleLabel().text()}' has no cards assigned to it. Removing")
-                card_group.deleteLater()
-                del self._getCardList()[i]
+    def _addCardsBySortOrder(self, card_group: AnyCardGroup) -> bool:
+        """ Add the cards of the card group in the correct order. Returns False if the card group is empty """
+        cards = self._card_sort_order.get(f"{card_group}")
+        if cards:
+            for card in cards:
+                card_group.addSettingCard(card)
+            return True
+        self._logger.warn(f"Config '{self._template_name}': Empty card group detected! Card group '{card_group.getTitleLabel().text()}' has no cards assigned to it. Removing")
+        card_group.deleteLater()
+        return False
 
-    def _getCardList(self) -> list[AnyCardGroup]:
-        """ Temp placement of unsorted cards """
-        return self._card_list
+    def getSectionNames(self) -> list[str]:
+        """ The sections of the template which have cards. Each section is a card group """
+        return self._section_names
 
     def getCards(self) -> list[AnyCardGroup]:
-        return self._cards
+        """ The card groups of all sections. Sections not generated yet are generated """
+        return self._generateCards(self._CardGroup)
+
+    def getDefaultSectionName(self) -> str | None:
+        return self._default_group if isinstance(self._default_group, str) else None
 
-    def getDefaultGroup(self) -> AnyCardGroup:
-        return self._default_group
\ No newline at end of file
+    def getDefaultGroup(self) -> AnyCardGroup | None:
+        return self.generateSection(self._default_group) if self._default_group else None
\ No newline at end of file
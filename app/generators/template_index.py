@@ -0,0 +1,148 @@
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple, Self
+
+from app.generators.generator_tools import inferType
+
+from module.config.templates.template_enums import UIGroups, UITypes
+from module.config.tools.template_options.groups import Group
+from module.config.tools.template_parser import TemplateParser
+from module.logger import logger
+from module.tools.types.templates import AnyTemplate
+
+
+class IndexedSetting(NamedTuple):
+    name: str
+    section: str
+    options: Mapping[str, Any]
+    card_type: UITypes | None
+    groups: tuple[Group, ...] # The first group is the main group of the setting
+    is_nested: bool           # The card is added to its parent card instead of the card group
+
+
+class TemplateIndex():
+    """The compiled form of a template used to generate cards.
+
+    The template is walked once and every lookup needed during generation is resolved up front:
+    the card type and UI groups of each setting, the settings of each section and the sections
+    linked to each other by UI groups. The index is immutable and cached per template.
+    """
+    _logger = logger
+    _cache = {} # type: dict[str, TemplateIndex]
+
+    def __init__(self, template_name: str, template: dict) -> None:
+        self._template_name = template_name
+        template_parser = TemplateParser()
+        template_parser.parse(template_name, template)
+
+        sections = {}           # type: dict[str, tuple[IndexedSetting, ...]]
+        section_names = []      # type: list[str]
+        section_groups = {}     # type: dict[str, set[str]]
+        group_sections = {}     # type: dict[str, set[str]]
+        for section_name, section in template.items():
+            settings = []       # type: list[IndexedSetting]
+            has_cards = False
+            section_groups[section_name] = set()
+            for setting, options in section.items():
+                if "ui_exclude" in options and options["ui_exclude"]:
+                    self._logger.debug(f"Config '{template_name}': Excluding setting '{setting}' from settings panel")
+                    continue
+                groups = self._getSettingGroups(template_parser, options)
+                # Nested settings are added to their parent card instead of the card group (see updateCardGrouping)
+                is_nested = False
+                for group in groups:
+                    section_groups[section_name].add(group.getGroupName())
+                    group_sections.setdefault(group.getGroupName(), set()).add(section_name)
+                    if setting != group.getParentName() and UIGroups.NESTED_CHILDREN in (group.getUIGroupParent() or []):
+                        is_nested = True
+                has_cards = has_cards or not is_nested
+                settings.append(IndexedSetting(
+                    name=setting,
+                    section=section_name,
+                    options=MappingProxyType(options),
+                    card_type=inferType(setting, options, template_name),
+                    groups=groups,
+                    is_nested=is_nested
+                ))
+            sections[section_name] = tuple(settings)
+            if has_cards:
+                section_names.append(section_name)
+            else:
+                self._logger.debug(f"Config '{template_name}': Section '{section_name}' has no cards of its own")
+
+        # Sections sharing a UI group are linked. Links are transitive
+        section_order = {section_name: i for i, section_name in enumerate(template)}
+        linked_sections = {section_name: [section_name] for section_name in template} # type: dict[str, list[str]]
+        for group_section_names in group_sections.values():
+            component = {} # type: dict[str, None]
+            for section_name in group_section_names:
+                component |= dict.fromkeys(linked_sections[section_name])
+            if len(component) > 1:
+                merged = sorted(component, key=section_order.__getitem__)
+                for section_name in merged:
+                    linked_sections[section_name] = merged
+
+        # The UI groups of each set of linked sections, in template order
+        linked_groups = {} # type: dict[str, tuple[Group, ...]]
+        all_groups = list(Group.getAllGroups(template_name) or [])
+        for section_name, linked in linked_sections.items():
+            if section_name in linked_groups:
+                continue
+            group_names = set().union(*(section_groups[name] for name in linked))
+            groups = tuple(group for group in all_groups if group.getGroupName() in group_names)
+            for name in linked:
+                linked_groups[name] = groups
+
+        self._sections = MappingProxyType(sections)
+        self._settings = MappingProxyType({setting.name: setting for settings in sections.values() for setting in settings})
+        self._section_names = tuple(section_names)
+        self._linked_sections = MappingProxyType({name: tuple(linked) for name, linked in linked_sections.items()})
+        self._linked_groups = MappingProxyType(linked_groups)
+
+    @classmethod
+    def compile(cls, template: AnyTemplate, force: bool=False) -> Self:
+        """Compile the template, or get the cached index if it is already compiled.
+
+        Parameters
+        ----------
+        template : AnyTemplate
+            The template to compile.
+
+        force : bool, optional
+            Compile the template again instead of using the cached index.
+            Defaults to False.
+        """
+        template_name = template.getTemplateName()
+        if force or template_name not in cls._cache:
+            cls._cache[template_name] = cls(template_name, template.getTemplate())
+        return cls._cache[template_name]
+
+    def _getSettingGroups(self, template_parser: TemplateParser, options: dict) -> tuple[Group, ...]:
+        """ The UI groups of a setting. The first is its main group """
+        raw_group = f"{options["ui_group"]}" if "ui_group" in options else None
+        if not raw_group:
+            return ()
+        # Missing group IDs are reported by the template parser
+        return tuple(template_parser.getGroup(self._template_name, group)
+                     for group in template_parser.formatGroup(self._template_name, raw_group) if group)
+
+    def getTemplateName(self) -> str:
+        return self._template_name
+
+    def getSectionNames(self) -> tuple[str, ...]:
+        """ The sections of the template which have cards, in template order """
+        return self._section_names
+
+    def getSettings(self, section_name: str) -> tuple[IndexedSetting, ...]:
+        """ The settings of a section shown in the settings panel, in template order """
+        return self._sections.get(section_name, ())
+
+    def getSetting(self, setting: str) -> IndexedSetting | None:
+        return self._settings.get(setting)
+
+    def getLinkedSections(self, section_name: str) -> tuple[str, ...]:
+        """ The sections which must be generated together with the section, since they share UI groups """
+        return self._linked_sections.get(section_name, (section_name,))
+
+    def getLinkedGroups(self, section_name: str) -> tuple[Group, ...]:
+        """ The UI groups of the section and its linked sections, in template order """
+        return self._linked_groups.get(section_name, ())
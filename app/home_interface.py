@@ -6,7 +6,7 @@ from PyQt6.QtCore import Qt, QRectF
 from PyQt6.QtGui import QPixmap, QPainter, QBrush, QPainterPath
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout, QGraphicsDropShadowEffect
 
-from app.common.signal_bus import signalBus
+from app.common.config_subscriptions import configSubscriptions
 from app.common.stylesheet import StyleSheet
 from app.components.infobar_test import InfoBar, InfoBarPosition
 from app.components.link_card import LinkCardView
@@ -62,15 +62,14 @@ class BannerWidget(QWidget):
         self.__connectSignalToSlot()
 
     def __connectSignalToSlot(self) -> None:
-        signalBus.configUpdated.connect(self.__onAppConfigUpdated)
-
-    def __onAppConfigUpdated(self, configkey: str, valuePack: tuple[Any,]) -> None:
-        value = valuePack[0]
-        if configkey == "appBackground":
-            self.showBanner = not bool(value)
-            self.isBackgroundActive = bool(value)
-        elif configkey == "backgroundOpacity":
-            self.showBanner = not self.isBackgroundActive or int(value) == 0
+        configSubscriptions.subscribe(("appBackground", "backgroundOpacity"), self.__onAppConfigUpdated)
+
+    def __onAppConfigUpdated(self, changes: dict[str, Any]) -> None:
+        if "appBackground" in changes:
+            self.showBanner = not bool(changes["appBackground"])
+            self.isBackgroundActive = bool(changes["appBackground"])
+        if "backgroundOpacity" in changes:
+            self.showBanner = not self.isBackgroundActive or int(changes["backgroundOpacity"]) == 0
 
     def paintEvent(self, e):
         super().paintEvent(e)
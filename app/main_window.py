@@ -13,14 +13,17 @@ with redirect_stdout(None):
 import os
 import traceback
 
+from app.common.config_subscriptions import configSubscriptions
 from app.common.signal_bus import signalBus
 from app.common.stylesheet import StyleSheet
-from app.components.infobar_test import InfoBar, InfoBarPosition
+from app.common.notification_queue import NotificationQueue
+from app.components.infobar_test import InfoBarIcon, InfoBarPosition
 
 from module.config.internal.app_args import AppArgs
 from module.config.internal.names import ModuleNames
 from module.config.app_config import AppConfig
 from module.logger import logger
+from module.tools.metrics import metrics
 
 
 class MainWindow(MSFluentWindow):
@@ -31,12 +34,15 @@ class MainWindow(MSFluentWindow):
         super().__init__()
         val = self._app_config.getValue("appBackground")
         self.background = QPixmap(val) if val else None # type: QPixmap | None
-        self.backgroundOpacity = self._app_config.getValue("backgroundOpacity", 0.0)
+        self.backgroundOpacity = self._app_config.getValue("backgroundOpacity", 0) / 100
         self.backgroundBlurRadius = self._app_config.getValue("backgroundBlur", 0.0)
         self.errorLog = []
+        self.notifications = NotificationQueue(parent=self)
 
         self.setMicaEffectEnabled(False)
-        setTheme(Theme.AUTO, lazy=True) # Set initial theme
+        # Apply the appearance from the config. Its setting cards are not created until the settings are shown
+        self.__onThemeChanged(self._app_config.getValue("appTheme"))
+        setThemeColor(self._app_config.getValue("appColor"), lazy=True)
 
         try:
             self.__initWindow()
@@ -117,28 +123,35 @@ class MainWindow(MSFluentWindow):
         QApplication.processEvents()
 
     def __connectSignalToSlot(self) -> None:
-        signalBus.configUpdated.connect(self.__onAppConfigUpdated)
+        configSubscriptions.subscribe(
+            ("appBackground", "appTheme", "appColor", "backgroundOpacity", "backgroundBlur", "enableMetrics"),
+            self.__onAppConfigUpdated
+        )
         signalBus.configValidationError.connect(lambda configname, title, content: self.__onConfigValidationFailed(title, content))
         signalBus.configStateChange.connect(self.__onConfigStateChanged)
-
-    def __onAppConfigUpdated(self, configkey: str, valuePack: tuple[Any,]) -> None:
-        value = valuePack[0]
-        if configkey == "appBackground":
-            self.background = QPixmap(value) if value else None
-            self.update()
-        elif configkey == "appTheme":
-            self.__onThemeChanged(value)
-        elif configkey == "appColor":
-            setThemeColor(value, lazy=True)
-        elif configkey == "backgroundOpacity":
-            self.backgroundOpacity = value / 100
-            self.update()
-        elif configkey == "backgroundBlur":
-            self.backgroundBlurRadius = float(value)
+        metrics.addListener(signalBus.metricsUpdated.emit)
+
+    def __onAppConfigUpdated(self, changes: dict[str, Any]) -> None:
+        if "appBackground" in changes:
+            self.background = QPixmap(changes["appBackground"]) if changes["appBackground"] else None
+        if "appTheme" in changes:
+            self.__onThemeChanged(changes["appTheme"])
+        if "appColor" in changes:
+            setThemeColor(changes["appColor"], lazy=True)
+        if "backgroundOpacity" in changes:
+            self.backgroundOpacity = changes["backgroundOpacity"] / 100
+        if "backgroundBlur" in changes:
+            self.backgroundBlurRadius = float(changes["backgroundBlur"])
+        if "enableMetrics" in changes:
+            metrics.setEnabled(changes["enableMetrics"])
+        # Repaint the background once for all of its changes
+        if any(key in changes for key in ("appBackground", "backgroundOpacity", "backgroundBlur")):
             self.update()
 
     def __onConfigValidationFailed(self, title: str, content: str):
-        InfoBar.warning(
+        self.notifications.notify(
+            key=f"ConfigValidation_{title}",
+            icon=InfoBarIcon.WARNING,
             title=self.tr(title),
             content=self.tr(content),
             orient=Qt.Orientation.Vertical if content else Qt.Orientation.Horizontal,
@@ -149,26 +162,17 @@ class MainWindow(MSFluentWindow):
         )
 
     def __onConfigStateChanged(self, state: bool, title: str, content: str):
-        if state:
-            InfoBar.success(
-                title=self.tr(title),
-                content=self.tr(content),
-                orient=Qt.Orientation.Vertical if content else Qt.Orientation.Horizontal,
-                isClosable=False,
-                duration=5000,
-                position=InfoBarPosition.TOP,
-                parent=self
-            )
-        else:
-            InfoBar.error(
-                title=self.tr(title),
-                content=self.tr(content),
-                orient=Qt.Orientation.Vertical if content else Qt.Orientation.Horizontal,
-                isClosable=False,
-                duration=5000,
-                position=InfoBarPosition.TOP,
-                parent=self
-            )
+        self.notifications.notify(
+            key="ConfigState",
+            icon=InfoBarIcon.SUCCESS if state else InfoBarIcon.ERROR,
+            title=self.tr(title),
+            content=self.tr(content),
+            orient=Qt.Orientation.Vertical if content else Qt.Orientation.Horizontal,
+            isClosable=False,
+            duration=5000,
+            position=InfoBarPosition.TOP,
+            parent=self
+        )
 
     def __onThemeChanged(self, value: str):
         if value == "Light":
@@ -179,9 +183,12 @@ class MainWindow(MSFluentWindow):
             setTheme(Theme.AUTO, lazy=True)
 
     def _displayErrors(self):
-        for error in self.errorLog:
+        for i, error in enumerate(self.errorLog):
             self._logger.critical("Encountered a critical error during startup\n" + error)
-            InfoBar.error(
+            # Every error is shown. Errors beyond the visible limit wait until a bar is closed
+            self.notifications.notify(
+                key=f"CriticalError_{i}",
+                icon=InfoBarIcon.ERROR,
                 title=self.tr("Critical Error!"),
                 content=error,
                 isClosable=True,
@@ -195,6 +202,10 @@ class MainWindow(MSFluentWindow):
         signalBus.updateConfigSettings.emit("appTheme", (theme().value,))
 
     def paintEvent(self, e: QPaintEvent):
+        with metrics.timer("gui.paintEvent"):
+            self._paintBackground(e)
+
+    def _paintBackground(self, e: QPaintEvent) -> None:
         super().paintEvent(e)
         if self.background:
             # Only set scene once!
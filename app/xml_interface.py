@@ -2,14 +2,19 @@ import os
 from pathlib import Path
 from qfluentwidgets import ScrollArea, PrimaryPushButton, PushButton
 from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QFileDialog, QSizePolicy
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QHBoxLayout, QFileDialog, QSizePolicy
 from typing import Any, Optional
 
 import traceback
 
+from app.common.file_watcher import FileWatcher
+from app.common.live_preview import LivePreview
+from app.common.config_subscriptions import configSubscriptions
+from app.common.notification_queue import NotificationQueue
 from app.common.signal_bus import signalBus
 from app.common.stylesheet import StyleSheet
-from app.components.infobar_test import InfoBar, InfoBarPosition
+from app.components.entry_table import EntryTableModel, EntryTableView
+from app.components.infobar_test import InfoBar, InfoBarIcon, InfoBarPosition
 from app.components.input_view import InputView
 from app.components.settings.line_edit import LineEdit_
 from app.components.settings.combobox import ComboBox_
@@ -20,6 +25,8 @@ from module.config.templates.app_template import AppTemplate
 from module.config.tools.config_tools import retrieveDictValue
 from module.logger import logger
 from module.xml_tools import XMLParser, XMLSubstituter, XMLValidator
+from module.xml_tools.xml_exchange import exportUnits, importUnits
+from module.xml_tools.xml_snapshot import XMLSnapshot
 
 
 class XMLInterface(ScrollArea):
@@ -35,9 +42,13 @@ class XMLInterface(ScrollArea):
             self.xmlLocation = self._app_config.getValue("xmlLocation")
             self.extractLangTag = self._app_config.getValue("extractLangTag")
             self.writeLangTag = self._app_config.getValue("writeLangTag")
-            self.previewErrorMessages = {} # type: dict[str, InfoBar | None]
+            self.notifications = NotificationQueue(parent=self)
             self.previewValid = False
+            # The preview must be fully regenerated, e.g. after the input was parsed again
+            self.previewStale = True
             self.isReadOnlyViews = True
+            # The project being opened. It is restored when its settings are applied
+            self.pendingSnapshot = None # type: XMLSnapshot | None
 
             self.view = QWidget(self)
             self.vBoxLayout = QVBoxLayout(self.view)
@@ -66,8 +77,14 @@ class XMLInterface(ScrollArea):
 
     def __initLayout(self):
         self.translateButton = PrimaryPushButton(self.tr("Translate"))
+        self.copySourceButton = PushButton(self.tr("Copy source"))
+        self.pasteTranslationButton = PushButton(self.tr("Paste translation"))
         self.confirmButton = PrimaryPushButton(self.tr("Confirm"))
         self.xmlFileSelectButton = PushButton(self.tr("Select XML file"))
+        self.openProjectButton = PushButton(self.tr("Open project"))
+        self.saveProjectButton = PushButton(self.tr("Save project"))
+        self.importButton = PushButton(self.tr("Import translations"))
+        self.exportButton = PushButton(self.tr("Export entries"))
         self.xmlFileLocationSetting = LineEdit_(
             config=self._app_config,
             configkey="xmlLocation",
@@ -76,41 +93,46 @@ class XMLInterface(ScrollArea):
         )
         self.xmlFileLocationSetting.setMaxWidth(self.parentWidget().width() // 2)
 
-        self.extractedTextView = InputView("Extracted Input")
+        self.entryModel = EntryTableModel(self.parser, self)
+        self.livePreview = LivePreview(self.substituter, self.entryModel.localizedText, parent=self)
+        self.livePreview.setEnabled(self._app_config.getValue("livePreview"))
+        self.xmlWatcher = FileWatcher(parent=self)
+        self.entryTableView = EntryTableView("Entries", self.entryModel)
         self.extractLangTagSelect = ComboBox_(
             config=self._app_config,
             configkey="extractLangTag",
             configname=self._app_config.getConfigName(),
             texts=AppArgs.template_langTags,
         )
-        self.extractedTextView.setReadOnly(self.isReadOnlyViews)
-        self.extractedTextView.addButton(self.extractLangTagSelect)
-        self.extractedTextView.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Expanding)
-
-        self.translatedTextView = InputView("Translated Input")
         self.translatedLangTag = ComboBox_(
             config=self._app_config,
             configkey="writeLangTag",
             configname=self._app_config.getConfigName(),
             texts=AppArgs.template_langTags,
         )
-        self.translatedTextView.enableClearButton()
-        self.translatedTextView.addButton(self.translatedLangTag)
-        self.translatedTextView.addButton(self.translateButton)
-        self.translatedTextView.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Expanding)
+        self.entryTableView.addButton(self.extractLangTagSelect)
+        self.entryTableView.addButton(self.copySourceButton)
+        self.entryTableView.addButton(self.pasteTranslationButton)
+        self.entryTableView.enableClearButton()
+        self.entryTableView.addButton(self.translatedLangTag)
+        self.entryTableView.addButton(self.translateButton)
+        self.entryTableView.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Expanding)
         self.outputXMLPreview = InputView("XML Output Preview")
         self.outputXMLPreview.addButton(self.confirmButton)
         self.outputXMLPreview.setReadOnly(self.isReadOnlyViews)
 
         self.hTextViewLayout.setSpacing(20)
-        self.hTextViewLayout.addWidget(self.extractedTextView, stretch=1)
-        self.hTextViewLayout.addWidget(self.translatedTextView, stretch=1)
+        self.hTextViewLayout.addWidget(self.entryTableView, stretch=2)
         self.hTextViewLayout.addWidget(self.outputXMLPreview, stretch=2)
 
         self.hFileSelectLayout.setSpacing(20)
         self.hFileSelectLayout.addWidget(self.xmlFileSelectButton)
         self.hFileSelectLayout.addWidget(self.xmlFileLocationSetting)
         self.hFileSelectLayout.addStretch(1)
+        self.hFileSelectLayout.addWidget(self.importButton)
+        self.hFileSelectLayout.addWidget(self.exportButton)
+        self.hFileSelectLayout.addWidget(self.openProjectButton)
+        self.hFileSelectLayout.addWidget(self.saveProjectButton)
 
         self.vBoxLayout.setContentsMargins(20, 0, 20, 36)
         self.vBoxLayout.addLayout(self.hTextViewLayout)
@@ -121,28 +143,48 @@ class XMLInterface(ScrollArea):
         self.translateButton.clicked.connect(self._substituteXML)
         self.confirmButton.clicked.connect(self._onConfirmButtonClicked)
         self.xmlFileSelectButton.clicked.connect(self._onFileSelectButtonClicked)
-        self.translatedTextView.editingDone().connect(self._validateTranslation)
+        self.openProjectButton.clicked.connect(self._onOpenProjectButtonClicked)
+        self.saveProjectButton.clicked.connect(self._onSaveProjectButtonClicked)
+        self.importButton.clicked.connect(self._onImportButtonClicked)
+        self.exportButton.clicked.connect(self._onExportButtonClicked)
+        self.copySourceButton.clicked.connect(self._onCopySourceButtonClicked)
+        self.pasteTranslationButton.clicked.connect(self._onPasteTranslationButtonClicked)
+        self.entryModel.translationChanged.connect(lambda row, translation: self._updateEntries([row]))
+        self.entryModel.translationsChanged.connect(self._updateEntries)
+        self.livePreview.entriesRendered.connect(self._applyRenderedEntries)
+        self.xmlWatcher.fileChanged.connect(self._onXMLFileChanged)
         if not self.isReadOnlyViews:
             self.outputXMLPreview.editingDone().connect(self._validatePreview)
-        signalBus.configUpdated.connect(self.__onAppConfigUpdated)
+        configSubscriptions.subscribe(
+            ("xmlLocation", "extractLangTag", "writeLangTag", "colorCodeSep", "colorCodeDelim", "colorCodeDelimSize",
+             "livePreview", "watchXMLFile"),
+            self.__onAppConfigUpdated
+        )
         signalBus.xmlProcessException.connect(self._infoBarManager)
         signalBus.xmlValidationError.connect(self._infoBarManager)
         signalBus.xmlPreviewInvalid.connect(self._updatePreviewValidity)
 
-    def __onAppConfigUpdated(self, configkey: str, valuePack: tuple[Any,]) -> None:
-        value = valuePack[0]
-        if configkey == "xmlLocation":
-            self.xmlLocation = value
-            self._parseXMLLocation()
-        elif configkey == "extractLangTag":
-            self.extractLangTag = value
+    def __onAppConfigUpdated(self, changes: dict[str, Any]) -> None:
+        # Settings widgets publish their value when created. Only actual changes of the input are reacted to
+        extractChanged = "extractLangTag" in changes and changes["extractLangTag"] != self.extractLangTag
+        writeChanged = "writeLangTag" in changes and changes["writeLangTag"] != self.writeLangTag
+        inputChanged = extractChanged or "xmlLocation" in changes and changes["xmlLocation"] != self.xmlLocation
+        self.xmlLocation = changes.get("xmlLocation", self.xmlLocation)
+        self.extractLangTag = changes.get("extractLangTag", self.extractLangTag)
+        self.writeLangTag = changes.get("writeLangTag", self.writeLangTag)
+
+        # The XML file is parsed once for all changes of the input, e.g. when a project is opened
+        if inputChanged or self.pendingSnapshot:
             self._parseXMLLocation()
-            if self.extractLangTag == self.writeLangTag:
-                self._infoBarManager(f"TAG_Config", "ETAG_Language tags are identical", "", True)
-        elif configkey == "writeLangTag":
-            self.writeLangTag = value
-            if self.extractLangTag == self.writeLangTag:
-                self._infoBarManager(f"TAG_Config", "WTAG_Language tags are identical", "", True)
+        elif writeChanged or any(key in changes for key in ("colorCodeSep", "colorCodeDelim", "colorCodeDelimSize")):
+            self._invalidatePreview()
+        if (extractChanged or writeChanged) and self.extractLangTag == self.writeLangTag:
+            self._infoBarManager(f"TAG_Config", f"{"E" if extractChanged else "W"}TAG_Language tags are identical", "", True)
+
+        if "livePreview" in changes:
+            self.livePreview.setEnabled(changes["livePreview"])
+        if "watchXMLFile" in changes:
+            self._watchXMLLocation()
 
     def _onFileSelectButtonClicked(self):
         file = QFileDialog.getOpenFileName(
@@ -155,46 +197,271 @@ class XMLInterface(ScrollArea):
         if file[0]:
             self.xmlFileLocationSetting.setValue(file[0])
 
+    def _onOpenProjectButtonClicked(self) -> None:
+        file = QFileDialog.getOpenFileName(
+            parent=self,
+            caption=self.tr("Open project"),
+            directory=f"{AppArgs.app_dir}",
+            filter=self.tr(f"Projects (*{XMLSnapshot.suffix})"),
+            initialFilter=self.tr(f"Projects (*{XMLSnapshot.suffix})")
+        )
+        if file[0]:
+            self.openProject(file[0])
+
+    def _onSaveProjectButtonClicked(self) -> None:
+        if not self.xmlLocation:
+            return
+        file = QFileDialog.getSaveFileName(
+            parent=self,
+            caption=self.tr("Save project"),
+            directory=f"{Path(AppArgs.app_dir, Path(self.xmlLocation).stem)}{XMLSnapshot.suffix}",
+            filter=self.tr(f"Projects (*{XMLSnapshot.suffix})"),
+            initialFilter=self.tr(f"Projects (*{XMLSnapshot.suffix})")
+        )
+        if file[0]:
+            self.saveProject(file[0])
+
+    def _onImportButtonClicked(self) -> None:
+        file = QFileDialog.getOpenFileName(
+            parent=self,
+            caption=self.tr("Import translations"),
+            directory=f"{AppArgs.app_dir}",
+            filter=self.tr("Translation files (*.xlf *.xliff *.po *.csv)"),
+            initialFilter=self.tr("Translation files (*.xlf *.xliff *.po *.csv)")
+        )
+        if file[0]:
+            self.importTranslations(file[0])
+
+    def _onExportButtonClicked(self) -> None:
+        if not self.xmlLocation:
+            return
+        formats = {
+            self.tr("XLIFF 1.2 (*.xlf)"): "xliff-1.2",
+            self.tr("XLIFF 2.0 (*.xlf)"): "xliff-2.0",
+            self.tr("Gettext PO (*.po)"): "po",
+            self.tr("CSV (*.csv)"): "csv"
+        }
+        file = QFileDialog.getSaveFileName(
+            parent=self,
+            caption=self.tr("Export entries"),
+            directory=f"{Path(AppArgs.app_dir, Path(self.xmlLocation).stem)}",
+            filter=";;".join(formats),
+            initialFilter=next(iter(formats))
+        )
+        if file[0]:
+            self.exportEntries(file[0], formats.get(file[1]))
+
+    def importTranslations(self, location: str) -> None:
+        """ Assign the translations of an XLIFF, PO or CSV file to the entries by their id """
+        try:
+            translated, unknown, rejected = self.entryModel.setTranslationsByID(importUnits(location))
+        except Exception:
+            msg = "Failed to import translations"
+            trace = traceback.format_exc(limit=AppArgs.traceback_limit)
+            self._logger.error(msg + "\n" + trace)
+            self._infoBarManager("PE_Exchange", msg, trace)
+            return
+        skipped = [] # type: list[str]
+        if unknown:
+            skipped.append(f"Skipped {unknown} {"translations" if unknown != 1 else "translation"} of unknown entries")
+        if rejected:
+            skipped.append(f"Rejected {rejected} {"translations" if rejected != 1 else "translation"} not matching the color codes of their entry")
+        if not skipped:
+            self._infoBarManager("LOCOK_InputLoc", f"Imported {translated} {"translations" if translated != 1 else "translation"}", "")
+        else:
+            self._infoBarManager("LOCMIS_InputLoc", f"Imported {translated} {"translations" if translated != 1 else "translation"}",
+                                 "\n".join(skipped))
+
+    def exportEntries(self, location: str, format_name: Optional[str]=None) -> None:
+        """ Write the entries and their translations to an XLIFF, PO or CSV file """
+        try:
+            count = exportUnits(location, self.entryModel.iterUnits(), self.extractLangTag, self.writeLangTag,
+                                original=os.path.split(self.xmlLocation)[1], format_name=format_name)
+            self._logger.debug(f"Exported {count} entries to {location}")
+            InfoBar.success(
+                title="Entries exported",
+                content=f"Location: {location}",
+                orient=Qt.Orientation.Vertical,
+                isClosable=False,
+                duration=5000,
+                position=InfoBarPosition.TOP_RIGHT,
+                parent=self
+            )
+        except Exception:
+            msg = "An unexpected exception occurred while exporting entries"
+            trace = traceback.format_exc(limit=AppArgs.traceback_limit)
+            self._logger.error(msg + "\n" + trace)
+            self._infoBarManager("PE_Exchange", msg, trace)
+
+    def openProject(self, location: str) -> None:
+        """ Apply the settings of a project, then restore its parse and translations """
+        try:
+            snapshot = XMLSnapshot.read(location)
+        except Exception:
+            msg = "Failed to open project"
+            trace = traceback.format_exc(limit=AppArgs.traceback_limit)
+            self._logger.error(msg + "\n" + trace)
+            self._infoBarManager("PE_Project", msg, trace)
+            return
+
+        self.pendingSnapshot = snapshot
+        self.xmlFileLocationSetting.setValue(snapshot.getSourceLocation())
+        self.extractLangTagSelect.setValue(snapshot.getExtractLangTag())
+        self.translatedLangTag.setValue(snapshot.getWriteLangTag())
+        # The settings of the project are delivered together, which restores the project
+        configSubscriptions.flush()
+        if self.pendingSnapshot:
+            # None of the settings changed
+            self._parseXMLLocation()
+
+    def saveProject(self, location: str) -> None:
+        try:
+            XMLSnapshot.write(
+                location=location,
+                parser=self.parser,
+                config=self._app_config,
+                extract_lang_tag=self.extractLangTag,
+                write_lang_tag=self.writeLangTag,
+                translations=self.entryModel.getTranslations(),
+                failed_rows=self.entryModel.getFailedRows(),
+                preview_valid=self.previewValid
+            )
+            self._logger.debug(f"Saving project to {location}")
+            InfoBar.success(
+                title="Project saved",
+                content=f"Location: {location}",
+                orient=Qt.Orientation.Vertical,
+                isClosable=False,
+                duration=5000,
+                position=InfoBarPosition.TOP_RIGHT,
+                parent=self
+            )
+        except Exception:
+            msg = "An unexpected exception occurred while saving the project"
+            trace = traceback.format_exc(limit=AppArgs.traceback_limit)
+            self._logger.error(msg + "\n" + trace)
+            self._infoBarManager("PE_Project", msg, trace)
+
+    def _onCopySourceButtonClicked(self) -> None:
+        QApplication.clipboard().setText("\n".join(self.entryModel.getSourceText()))
+
+    def _onPasteTranslationButtonClicked(self) -> None:
+        self._validateTranslation(QApplication.clipboard().text())
+
     def _parseXMLLocation(self):
+        snapshot, self.pendingSnapshot = self.pendingSnapshot, None
+        # The settings of the project may have been rejected
+        if snapshot and (not self.xmlLocation or os.path.abspath(self.xmlLocation) != snapshot.getSourceLocation()
+                         or self.extractLangTag != snapshot.getExtractLangTag()):
+            snapshot = None
         if self.xmlLocation:
-            self.parser.parse(self.xmlLocation, self.extractLangTag)
-            extractedText = self.parser.getExtractedText()
-            self.extractedTextView.setText("\n".join(self.cleanTranslation(extractedText)))
+            if not (snapshot and self._restoreSnapshot(snapshot)):
+                self.parser.parse(self.xmlLocation, self.extractLangTag)
+            self.entryModel.loadEntries()
+            self._invalidatePreview()
+            if snapshot:
+                self.previewValid = snapshot.isPreviewValid()
+                self.entryModel.restoreTranslations(snapshot.getTranslations(), snapshot.getFailedLines())
+                self._substituteXML()
+        self._watchXMLLocation()
+
+    def _restoreSnapshot(self, snapshot: XMLSnapshot) -> bool:
+        """ Restore the parse of a project. The XML file is parsed again if it changed since the project was saved """
+        try:
+            if snapshot.restore(self.parser, self._app_config):
+                return True
+            self._logger.info(f"'{os.path.split(self.xmlLocation)[1]}' changed since the project was saved. Parsing it again")
+        except Exception:
+            msg = "Failed to restore project. Parsing the XML file again"
+            trace = traceback.format_exc(limit=AppArgs.traceback_limit)
+            self._logger.error(msg + "\n" + trace)
+            self._infoBarManager("PE_Project", msg, trace)
+        return False
+
+    def _watchXMLLocation(self) -> None:
+        if self.xmlLocation and self._app_config.getValue("watchXMLFile"):
+            self.xmlWatcher.watchFile(self.xmlLocation)
+        else:
+            self.xmlWatcher.clear()
+
+    def _onXMLFileChanged(self, path: str) -> None:
+        """ Parse the XML file again and only update the entries which changed """
+        try:
+            if not self.parser.reparse(self.xmlLocation, self.extractLangTag):
+                return
+            changedRows = self.entryModel.reloadEntries()
+            self._logger.debug(f"Reloaded '{path}'. {len(changedRows)} changed {"entries" if len(changedRows) != 1 else "entry"}")
+            # The preview refers to the previous parse. Regenerate it with the kept translations
+            self._invalidatePreview()
+            self._substituteXML()
+        except Exception:
+            msg = "An unexpected exception occurred while reloading XML"
+            trace = traceback.format_exc(limit=AppArgs.traceback_limit)
+            self._logger.error(msg + "\n" + trace)
+            self._infoBarManager("PE_Reload", msg, trace)
 
     def _validateTranslation(self, translation: str) -> None:
         if not translation: return
         cleanTranslation = self.cleanTranslation(translation.splitlines())
-        self.translatedTextView.setText("\n".join(cleanTranslation))
-
-        extractSize = len(self.cleanTranslation(self.parser.getExtractedText()))
-        translateSize = len(cleanTranslation)
-        if extractSize == translateSize:
+        excess = self.entryModel.setTranslations(cleanTranslation)
+        if excess == 0:
             # All good
             self._infoBarManager("LOCOK_InputLoc", "Translation and extraction length are matching", "")
-        elif extractSize > translateSize:
+        elif excess < 0:
             # Missing translations
-            amount = extractSize-translateSize
+            amount = -excess
             self._infoBarManager("LOCMIS_InputLoc", f"Missing {amount} {"translations" if amount != 1 else "translation"}",
-                                 "Please check the translation to avoid missing localization entries in the output")
+                                 "Untranslated entries keep their source text in the output")
         else:
             # Too many translations
             self._infoBarManager("LOCEXC_InputLoc", f"Too many translations!",
-                                 f"Excess translations: {translateSize-extractSize}\nThis will cause trouble for the XML engine")
+                                 f"Excess translations: {excess}\nThe excess translations have been discarded")
+
+    def _invalidatePreview(self) -> None:
+        """ The preview must be fully regenerated by translating again """
+        self.previewStale = True
+        self.livePreview.cancel()
+
+    def _updateEntries(self, rows: list[int]) -> None:
+        """ Substitute the edited entries into the current preview """
+        if self.previewStale or not self.substituter.hasOutput():
+            return
+        if self.livePreview.isEnabled():
+            self.livePreview.scheduleRows(rows)
+        else:
+            # The preview is updated when translating
+            self._invalidatePreview()
+
+    def _applyRenderedEntries(self, entries: list[tuple[int, str, bool]]) -> None:
+        """ Apply and validate entries rendered by the live preview """
+        for row, payload, failed in entries:
+            line = self.entryModel.parsedLine(row)
+            wasFailed = self.substituter.isFailedTranslation(line)
+            outputLine = self.substituter.applyEntry(row, payload, failed)
+            if outputLine is None:
+                continue
+            if self.isReadOnlyViews:
+                self.outputXMLPreview.replaceLine(self.substituter.getEntryOutputLine(row), outputLine)
+            self.entryModel.setRowFailed(row, self.substituter.isFailedTranslation(line))
+            self.validator.validateEntry(line, wasFailed)
 
     def _substituteXML(self) -> None:
-        translation = self.translatedTextView.text()
-        if not translation: return
-        cleanTranslation = self.cleanTranslation(translation.splitlines())
+        if not self.entryModel.hasTranslations(): return
+        # Edits are applied to the preview by the live preview
+        if not self.previewStale and self.substituter.hasOutput() and self.livePreview.isIdle(): return
+        self.livePreview.cancel()
         self.substituter.substitute(
             write_lang_tag=self.writeLangTag,
             parsed_xml_lines=self.parser.getParsedLines(),
             extracted_text=self.parser.getExtractedText(),
             sanitized_xml=self.parser.getSanitizedInput(),
-            localized_text=cleanTranslation
+            localized_text=self.entryModel.getLocalizedText()
         )
         previewXML = "".join(self.substituter.getPreviewXML())
         self.outputXMLPreview.setText(previewXML)
         self._validatePreview(previewXML)
+        self.entryModel.setFailedLines(self.substituter.getFailedTranslations())
+        self.previewStale = False
 
     def cleanTranslation(self, translation: list[str]) -> list[str]:
         cleanTranslation = []
@@ -219,9 +486,13 @@ class XMLInterface(ScrollArea):
                 prefix = self._app_config.getValue("outFilePrefix")
                 file_name = f"{prefix}{os.path.split(self.xmlLocation)[1]}"
                 dstPath = Path(AppArgs.data_dir, file_name).resolve()
-                with open(dstPath, "w", encoding="utf-8") as file:
-                    file.writelines(xmlData)
-                    self._logger.debug(f"Saving XML to {dstPath}")
+                if self.isReadOnlyViews:
+                    # The preview is identical to the substituter's output. Copy unchanged parts directly from the source
+                    self.substituter.writeOutput(dstPath, patch=self._app_config.getValue("xmlPatchOutput"))
+                else:
+                    with open(dstPath, "w", encoding="utf-8") as file:
+                        file.writelines(xmlData)
+                self._logger.debug(f"Saving XML to {dstPath}")
 
                 # No errors are present
                 if self.previewValid:
@@ -260,119 +531,35 @@ class XMLInterface(ScrollArea):
             self._logger.error(msg + "\n" + trace)
             self._infoBarManager("PE_Saving", msg, trace)
 
-    def _removeErrorMsg(self, errorType: str) -> None:
-        self.previewErrorMessages[errorType] = None
-
     def _updatePreviewValidity(self, isValid: bool, showErrors: bool) -> None:
         if isValid or not showErrors:
-            for errorType, infobar in self.previewErrorMessages.items():
-                if errorType.find("VE_") != -1 and infobar:
-                    infobar.close()
+            self.notifications.closeWhere(lambda errorType: errorType.find("VE_") != -1)
         self.previewValid = isValid
 
     def _infoBarManager(self, errorType: str, msg: str, content: str, singleton: bool=False) -> None:
-        if errorType not in self.previewErrorMessages:
-            self.previewErrorMessages |= {errorType: None}
-
-        # The old error msg is now invalid
-        if self.previewErrorMessages[errorType]:
-            if singleton:
-                return
-            else:
-                self.previewErrorMessages[errorType].close()
-
+        """ Queue a notification. Notifications of the same error type replace each other """
+        orient = Qt.Orientation.Vertical if content else Qt.Orientation.Horizontal
+        isClosable = True
+        parent = self # type: QWidget
         if errorType.find("VE_W1") != -1:
-            bar = InfoBar.warning(
-                title=msg,
-                content=content,
-                orient=Qt.Orientation.Vertical if content else Qt.Orientation.Horizontal,
-                isClosable=True,
-                duration=-1,
-                position=InfoBarPosition.TOP_RIGHT,
-                parent=self.outputXMLPreview
-            )
+            icon, duration, position, parent = InfoBarIcon.WARNING, -1, InfoBarPosition.TOP_RIGHT, self.outputXMLPreview
         elif errorType.find("VE_E1") != -1:
-            bar = InfoBar.error(
-                title=msg,
-                content=content,
-                orient=Qt.Orientation.Vertical if content else Qt.Orientation.Horizontal,
-                isClosable=True,
-                duration=-1,
-                position=InfoBarPosition.TOP_LEFT,
-                parent=self.outputXMLPreview
-            )
+            icon, duration, position, parent = InfoBarIcon.ERROR, -1, InfoBarPosition.TOP_LEFT, self.outputXMLPreview
         elif errorType.find("MALFIX_") != -1:
-            bar = InfoBar.info(
-                title=msg,
-                content=content,
-                orient=Qt.Orientation.Vertical if content else Qt.Orientation.Horizontal,
-                isClosable=True,
-                duration=6000,
-                position=InfoBarPosition.BOTTOM_RIGHT,
-                parent=self
-            )
+            icon, duration, position = InfoBarIcon.INFORMATION, 6000, InfoBarPosition.BOTTOM_RIGHT
         elif errorType.find("MAL_") != -1:
-            bar = InfoBar.warning(
-                title=msg,
-                content=content,
-                orient=Qt.Orientation.Vertical if content else Qt.Orientation.Horizontal,
-                isClosable=True,
-                duration=-1,
-                position=InfoBarPosition.TOP_LEFT,
-                parent=self
-            )
+            icon, duration, position = InfoBarIcon.WARNING, -1, InfoBarPosition.TOP_LEFT
         elif errorType.find("TAG_") != -1:
-            splitmsg = msg.split("_")
-            changedTag = splitmsg[0]
-            msg = splitmsg[1]
-            bar = InfoBar.warning(
-                title=msg,
-                content=content,
-                orient=Qt.Orientation.Horizontal,
-                isClosable=False,
-                duration=5000,
-                position=InfoBarPosition.BOTTOM_RIGHT,
-                parent=self.extractedTextView if changedTag == "ETAG" else self.translatedTextView
-            )
+            changedTag, msg = msg.split("_", 1)
+            icon, duration, parent = InfoBarIcon.WARNING, 5000, self.entryTableView
+            position = InfoBarPosition.BOTTOM_LEFT if changedTag == "ETAG" else InfoBarPosition.BOTTOM_RIGHT
+            orient, isClosable = Qt.Orientation.Horizontal, False
         elif errorType.find("LOCOK_") != -1:
-            bar = InfoBar.success(
-                title=msg,
-                content=content,
-                orient=Qt.Orientation.Vertical if content else Qt.Orientation.Horizontal,
-                isClosable=True,
-                duration=4000,
-                position=InfoBarPosition.TOP,
-                parent=self.translatedTextView
-            )
+            icon, duration, position, parent = InfoBarIcon.SUCCESS, 4000, InfoBarPosition.TOP, self.entryTableView
         elif errorType.find("LOCMIS_") != -1:
-            bar = InfoBar.warning(
-                title=msg,
-                content=content,
-                orient=Qt.Orientation.Vertical if content else Qt.Orientation.Horizontal,
-                isClosable=True,
-                duration=6000,
-                position=InfoBarPosition.TOP,
-                parent=self.translatedTextView
-            )
+            icon, duration, position, parent = InfoBarIcon.WARNING, 6000, InfoBarPosition.TOP, self.entryTableView
         elif errorType.find("LOCEXC_") != -1:
-            bar = InfoBar.error(
-                title=msg,
-                content=content,
-                orient=Qt.Orientation.Vertical if content else Qt.Orientation.Horizontal,
-                isClosable=True,
-                duration=6000,
-                position=InfoBarPosition.TOP,
-                parent=self.translatedTextView
-            )
+            icon, duration, position, parent = InfoBarIcon.ERROR, 6000, InfoBarPosition.TOP, self.entryTableView
         else:
-            bar = InfoBar.error(
-                title=msg,
-                content=content,
-                orient=Qt.Orientation.Vertical if content else Qt.Orientation.Horizontal,
-                isClosable=True,
-                duration=8000,
-                position=InfoBarPosition.TOP,
-                parent=self
-            )
-        self.previewErrorMessages[errorType] = bar
-        bar.closedpyqtSignal.connect(lambda: self._removeErrorMsg(errorType))
\ No newline at end of file
+            icon, duration, position = InfoBarIcon.ERROR, 8000, InfoBarPosition.TOP
+        self.notifications.notify(errorType, icon, msg, content, orient, isClosable, duration, position, parent, singleton)
@@ -0,0 +1,90 @@
+import argparse
+import re
+import sys
+import time
+from typing import Any, Callable, Optional
+
+from module.xml_tools.cdata import locateCDATA
+
+# The patterns previously used to locate and repair CDATA. Kept as a reference for the worst case
+_reference_cdata = re.compile(r"\[.*\[(.*)\]{2}(?=></)")
+_reference_malformed_cdata = re.compile(r"\[?CDATA\[?(.*?)(?=]{0,2}></)")
+
+
+def _referenceLocate(line: str) -> Any:
+    return _reference_cdata.search(line) or _reference_malformed_cdata.search(line)
+
+
+# Entry lines with many brackets and no well-formed end of the CDATA section
+worst_cases = {
+    "open": lambda size: f"<entry id=\"worst\"><![CDATA{"[" * size}></entry>",
+    "pairs": lambda size: f"<entry id=\"worst\"><![CDATA{"[]" * size}></entry>",
+    "mixed": lambda size: f"<entry id=\"worst\"><![CDATA{"[a]] " * size}></entry>",
+    "wellformed": lambda size: f"<entry id=\"worst\"><![CDATA[{"[a]] " * size}]]></entry>"
+}
+
+
+def _measure(func: Callable[[str], Any], line: str, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(line)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: list[int], reference_max: int, repeats: int) -> list[dict[str, Any]]:
+    results = [] # type: list[dict[str, Any]]
+    for case, createLine in worst_cases.items():
+        for size in sizes:
+            line = createLine(size)
+            result = {"case": case, "size": size, "line_length": len(line),
+                      "locator_seconds": _measure(locateCDATA, line, repeats), "reference_seconds": None}
+            # The reference patterns take cubic time. Only run them on small sizes
+            if size <= reference_max:
+                result["reference_seconds"] = _measure(_referenceLocate, line, 1)
+            results.append(result)
+    return results
+
+
+def formatResults(results: list[dict[str, Any]]) -> str:
+    lines = [f"{"case":>10} {"size":>9} {"locator ms":>11} {"growth":>7} {"reference ms":>13} {"growth":>7}"]
+    previous = None # type: Optional[dict[str, Any]]
+    for result in results:
+        if previous is None or previous["case"] != result["case"]:
+            previous = None
+
+        def growth(key: str) -> str:
+            if previous is None or not previous[key] or result[key] is None:
+                return f"{"-":>7}"
+            return f"{result[key] / previous[key]:>6.1f}x"
+
+        reference = result["reference_seconds"]
+        lines.append(f"{result["case"]:>10} {result["size"]:>9} {result["locator_seconds"] * 1000:>11.4f} {growth("locator_seconds")} "
+                     + (f"{reference * 1000:>13.2f}" if reference is not None else f"{"-":>13}") + f" {growth("reference_seconds")}")
+        previous = result
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]]=None) -> None:
+    arg_parser = argparse.ArgumentParser(description="Show that locating CDATA takes linear time on worst-case entry lines")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[250, 500, 1_000, 10_000, 100_000, 1_000_000],
+                            help="Number of repeated bracket patterns in each line")
+    arg_parser.add_argument("--reference-max", type=int, default=500,
+                            help="Largest size to run the previous regex patterns on")
+    arg_parser.add_argument("--repeats", type=int, default=5)
+    args = arg_parser.parse_args(argv)
+
+    results = run(sorted(args.sizes), args.reference_max, args.repeats)
+    print(formatResults(results))
+    # Time per character must not grow with the line length
+    for case in worst_cases:
+        case_results = [result for result in results if result["case"] == case]
+        per_char = [result["locator_seconds"] / result["line_length"] for result in case_results]
+        if len(per_char) > 1 and per_char[-1] > 10 * per_char[0]:
+            print(f"Locating CDATA in '{case}' lines is not linear", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
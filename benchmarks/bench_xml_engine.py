@@ -0,0 +1,236 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from benchmarks.string_table_generator import StringTableGenerator
+
+from module.config.abstract_config import BaseConfig
+from module.config.templates.app_template import AppTemplate
+from module.config.tools.config_tools import retrieveDictValue
+from module.config.tools.validation_model_gen import ValidationModelGenerator
+from module.logger import logger
+from module.tools.types.general import StrPath
+from module.xml_tools import XMLParser, XMLSubstituter, XMLValidator
+
+
+class BenchmarkConfig(BaseConfig):
+    """ In-memory config using the defaults of the app template """
+
+    def __init__(self, overrides: Optional[dict[str, Any]]=None) -> None:
+        self._config = self._initConfig()
+        for key, value in (overrides or {}).items():
+            self._config["XML"][key] = value
+
+    def _initConfig(self) -> dict[str, Any]:
+        model = ValidationModelGenerator().getGenericModel(
+            model_name=AppTemplate().getTemplateName(),
+            template=AppTemplate().getTemplate()
+        )
+        return model.model_construct().model_dump()
+
+    def _validateLoad(self, raw_config: dict) -> dict[str, Any]:
+        return raw_config
+
+    def _validate(self, save_config: dict, config_name: str) -> dict[str, Any]:
+        return save_config
+
+    def getConfig(self) -> dict[str, Any]:
+        return self._config
+
+    def getConfigName(self) -> str:
+        return "Benchmark"
+
+    def getFailureStatus(self) -> bool:
+        return False
+
+    def getValue(self, key: str, default: Any=None, use_internal_config: bool=False) -> Any:
+        return retrieveDictValue(self._config, key, default=default)
+
+    def setValue(self, key: str, value: Any, config_name: str) -> None:
+        self._config["XML"][key] = value
+
+    def saveConfig(self) -> None:
+        pass
+
+
+class XMLEngineBenchmark():
+    stages = ["parse", "substitute", "validate", "save"]
+
+    def __init__(self, xml_path: StrPath, entries: int, backend: str, memory_map: bool,
+                 out_dir: StrPath, extract_lang_tag: str="schinese", write_lang_tag: str="english",
+                 patch: bool=False, parallel: bool=False) -> None:
+        self.xml_path = xml_path
+        self.entries = entries
+        self.backend = backend
+        self.memory_map = memory_map
+        self.out_dir = out_dir
+        self.extract_lang_tag = extract_lang_tag
+        self.write_lang_tag = write_lang_tag
+        self.patch = patch
+        self.parallel = parallel
+        self.file_size = os.path.getsize(xml_path)
+
+    def _createEngine(self) -> tuple[XMLParser, XMLSubstituter, XMLValidator]:
+        config = BenchmarkConfig({"xmlBackend": self.backend, "xmlMemoryMap": self.memory_map,
+                                  "xmlParallelParse": self.parallel})
+        parser = XMLParser(config)
+        substituter = XMLSubstituter(config, parser)
+        validator = XMLValidator(config, parser, substituter)
+        return parser, substituter, validator
+
+    def _runStages(self, measure: Callable[[str, Callable[[], Any]], Any]) -> None:
+        parser, substituter, validator = self._createEngine()
+        measure("parse", lambda: parser.parse(self.xml_path, self.extract_lang_tag))
+        # Use the extracted text as the translation so every entry can be substituted
+        translation = [text for text in parser.getExtractedText() if text]
+        measure("substitute", lambda: substituter.substitute(
+            write_lang_tag=self.write_lang_tag,
+            parsed_xml_lines=parser.getParsedLines(),
+            extracted_text=parser.getExtractedText(),
+            sanitized_xml=parser.getSanitizedInput(),
+            localized_text=translation
+        ))
+        preview = "".join(substituter.getPreviewXML()).splitlines()
+        measure("validate", lambda: validator.validatePreview(preview, self.extract_lang_tag, self.write_lang_tag))
+        measure("save", lambda: substituter.writeOutput(Path(self.out_dir, "output.xml"), patch=self.patch))
+
+    def run(self, measure_memory: bool=True) -> list[dict[str, Any]]:
+        results = {stage: {} for stage in self.stages} # type: dict[str, dict[str, Any]]
+
+        def measureTime(stage: str, func: Callable[[], Any]) -> None:
+            start = time.perf_counter()
+            func()
+            seconds = time.perf_counter() - start
+            results[stage] |= {
+                "seconds": seconds,
+                "entries_per_second": self.entries / seconds if seconds else None,
+                "mb_per_second": self.file_size / 2**20 / seconds if seconds else None
+            }
+
+        def measureMemory(stage: str, func: Callable[[], Any]) -> None:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            func()
+            results[stage] |= {"peak_memory_bytes": tracemalloc.get_traced_memory()[1] - baseline}
+
+        # Time and memory are measured in separate runs as tracing memory slows down execution
+        self._runStages(measureTime)
+        if measure_memory:
+            tracemalloc.start()
+            try:
+                self._runStages(measureMemory)
+            finally:
+                tracemalloc.stop()
+
+        return [{
+            "entries": self.entries,
+            "file_bytes": self.file_size,
+            "backend": self.backend,
+            "memory_map": self.memory_map,
+            "stage": stage
+        } | values for stage, values in results.items()]
+
+
+def _resultKey(result: dict[str, Any]) -> tuple:
+    return (result["entries"], result["backend"], result["memory_map"], result["stage"])
+
+
+def _gitRevision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def formatResults(results: list[dict[str, Any]], baseline: Optional[list[dict[str, Any]]]=None) -> str:
+    baseline_results = {_resultKey(result): result for result in baseline or []}
+    lines = [f"{"entries":>9} {"backend":>7} {"mmap":>5} {"stage":>10} {"seconds":>10} {"entries/s":>12} {"peak MiB":>9}"
+             + (f" {"speedup":>8}" if baseline else "")]
+    for result in results:
+        peak = result.get("peak_memory_bytes")
+        line = (f"{result["entries"]:>9} {result["backend"]:>7} {str(result["memory_map"]):>5} {result["stage"]:>10} "
+                + f"{result["seconds"]:>10.4f} {result["entries_per_second"] or 0:>12.0f} "
+                + f"{peak / 2**20 if peak is not None else float("nan"):>9.1f}")
+        if baseline:
+            previous = baseline_results.get(_resultKey(result))
+            line += f" {previous["seconds"] / result["seconds"]:>7.2f}x" if previous and result["seconds"] else f" {"-":>8}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main(argv: Optional[list[str]]=None) -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark the XML engine on synthetic string tables")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000],
+                            help="Number of entries in each language block")
+    arg_parser.add_argument("--backends", nargs="+", default=["regex", "expat"])
+    arg_parser.add_argument("--memory-map", choices=["off", "on", "both"], default="off")
+    arg_parser.add_argument("--languages", type=int, default=2)
+    arg_parser.add_argument("--multiline-ratio", type=float, default=0.05)
+    arg_parser.add_argument("--malformed-ratio", type=float, default=0.0,
+                            help="Malformed files make the expat backend fall back to the regex backend")
+    arg_parser.add_argument("--color-code-density", type=float, default=0.2)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--patch", action="store_true", help="Save by patching the write language block into the input file")
+    arg_parser.add_argument("--parallel", action="store_true", help="Parse files larger than 16 MB in parallel (regex backend only)")
+    arg_parser.add_argument("--no-memory", action="store_true", help="Skip measuring peak memory")
+    arg_parser.add_argument("--output", help="Write results to this JSON file")
+    arg_parser.add_argument("--compare", help="Compare results against this JSON file")
+    args = arg_parser.parse_args(argv)
+
+    # Keep malformed entry reports from flooding the console
+    logger.setLevel("ERROR")
+    memory_map_modes = {"off": [False], "on": [True], "both": [False, True]}[args.memory_map]
+
+    results = [] # type: list[dict[str, Any]]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            xml_path = Path(tmp_dir, f"string_table_{size}.xml")
+            StringTableGenerator(
+                entries=size,
+                languages=args.languages,
+                multiline_ratio=args.multiline_ratio,
+                malformed_ratio=args.malformed_ratio,
+                color_code_density=args.color_code_density,
+                seed=args.seed
+            ).generate(xml_path)
+            for backend in args.backends:
+                for memory_map in memory_map_modes:
+                    benchmark = XMLEngineBenchmark(xml_path, size, backend, memory_map, tmp_dir,
+                                                   patch=args.patch, parallel=args.parallel)
+                    size_results = benchmark.run(measure_memory=not args.no_memory)
+                    results.extend(size_results)
+                    print(formatResults(size_results), file=sys.stderr)
+            os.remove(xml_path)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+    print(formatResults(results, baseline))
+
+    if args.output:
+        report = {
+            "meta": {
+                "revision": _gitRevision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "args": vars(args)
+            },
+            "results": results
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import argparse
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from benchmarks.bench_xml_engine import BenchmarkConfig
+from benchmarks.string_table_generator import StringTableGenerator
+
+from module.logger import logger
+from module.tools.types.general import StrPath
+from module.xml_tools import XMLParser
+from module.xml_tools.xml_exchange import TranslationUnit, exportEntries, exportUnits, importUnits
+from module.xml_tools.xml_snapshot import XMLSnapshot
+
+# Text which is easily changed by escaping or line break normalization
+edge_cases = [
+    TranslationUnit("crlf", "tr\r\n\tend", "cr\rlf\r\n"),
+    TranslationUnit("markup", "<b>&amp; \"quoted\" 'text'</b>", "]]> &lt; \\n \\\\"),
+    TranslationUnit("multiline", "first\nsecond\n", "\n\nthird"),
+    TranslationUnit("whitespace", "  leading and trailing  ", "\t"),
+    TranslationUnit("unicode", "火把 {colour_start|notable}é{colour_end}", "😀    "),
+    TranslationUnit("untranslated", "no target", ""),
+    TranslationUnit("id \"with\" <markup> & \r\n", "source", "target")
+]
+# Characters XML cannot represent. XLIFF 2.0 encodes them, XLIFF 1.2 removes them
+control_case = TranslationUnit("control", "bell\x07 and escape\x1b", "nul\x00")
+exchange_formats = {"xliff-1.2": ".xlf", "xliff-2.0": ".xliff", "po": ".po", "csv": ".csv"}
+
+
+class FormatCheck():
+    """ Round-trips the persisted file formats and reports every difference """
+
+    def __init__(self, xml_path: StrPath, out_dir: StrPath, extract_lang_tag: str, write_lang_tag: str) -> None:
+        self.xml_path = xml_path
+        self.out_dir = out_dir
+        self.extract_lang_tag = extract_lang_tag
+        self.write_lang_tag = write_lang_tag
+        self.failures = [] # type: list[str]
+
+    def _check(self, name: str, condition: bool, detail: Any="") -> None:
+        if not condition:
+            self.failures.append(f"{name}{f": {detail}" if detail != "" else ""}")
+
+    def _compareUnits(self, name: str, expected: list[TranslationUnit], actual: list[TranslationUnit]) -> None:
+        self._check(f"{name}: unit count", len(expected) == len(actual), f"{len(expected)} != {len(actual)}")
+        for unit, read_unit in zip(expected, actual):
+            if unit[:3] != read_unit[:3]:
+                self._check(f"{name}: unit '{unit.entry_id}'", False, f"{unit[:3]!r} != {read_unit[:3]!r}")
+                break
+
+    def checkExchange(self) -> None:
+        parser = XMLParser(BenchmarkConfig())
+        entries = [entry for entry in parser.iterEntries(self.xml_path, self.extract_lang_tag) if entry.text]
+        # Translate every other entry. Untranslated entries are exported with an empty target
+        translations = {entry.entry_id: f"{entry.text}\r\n翻译" for entry in entries[::2]}
+        for format_name, suffix in exchange_formats.items():
+            location = Path(self.out_dir, f"entries{suffix}")
+            exportEntries(location, entries, self.extract_lang_tag, self.write_lang_tag, translations, format_name=format_name)
+            expected = [TranslationUnit(entry.entry_id, entry.text, translations.get(entry.entry_id, "")) for entry in entries]
+            self._compareUnits(f"{format_name} entries", expected, list(importUnits(location, format_name)))
+
+            location = Path(self.out_dir, f"edge_cases{suffix}")
+            exportUnits(location, edge_cases + [control_case], self.extract_lang_tag, self.write_lang_tag, format_name=format_name)
+            expected = list(edge_cases)
+            if format_name == "xliff-1.2":
+                expected.append(TranslationUnit(control_case.entry_id, "bell and escape", "nul"))
+            else:
+                expected.append(control_case)
+            self._compareUnits(f"{format_name} edge cases", expected, list(importUnits(location, format_name)))
+
+    def _parseState(self, parser: XMLParser) -> dict[str, Any]:
+        return {
+            "sanitized input": list(parser.getSanitizedInput()),
+            "extracted text": parser.getExtractedText(),
+            "parsed lines": parser.getParsedLines(),
+            "line numbers": parser.getParsedLineNumbers(),
+            "malformed entries": parser.getMalformedEntries(),
+            "line positions": parser.getInputLinePositions(),
+            "color codes": {line_number: (color_coded_text.text, list(color_coded_text.segments))
+                            for line_number, color_coded_text in parser.getEntryColorCodes().items()}
+        }
+
+    def checkSnapshot(self, memory_map: bool) -> None:
+        name = f"snapshot (memory map {"on" if memory_map else "off"})"
+        config = BenchmarkConfig({"xmlMemoryMap": memory_map})
+        parser = XMLParser(config)
+        parser.parse(self.xml_path, self.extract_lang_tag)
+        parsed_lines = parser.getParsedLines()
+        translations = [f"{text}\r\n翻译" if i % 3 else "" for i, text in enumerate(parser.getExtractedText())]
+        failed_rows = set(range(0, len(translations), 7))
+        location = Path(self.out_dir, f"project{XMLSnapshot.suffix}")
+
+        try:
+            XMLSnapshot.write(location, parser, config, self.extract_lang_tag, self.write_lang_tag,
+                              translations[:10], failed_rows, True)
+            self._check(f"{name}: too few translations are rejected", False)
+        except ValueError:
+            pass
+
+        XMLSnapshot.write(location, parser, config, self.extract_lang_tag, self.write_lang_tag,
+                          translations, failed_rows, False)
+        snapshot = XMLSnapshot.read(location)
+        self._check(f"{name}: language tags", (snapshot.getExtractLangTag(), snapshot.getWriteLangTag())
+                    == (self.extract_lang_tag, self.write_lang_tag))
+        self._check(f"{name}: preview validity", snapshot.isPreviewValid() is False)
+        self._check(f"{name}: translations", snapshot.getTranslations()
+                    == {line: translation for line, translation in zip(parsed_lines, translations) if translation})
+        self._check(f"{name}: failed lines", snapshot.getFailedLines() == [parsed_lines[row] for row in sorted(failed_rows)])
+
+        restored_parser = XMLParser(config)
+        self._check(f"{name}: restore", snapshot.restore(restored_parser, config))
+        expected, actual = self._parseState(parser), self._parseState(restored_parser)
+        for key, value in expected.items():
+            self._check(f"{name}: restored {key}", value == actual[key])
+        parser.getSource().close()
+        restored_parser.getSource().close()
+
+    def run(self) -> list[str]:
+        checks = [self.checkExchange, lambda: self.checkSnapshot(False), lambda: self.checkSnapshot(True)] # type: list[Callable[[], None]]
+        for check in checks:
+            check()
+        return self.failures
+
+
+def main(argv: Optional[list[str]]=None) -> None:
+    arg_parser = argparse.ArgumentParser(description="Check that exchange files and project snapshots round-trip without changes")
+    arg_parser.add_argument("--entries", type=int, default=2000)
+    arg_parser.add_argument("--multiline-ratio", type=float, default=0.1)
+    arg_parser.add_argument("--malformed-ratio", type=float, default=0.02)
+    arg_parser.add_argument("--color-code-density", type=float, default=0.5)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args(argv)
+
+    # Keep malformed entry reports from flooding the console
+    logger.setLevel("ERROR")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        xml_path = Path(tmp_dir, "string_table.xml")
+        generator = StringTableGenerator(
+            entries=args.entries,
+            languages=2,
+            multiline_ratio=args.multiline_ratio,
+            malformed_ratio=args.malformed_ratio,
+            color_code_density=args.color_code_density,
+            seed=args.seed
+        )
+        generator.generate(xml_path)
+        extract_lang_tag, write_lang_tag = generator.getLanguageTags()[:2]
+        failures = FormatCheck(xml_path, tmp_dir, extract_lang_tag, write_lang_tag).run()
+        os.remove(xml_path)
+
+    for failure in failures:
+        print(f"FAILED {failure}")
+    print(f"{len(failures)} failed checks" if failures else "All checks passed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import argparse
+import random
+from typing import Optional, TextIO
+
+from module.tools.types.general import StrPath
+
+
+class StringTableGenerator():
+    # Language tags used by Darkest Dungeon string tables
+    language_tags = [
+        "english", "schinese", "french", "german", "spanish",
+        "russian", "brazilian", "polish", "koreana", "japanese"
+    ]
+    _words = [
+        "the", "hamlet", "torch", "crimson", "curse", "ancestor", "estate", "ruins",
+        "warrens", "weald", "cove", "darkest", "dungeon", "stress", "virtue", "affliction",
+        "heirloom", "provision", "trinket", "quirk", "camping", "skill", "hero", "abomination"
+    ]
+    _colors = ["notable", "harmful", "huixiang", "buff", "debuff", "stress"]
+
+    def __init__(self, entries: int=1000, languages: int=2, multiline_ratio: float=0.05,
+                 malformed_ratio: float=0.01, color_code_density: float=0.2, seed: int=0) -> None:
+        """Generate deterministic Darkest Dungeon-style string tables.
+
+        Parameters
+        ----------
+        entries : int, optional
+            Number of entries in each language block.
+            By default 1000.
+
+        languages : int, optional
+            Number of language blocks. The first two are always "schinese" and "english".
+            By default 2.
+
+        multiline_ratio : float, optional
+            Ratio of entries whose text spans multiple lines.
+            By default 0.05.
+
+        malformed_ratio : float, optional
+            Ratio of entries with malformed CDATA.
+            By default 0.01.
+
+        color_code_density : float, optional
+            Ratio of entries containing color codes.
+            By default 0.2.
+
+        seed : int, optional
+            Seed for the random generator. The same seed always generates the same table.
+            By default 0.
+        """
+        self.entries = entries
+        self.languages = max(1, min(languages, len(self.language_tags)))
+        self.multiline_ratio = multiline_ratio
+        self.malformed_ratio = malformed_ratio
+        self.color_code_density = color_code_density
+        self.seed = seed
+
+    def getLanguageTags(self) -> list[str]:
+        tags = ["schinese", "english"] + [tag for tag in self.language_tags if tag not in ("schinese", "english")]
+        return tags[0:self.languages]
+
+    def _text(self, rng: random.Random, lang_tag: str) -> str:
+        if lang_tag == "schinese":
+            return "".join([chr(rng.randint(0x4E00, 0x9FA5)) for _ in range(rng.randint(2, 24))])
+        return " ".join([rng.choice(self._words) for _ in range(rng.randint(1, 12))])
+
+    def _entryText(self, rng: random.Random, lang_tag: str) -> str:
+        if rng.random() < self.color_code_density:
+            parts = []
+            for _ in range(rng.randint(1, 3)):
+                if rng.random() < 0.5:
+                    parts.append(self._text(rng, lang_tag))
+                parts.append(f"{{colour_start|{rng.choice(self._colors)}}}{self._text(rng, lang_tag)}{{colour_end}}")
+            return " ".join(parts)
+        return self._text(rng, lang_tag)
+
+    def _entry(self, rng: random.Random, index: int, lang_tag: str) -> str:
+        entry_id = f"str_{index:07d}"
+        text = self._entryText(rng, lang_tag)
+        if rng.random() < self.multiline_ratio:
+            return f"    <entry id=\"{entry_id}\"><![CDATA[{text}\n      {self._text(rng, lang_tag)}]]></entry>\n"
+        if rng.random() < self.malformed_ratio:
+            # Missing "[" after CDATA. The XML engine is able to fix this
+            return f"    <entry id=\"{entry_id}\"><![CDATA{text}]]></entry>\n"
+        return f"    <entry id=\"{entry_id}\"><![CDATA[{text}]]></entry>\n"
+
+    def write(self, file: TextIO) -> None:
+        rng = random.Random(self.seed)
+        file.write("<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n<root>\n")
+        for lang_tag in self.getLanguageTags():
+            file.write(f"  <language id=\"{lang_tag}\">\n")
+            for i in range(self.entries):
+                file.write(self._entry(rng, i, lang_tag))
+            file.write("  </language>\n")
+        file.write("</root>\n")
+
+    def generate(self, dst_path: StrPath) -> None:
+        with open(dst_path, "w", encoding="utf-8", newline="\n") as file:
+            self.write(file)
+
+
+def main(argv: Optional[list[str]]=None) -> None:
+    arg_parser = argparse.ArgumentParser(description="Generate a synthetic Darkest Dungeon string table")
+    arg_parser.add_argument("output", help="Path of the generated XML file")
+    arg_parser.add_argument("--entries", type=int, default=1000)
+    arg_parser.add_argument("--languages", type=int, default=2)
+    arg_parser.add_argument("--multiline-ratio", type=float, default=0.05)
+    arg_parser.add_argument("--malformed-ratio", type=float, default=0.01)
+    arg_parser.add_argument("--color-code-density", type=float, default=0.2)
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args(argv)
+    StringTableGenerator(
+        entries=args.entries,
+        languages=args.languages,
+        multiline_ratio=args.multiline_ratio,
+        malformed_ratio=args.malformed_ratio,
+        color_code_density=args.color_code_density,
+        seed=args.seed
+    ).generate(args.output)
+
+
+if __name__ == "__main__":
+    main()
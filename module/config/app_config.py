@@ -2,14 +2,17 @@ import traceback
 from typing import Any, Mapping, Optional, Self, override
 from time import time
 
+from app.common.config_subscriptions import configSubscriptions
 from app.common.signal_bus import signalBus
 
 from module.config.abstract_config import BaseConfig
 from module.config.internal.app_args import AppArgs
+from module.config.internal.config_bootstrap import takeRawConfig
 from module.config.tools.config_tools import checkMissingFields, loadConfig, validateValue, retrieveDictValue, writeConfig
 from module.config.tools.validation_model_gen import ValidationModelGenerator
 from module.config.templates.app_template import AppTemplate
 from module.logger import logger
+from module.tools.metrics import metrics
 
 
 class AppConfig(BaseConfig):
@@ -30,6 +33,8 @@ class AppConfig(BaseConfig):
             cls._config_path = AppArgs.app_config_path
             cls._internal_config = cls._validation_model.model_construct().model_dump()
             cls._config = cls._instance._initConfig()
+            if cls._instance.getValue("enableMetrics", default=False):
+                metrics.setEnabled(True)
         return cls._instance
 
     @override
@@ -45,7 +50,9 @@ class AppConfig(BaseConfig):
             config_name=self._validation_model.__name__,
             config_path=self._config_path,
             validator=self._validateLoad,
-            internal_config=self._internal_config
+            internal_config=self._internal_config,
+            # Reuse the read made at startup when the logger was created
+            raw_config=takeRawConfig(self._config_path)
         )
         return config
 
@@ -103,7 +110,7 @@ class AppConfig(BaseConfig):
         if isError:
             signalBus.configStateChange.emit(False, "Failed to save setting", "")
         else:
-            signalBus.configUpdated.emit(key, (value,))
+            configSubscriptions.publish(key, value)
             self._is_modified = True
         return isInvalid
 
@@ -53,6 +53,7 @@ class AppArgs():
 
     # Logging
     log_dir = Path(app_dir, "logs")
+    metrics_path = Path(log_dir, "metrics.json")
     log_format = "%(asctime)s - %(module)s - %(lineno)s - %(levelname)s - %(message)s" # %(asctime)s - %(name)s - %(levelname)s - %(message)s'
     log_format_color = "%(asctime)s - %(module)s - %(lineno)s - %(levelname)s - %(message)s" # %(asctime)s - %(module)s - %(lineno)s - %(levelname)s - %(message)s'
 
@@ -91,4 +92,8 @@ class AppArgs():
     template_langTags = [
         "english",
         "schinese"
+    ]
+    template_xmlBackends = [
+        "regex",
+        "expat"
     ]
\ No newline at end of file
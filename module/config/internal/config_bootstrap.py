@@ -0,0 +1,43 @@
+import os
+import tomllib
+from typing import Any
+
+from module.tools.types.general import StrPath
+
+# Raw configs read at startup. Kept until taken by the config they belong to
+_raw_configs = {} # type: dict[str, dict[str, Any] | None]
+
+
+def readRawConfig(config_path: StrPath) -> dict[str, Any] | None:
+    """Read a TOML config file into a plain mapping without validating it.
+
+    The file is read once. Subsequent calls return the same mapping until it is taken by takeRawConfig,
+    allowing modules which are initialized before the config (e.g. the logger) to share its read.
+
+    Parameters
+    ----------
+    config_path : StrPath
+        Path-like object pointing to a toml file.
+
+    Returns
+    -------
+    dict[str, Any] | None
+        The raw config. None if the file is missing, unsupported or malformed.
+    """
+    key = os.path.abspath(config_path)
+    if key not in _raw_configs:
+        raw_config = None
+        if os.path.splitext(key)[1].lower() == ".toml":
+            try:
+                with open(key, "rb") as file:
+                    raw_config = tomllib.load(file)
+            except (OSError, tomllib.TOMLDecodeError):
+                # Reported when the config is loaded
+                pass
+        _raw_configs[key] = raw_config
+    return _raw_configs[key]
+
+
+def takeRawConfig(config_path: StrPath) -> dict[str, Any] | None:
+    """ Return the raw config read by readRawConfig, if any, and forget it. Later loads read the file again """
+    return _raw_configs.pop(os.path.abspath(config_path), None)
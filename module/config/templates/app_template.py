@@ -5,7 +5,7 @@ from module.config.internal.names import ModuleNames
 from module.config.tools.config_tools import retrieveDictValue
 from module.config.templates.abstract_template import BaseTemplate
 from module.config.templates.template_enums import UITypes, UIGroups
-from module.config.validators import validateLoglevel, validateTheme, validatePath, validateLangTag
+from module.config.validators import validateLoglevel, validateTheme, validatePath, validateLangTag, validateXMLBackend
 from module.logger import logger
 
 
@@ -71,6 +71,11 @@ class AppTemplate(BaseTemplate):
                     "default": 15,
                     "min": -1,
                     "max": 30
+                },
+                "enableMetrics": {
+                    "ui_title": "Record performance metrics",
+                    "ui_desc": "Timings and counters are written to the log and to metrics.json in the log directory",
+                    "default": False
                 }
             },
             "Appearance": {
@@ -147,6 +152,41 @@ class AppTemplate(BaseTemplate):
                     "ui_desc": "Useful for debugging the XML engine",
                     "default": False
                 },
+                "xmlBackend": {
+                    "ui_type": UITypes.COMBOBOX,
+                    "ui_title": "Set XML parser backend",
+                    "ui_desc": "The expat backend is faster on well-formed files. Malformed files are always parsed with the regex backend",
+                    "default": "regex",
+                    "values": AppArgs.template_xmlBackends,
+                    "validators": [
+                        validateXMLBackend
+                    ]
+                },
+                "xmlMemoryMap": {
+                    "ui_title": "Memory-map XML input",
+                    "ui_desc": "Reduces memory usage on very large files. The file may be locked for editing while it is open in the app",
+                    "default": False
+                },
+                "xmlParallelParse": {
+                    "ui_title": "Parse large XML files in parallel",
+                    "ui_desc": "Files larger than 16 MB are split into chunks parsed by multiple processes. Only used by the regex backend",
+                    "default": False
+                },
+                "xmlPatchOutput": {
+                    "ui_title": "Only replace the translated language in the output XML file",
+                    "ui_desc": "Everything else is copied unchanged from the input file instead of its sanitized form. Speeds up saving very large files",
+                    "default": False
+                },
+                "livePreview": {
+                    "ui_title": "Update the preview while editing",
+                    "ui_desc": "Edited entries are substituted into the preview in the background. Otherwise, the preview is updated when translating",
+                    "default": True
+                },
+                "watchXMLFile": {
+                    "ui_title": "Reload the XML file when it is changed by another program",
+                    "ui_desc": "Only changed entries are updated. Translations of unchanged entries are kept",
+                    "default": True
+                },
                 "colorCodeSep": {
                     "ui_title": "Exclude color codes from extraction",
                     "ui_desc": "Due to possible loss of text during translation, some color codes might still be included",
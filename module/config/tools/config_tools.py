@@ -1,7 +1,7 @@
 import os
 import shutil
 import tomlkit
-import tomlkit.exceptions
+import tomllib
 import json
 import traceback
 
@@ -13,6 +13,7 @@ from module.config.internal.app_args import AppArgs
 from module.config.tools.ini_file_parser import IniFileParser
 from module.exceptions import IniParseError, InvalidMasterKeyError, MissingFieldError
 from module.logger import logger
+from module.tools.metrics import metrics
 from module.tools.types.general import Model, StrPath, NestedDict
 from module.tools.utilities import formatValidationError
 
@@ -55,14 +56,15 @@ def writeConfig(config: dict | Model, dst_path: StrPath, comments: Optional[Any]
         if not dst_dir.exists():
             dst_dir.mkdir()
 
-        if extension.lower() == "toml":
-            _generateTOMLconfig(config, dst_path, comments)
-        elif extension.lower() == "ini":
-            _generateINIconfig(config, dst_path)
-        elif extension.lower() == "json":
-            _generateJSONConfig(config, dst_path)
-        else:
-            _logger_.warn(f"Cannot write unsupported file '{file}'")
+        with metrics.timer("config.write"):
+            if extension.lower() == "toml":
+                _generateTOMLconfig(config, dst_path, comments)
+            elif extension.lower() == "ini":
+                _generateINIconfig(config, dst_path)
+            elif extension.lower() == "json":
+                _generateJSONConfig(config, dst_path)
+            else:
+                _logger_.warn(f"Cannot write unsupported file '{file}'")
     except Exception:
         _logger_.error(f"Failed to write {file} to '{dst_path}'\n" + traceback.format_exc(limit=AppArgs.traceback_limit))
         raise
@@ -342,7 +344,7 @@ def insertDictValue(input: dict, key: str, value: Any, parent_key: Optional[str]
 
 def loadConfig(config_name: str, config_path: StrPath, validator: Callable[[Mapping], dict[str, Any]],
                 internal_config: Optional[dict[str, Any]]=None, doWriteConfig: bool=True,
-                retries: int=1) -> tuple[dict[str, Any] | None, bool]:
+                retries: int=1, raw_config: Optional[Mapping]=None) -> tuple[dict[str, Any] | None, bool]:
     """Read and validate the config file residing at the supplied config path.
 
     Parameters
@@ -371,6 +373,11 @@ def loadConfig(config_name: str, config_path: StrPath, validator: Callable[[Mapp
         Note: This has no effect if writeBackup is False.
         By default 1.
 
+    raw_config : Mapping, optional
+        The config file already read into a raw mapping, e.g. at startup.
+        The file is only read if this is None. Reloads always read the file.
+        By default None.
+
     Returns
     -------
     tuple[dict[str, Any] | None, bool]
@@ -388,17 +395,20 @@ def loadConfig(config_name: str, config_path: StrPath, validator: Callable[[Mapp
     filename = os.path.split(config_path)[1]
     extension = os.path.splitext(filename)[1].strip(".")
     try:
-        with open(config_path, "rb") as file:
-            if extension.lower() == "toml":
-                raw_config = tomlkit.load(file)
-            elif extension.lower() == "ini":
-                raw_config = IniFileParser.load(file)
-            elif extension.lower() == "json":
-                raw_config = json.load(file)
-            else:
-                err_msg = f"{config_name}: Cannot load unsupported file '{config_path}'"
-                raise NotImplementedError(err_msg)
-        config = validator(raw_config)
+        if raw_config is None:
+            with metrics.timer("config.load"), open(config_path, "rb") as file:
+                if extension.lower() == "toml":
+                    # Validation only needs plain data. tomlkit is only used when writing to preserve formatting
+                    raw_config = tomllib.load(file)
+                elif extension.lower() == "ini":
+                    raw_config = IniFileParser.load(file)
+                elif extension.lower() == "json":
+                    raw_config = json.load(file)
+                else:
+                    err_msg = f"{config_name}: Cannot load unsupported file '{config_path}'"
+                    raise NotImplementedError(err_msg)
+        with metrics.timer("config.validate"):
+            config = validator(raw_config)
     except ValidationError as err:
         isError, isRecoverable = True, True
         _logger_.warn(f"{config_name}: Could not validate '{filename}'")
@@ -422,7 +432,7 @@ def loadConfig(config_name: str, config_path: StrPath, validator: Callable[[Mapp
         if doWriteConfig:
             backupConfig(config_path)
             writeConfig(internal_config, config_path)
-    except (tomlkit.exceptions.ParseError, IniParseError) as err:
+    except (tomllib.TOMLDecodeError, IniParseError) as err:
         isError, isRecoverable = True, True
         _logger_.warn(f"{config_name}: Failed to parse '{filename}':\n"
                       + f"  {err.args[0]}\n")
@@ -12,9 +12,9 @@ class TemplateParser():
     _instance = None
     _logger = logger
 
-    _parsed_templates: list[str] = [] # Remember templates already parsed
+    _parsed_templates: set[str] = set() # Remember templates already parsed
     _validation_infos: dict[str, ValidationInfo] = {} # Store information used to generate validation models
-    _orphan_groups: dict[str, list[str]] = {} # These groups have no parent assigned to them which is an error
+    _orphan_groups: dict[str, set[str]] = {} # These groups have no parent assigned to them which is an error
 
     def __new__(cls) -> Self:
         if cls._instance is None:
@@ -85,15 +85,14 @@ class TemplateParser():
                         self.__ui_group.setUIGroupParent(options["ui_group_parent"])
 
                         # A parent for this group was found
-                        if group in self._orphan_groups[template_name]:
-                            self._orphan_groups[template_name].remove(group)
+                        self._orphan_groups[template_name].discard(group)
                 # This setting is a child of this group
                 else:
                     self.__ui_group.addChildName(setting)
 
                     # This group has no parent associated
                     if self.__ui_group.getParentName() is None:
-                        self._orphan_groups[template_name].append(group)
+                        self._orphan_groups[template_name].add(group)
         # This setting has wrong options; it is not in a group yet is still a group parent
         elif "ui_group_parent" in options:
             self._logger.warn(f"Template '{template_name}': Group parent setting '{setting}' is not in a group. Skipping")
@@ -167,7 +166,7 @@ class TemplateParser():
             Defaults to False.
         """
         if not template_name in self._parsed_templates or force:
-            self._orphan_groups |= {template_name: []}
+            self._orphan_groups |= {template_name: set()}
             validation_info = ValidationInfo()
 
             # Enable both section and sectionless parsing
@@ -188,17 +187,16 @@ class TemplateParser():
                 )
             self._checkGroups(template_name)
             self._validation_infos |= {template_name: validation_info}
-            self._parsed_templates.append(template_name)
+            self._parsed_templates.add(template_name)
 
     def formatGroup(self, template_name, ui_group: str) -> list[str]:
         group_list = f"{ui_group}".replace(" ", "").split(",")
 
         # Ensure orphan groups are excluded when external components
         # need raw access to template groups
-        if template_name in self._parsed_templates and len(group_list) > 0:
-            for group in group_list:
-                if group in self._orphan_groups[template_name]:
-                    group_list.remove(group)
+        if template_name in self._parsed_templates and self._orphan_groups[template_name]:
+            orphan_groups = self._orphan_groups[template_name]
+            group_list = [group for group in group_list if group not in orphan_groups]
         return group_list
 
     def getGroup(self, template_name: str, ui_group: str) -> Group | None:
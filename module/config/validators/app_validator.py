@@ -72,4 +72,28 @@ def validateLangTag(tag: str) -> str:
     if not tag in AppArgs.template_langTags:
         err_msg = (f"Invalid XML language tag '{tag}'. Expected one of '{iterToString(AppArgs.template_langTags, separator=", ")}'")
         raise AssertionError(err_msg)
-    return tag
\ No newline at end of file
+    return tag
+
+
+def validateXMLBackend(backend: str) -> str:
+    """Ensure the XML parser backend is a valid argument for XML tools
+
+    Parameters
+    ----------
+    backend : str
+        The XML parser backend, e.g. "regex"
+
+    Returns
+    -------
+    str
+        The XML parser backend, if valid
+
+    Raises
+    ------
+    AssertionError
+        The XML parser backend is invalid
+    """
+    if not backend in AppArgs.template_xmlBackends:
+        err_msg = (f"Invalid XML parser backend '{backend}'. Expected one of '{iterToString(AppArgs.template_xmlBackends, separator=", ")}'")
+        raise AssertionError(err_msg)
+    return backend
\ No newline at end of file
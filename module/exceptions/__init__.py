@@ -5,4 +5,16 @@ class InvalidMasterKeyError(KeyError):
     pass
 
 class IniParseError(ValueError):
-    pass
\ No newline at end of file
+    pass
+
+class XMLBackendError(ValueError):
+    pass
+
+class RPCError(Exception):
+    """ A request to the XML server failed. The code is a JSON-RPC error code """
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+class ExchangeFormatError(ValueError):
+    pass
@@ -1,15 +1,15 @@
-import re
 import logging
 import os
 
-from pathlib import Path
 from datetime import datetime
-from typing import Self
+from typing import Any, Mapping, Self
 
 from module.logger.coloredformatter import ColoredFormatter
 from module.logger.colorcodefilter import ColorCodeFilter
 from module.config.internal.app_args import AppArgs
+from module.config.internal.config_bootstrap import readRawConfig
 from module.config.internal.names import ModuleNames
+from module.tools.worker_process import isWorkerProcess
 
 
 class Logger():
@@ -18,9 +18,11 @@ class Logger():
     def __new__(cls) -> Self:
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance._create_logger(cls._instance._getConfigLoglevel(AppArgs.app_config_path))
+            cls._instance._create_logger(cls._instance._getConfigLoglevel(readRawConfig(AppArgs.app_config_path)))
             cls._instance._create_logger_title()
-            cls._instance._writeHeaderToLog()
+            # Worker processes, e.g. those parsing XML in parallel, share the log of the app
+            if not isWorkerProcess():
+                cls._instance._writeHeaderToLog()
         return cls._instance
 
     def _current_datetime(self) -> str:
@@ -72,27 +74,14 @@ class Logger():
                  "└" + "─"*padding + "┘"
         self.logger_title.info(f"\n{header}")
 
-    def _getConfigLoglevel(self, configpath: Path, default="DEBUG") -> str:
+    def _getConfigLoglevel(self, raw_config: Mapping[str, Any] | None, default="DEBUG") -> str:
         """ Decouple the logger module from the app_config module """
-        try:
-            with open(configpath, "r", encoding="utf-8") as file:
-                lines = file.read().splitlines()
-        except FileNotFoundError:
+        if not raw_config:
             return default
 
-        pattern = re.compile(r"(?<!.)\[(\w*)\]|(?<!.)(\w+)\s{0,1}=(?(2)\s{0,1}(.*))")
-        for line in lines:
-            if line == "":
-                continue
-            match = re.search(pattern, line)
-            if match is None:
-                continue
-            key = match.group(2)
-            value = match.group(3)
-            if key == "loglevel":
-                value = value.strip("\"")
-                if value in AppArgs().template_loglevels:
-                    return value
+        for section in raw_config.values():
+            if isinstance(section, Mapping) and section.get("loglevel") in AppArgs.template_loglevels:
+                return section["loglevel"]
         return default
 
     def get_logger(self) -> logging.Logger:
@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+from time import perf_counter
+from typing import Any, Callable, Self
+
+from module.config.internal.app_args import AppArgs
+from module.logger import logger
+from module.tools.types.general import StrPath
+
+
+class _Timer():
+    __slots__ = ("_metrics", "_name", "_start")
+
+    def __init__(self, metrics: "Metrics", name: str) -> None:
+        self._metrics = metrics
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> Self:
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._metrics.addTime(self._name, perf_counter() - self._start)
+
+
+class _NullTimer():
+    """ Used in place of a timer when metrics are disabled """
+    __slots__ = ()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+class Metrics():
+    _instance = None
+    _logger = logger
+    _null_timer = _NullTimer()
+
+    def __new__(cls) -> Self:
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            # Allow enabling metrics before the config is loaded, e.g. to time the config itself
+            cls._instance._enabled = os.environ.get("DDLH_METRICS", "0") not in ("", "0")
+            cls._instance._timers = {}   # type: dict[str, dict[str, float]]
+            cls._instance._counters = {} # type: dict[str, int]
+            # Metrics are recorded by the GUI thread and the threads of the XML server
+            cls._instance._lock = threading.Lock()
+            cls._instance._listeners = [] # type: list[Callable[[dict[str, dict[str, Any]]], None]]
+        return cls._instance
+
+    def isEnabled(self) -> bool:
+        return self._enabled
+
+    def setEnabled(self, enabled: bool) -> None:
+        self._enabled = enabled
+
+    def timer(self, name: str) -> _Timer | _NullTimer:
+        """Context manager timing the enclosed block.
+        Repeated timings of the same name are accumulated.
+
+        Parameters
+        ----------
+        name : str
+            Name of the timer, e.g. "xml.parse".
+        """
+        if not self._enabled:
+            return self._null_timer
+        return _Timer(self, name)
+
+    def addTime(self, name: str, seconds: float) -> None:
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = {"calls": 0, "seconds": 0.0, "last": 0.0}
+            timer["calls"] += 1
+            timer["seconds"] += seconds
+            timer["last"] = seconds
+
+    def count(self, name: str, value: int=1) -> None:
+        """Add value to the counter with this name, e.g. "xml.parse.entries" """
+        if not self._enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {
+                "timers": {name: dict(timer) for name, timer in self._timers.items()},
+                "counters": dict(self._counters)
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def formatSummary(self, snapshot: dict[str, dict[str, Any]] | None=None) -> str:
+        snapshot = self.snapshot() if snapshot is None else snapshot
+        lines = []
+        for name, timer in sorted(snapshot["timers"].items()):
+            lines.append(f"{name}: {timer["calls"]} calls, {timer["seconds"] * 1000:.2f} ms total, "
+                         + f"{timer["last"] * 1000:.2f} ms last")
+        for name, value in sorted(snapshot["counters"].items()):
+            lines.append(f"{name} = {value}")
+        return "\n  ".join(lines)
+
+    def addListener(self, listener: Callable[[dict[str, dict[str, Any]]], None]) -> None:
+        """ Call the listener with a snapshot of the metrics whenever they are published """
+        with self._lock:
+            self._listeners.append(listener)
+
+    def removeListener(self, listener: Callable[[dict[str, dict[str, Any]]], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def dumpJSON(self, dst_path: StrPath, snapshot: dict[str, dict[str, Any]] | None=None) -> None:
+        with open(dst_path, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot() if snapshot is None else snapshot, file, indent=4)
+
+    def publish(self) -> None:
+        """Make the current metrics available through the log, a JSON file in the log directory,
+        and the listeners, e.g. the metricsUpdated signal of the GUI.
+        """
+        if not self._enabled:
+            return
+        try:
+            snapshot = self.snapshot()
+            self._logger.debug(f"Metrics:\n  {self.formatSummary(snapshot)}")
+            if AppArgs.log_dir.exists():
+                self.dumpJSON(AppArgs.metrics_path, snapshot)
+            with self._lock:
+                listeners = list(self._listeners)
+            for listener in listeners:
+                listener(snapshot)
+        except Exception:
+            self._logger.warning("Failed to publish metrics", exc_info=True)
+
+
+metrics = Metrics()
@@ -123,7 +123,7 @@ def getDictNestingLevel(input: dict, stopAt: int) -> int:
             stack.pop()
 
 
-def formatListForDisplay(input: list[str], displayItems: int=15, join_string: str="\n") -> str:
+def formatListForDisplay(input: list[str], displayItems: int=15, join_string: str="\n", total: int | None=None) -> str:
     """Format arbitrary length lists for screen (or log) display.
 
     Parameters
@@ -137,12 +137,16 @@ def formatListForDisplay(input: list[str], displayItems: int=15, join_string: st
     joinLineString : str, optional
         String used to join() strings in the list, by default "\\n"
 
+    total : int, optional
+        The total number of items, if input only holds the first items of a longer list.
+        By default the size of input
+
     Returns
     -------
     list[str]
         The formatted list
     """
-    inputSize = len(input)
+    inputSize = len(input) if total is None else total
     doTruncate = displayItems != -1 and inputSize > displayItems + 1
     silent = displayItems == 0
     if silent: join_string = ""
@@ -0,0 +1,26 @@
+"""
+Entry points of worker processes, e.g. those parsing XML in parallel.
+
+Workers are spawned, so they import every module their task needs. This module imports neither the GUI
+nor the logger, so a worker is marked as such before the modules of its task are imported.
+"""
+import os
+from typing import Any
+
+# Set in worker processes. Read by the logger, as workers share the log of the app
+WORKER_PROCESS_ENV = "DDLH_WORKER_PROCESS"
+
+
+def initWorkerProcess() -> None:
+    """ Initializer of process pools. Runs before any task is received """
+    os.environ[WORKER_PROCESS_ENV] = "1"
+
+
+def isWorkerProcess() -> bool:
+    return os.environ.get(WORKER_PROCESS_ENV) == "1"
+
+
+def parseXMLChunk(*args: Any) -> Any:
+    """ Sanitize and parse a chunk of an XML file. See module.xml_tools.xml_parser.parseChunk """
+    from module.xml_tools.xml_parser import parseChunk
+    return parseChunk(*args)
@@ -1,3 +1,4 @@
+from .xml_entry import XMLEntry
 from .xml_parser import XMLParser
 from .xml_substituter import XMLSubstituter
 from .xml_validator import XMLValidator
\ No newline at end of file
@@ -0,0 +1,114 @@
+from typing import NamedTuple
+
+
+class CDATALocation(NamedTuple):
+    """Offsets of the CDATA section of an entry line.
+
+    status : int
+        CDATAStatus of the line.
+
+    start, end : int
+        Well-formed: the section "[CDATA[...]]".
+        Fixable: the part of the line replaced when repairing it, or -1 if nothing is replaced.
+        Broken: -1.
+
+    payload_start, payload_end : int
+        The text of the section. -1 if broken.
+    """
+    status: int
+    start: int
+    end: int
+    payload_start: int
+    payload_end: int
+
+
+class CDATAStatus():
+    WELLFORMED, FIXABLE, BROKEN = range(3)
+
+
+class _Tokens():
+    __slots__ = ("bracket", "close_bracket", "close", "cdata", "exit_tag", "tag_gap", "tag_end")
+
+    def __init__(self, encode: bool) -> None:
+        def convert(token: str) -> str | bytes:
+            return token.encode() if encode else token
+        self.bracket = convert("[")
+        self.close_bracket = convert("]")
+        # End of a well-formed section followed by the entry exit tag "]]></"
+        self.close = convert("]]></")
+        self.cdata = convert("CDATA")
+        self.exit_tag = convert("></")
+        self.tag_gap = convert("><")
+        self.tag_end = convert(">")
+
+
+_text_tokens = _Tokens(encode=False)
+_bytes_tokens = _Tokens(encode=True)
+_broken = CDATALocation(CDATAStatus.BROKEN, -1, -1, -1, -1)
+
+
+def locateCDATA(line: str | bytes, start: int=0, end: int | None=None) -> CDATALocation:
+    """Find the CDATA section of an entry line and classify it.
+
+    Each step is a bounded number of substring searches, so the time taken is linear in the length of the line
+    regardless of how many brackets the text contains.
+
+    Parameters
+    ----------
+    line : str | bytes
+        The entry line. Any buffer with find and rfind, e.g. a memory-mapped file, is supported.
+
+    start, end : int, optional
+        Only locate the section within line[start:end].
+        By default the whole line.
+
+    Returns
+    -------
+    CDATALocation
+        Offsets into the line.
+    """
+    if end is None:
+        end = len(line)
+    tokens = _text_tokens if isinstance(line, str) else _bytes_tokens
+
+    # Well-formed: "[" anything "[" text "]]></" where the text ends at the last "]]></"
+    close = line.rfind(tokens.close, start, end)
+    if close >= 0:
+        # Brackets in the attributes of the entry start tag are not part of the section
+        tag_end = line.find(tokens.tag_end, start, close)
+        open_bracket = line.find(tokens.bracket, tag_end + 1 if tag_end >= 0 else start, close)
+        if open_bracket >= 0:
+            payload_bracket = line.find(tokens.bracket, open_bracket + 1, close)
+            if payload_bracket >= 0:
+                return CDATALocation(CDATAStatus.WELLFORMED, open_bracket, close + 2, payload_bracket + 1, close)
+
+    # Fixable: "CDATA" text "></" where brackets are optional
+    cdata = line.find(tokens.cdata, start, end)
+    if cdata < 0:
+        return _broken
+    payload_start = cdata + len(tokens.cdata)
+    if line[payload_start:payload_start + 1] == tokens.bracket:
+        payload_start += 1
+    exit_tag = line.find(tokens.exit_tag, payload_start, end)
+    if exit_tag < 0:
+        return _broken
+    # Up to two closing brackets are not part of the text
+    payload_end = exit_tag
+    for _ in range(2):
+        if payload_end > payload_start and line[payload_end - 1:payload_end] == tokens.close_bracket:
+            payload_end -= 1
+
+    # Everything between the end of the entry start tag "><" and the entry exit tag "></" is replaced
+    fix_start = line.find(tokens.tag_gap, start, end)
+    fix_end = line.rfind(tokens.exit_tag, start, end)
+    if fix_start < 0 or fix_end < fix_start + 2:
+        fix_start = fix_end = -1
+    return CDATALocation(CDATAStatus.FIXABLE, fix_start, fix_end, payload_start, payload_end)
+
+
+def repairCDATA(line: str, location: CDATALocation) -> str:
+    """ Rebuild the CDATA section of a fixable line as "<![CDATA[text]]" """
+    if location.start < 0:
+        return line
+    payload = line[location.payload_start:location.payload_end]
+    return f"{line[:location.start]}><![CDATA[{payload}]]{line[location.end:]}"
@@ -0,0 +1,130 @@
+from array import array
+from typing import Iterator, Optional, Self
+
+
+class ColorCodedText():
+    """The CDATA text of an entry split into color code tags, e.g. "{colour_start|huixiang}",
+    and the text around them.
+
+    Segments are stored as a flat array of (kind, start, end) offsets into the text.
+    Tags and text too short to withstand translation are kept as-is.
+    The remaining text segments are translated.
+    """
+    __slots__ = ("text", "segments", "translatable_count")
+
+    TAG, TEXT, TRANSLATABLE = range(3)
+
+    def __init__(self, text: str, segments: array) -> None:
+        self.text = text
+        self.segments = segments
+        self.translatable_count = sum(1 for i in range(0, len(segments), 3) if segments[i] == self.TRANSLATABLE)
+
+    @classmethod
+    def fromText(cls, text: str, min_length: int) -> Optional[Self]:
+        """Split the text into segments.
+
+        Parameters
+        ----------
+        text : str
+            The CDATA text of an entry.
+
+        min_length : int
+            Text segments shorter than this are not translated,
+            unless it is the only segment with text.
+
+        Returns
+        -------
+        ColorCodedText | None
+            None if the text has no color codes or no text to translate.
+        """
+        segments = scanColorCodes(text)
+        text_segments = [i for i in range(0, len(segments), 3)
+                         if segments[i] == cls.TEXT and not text[segments[i + 1]:segments[i + 2]].isspace()]
+        if len(text_segments) == len(segments) // 3 or not text_segments:
+            return None
+        for i in text_segments:
+            if len(text_segments) == 1 or len(text[segments[i + 1]:segments[i + 2]].strip()) >= min_length:
+                segments[i] = cls.TRANSLATABLE
+        if cls.TRANSLATABLE not in segments[::3]:
+            return None
+        return cls(text, segments)
+
+    def iterSegments(self) -> Iterator[tuple[int, str]]:
+        """ Kind and text of each segment """
+        segments, text = self.segments, self.text
+        for i in range(0, len(segments), 3):
+            yield segments[i], text[segments[i + 1]:segments[i + 2]]
+
+    def extract(self, delimiter: str) -> str:
+        """ The text to translate. Translatable segments are separated by the delimiter """
+        return f" {delimiter} ".join(segment.strip() for kind, segment in self.iterSegments() if kind == self.TRANSLATABLE)
+
+    def extractTranslation(self, translation: str, delimiter: str) -> Optional[str]:
+        """Convert a translation which kept the color codes of the text, e.g. a translated CDATA text,
+        to the delimited form of extract.
+
+        Returns
+        -------
+        str | None
+            The translation in the form of extract.
+            None if its text does not line up with the text between the color codes of the source.
+        """
+        translated = [segment for kind, segment in ColorCodedText(translation, scanColorCodes(translation)).iterSegments()
+                      if kind == self.TEXT and not segment.isspace()]
+        kinds = [kind for kind, segment in self.iterSegments() if kind != self.TAG and not segment.isspace()]
+        if len(translated) != len(kinds):
+            return None
+        return f" {delimiter} ".join(segment.strip() for kind, segment in zip(kinds, translated) if kind == self.TRANSLATABLE)
+
+    def apply(self, translation: str, delimiter: str) -> tuple[str, bool]:
+        """Put the translated segments back in between the color codes.
+
+        Returns
+        -------
+        tuple[str, bool]
+            The text and whether it failed, i.e. the number of translated segments did not match.
+            Segments without a translation keep their source text.
+        """
+        translated = translation.split(delimiter)
+        failed = len(translated) != self.translatable_count
+        parts = [] # type: list[str]
+        j = 0
+        for kind, segment in self.iterSegments():
+            if kind == self.TRANSLATABLE:
+                if j < len(translated):
+                    # Keep the surrounding whitespace of the source. The translation is stripped of the spaces added around delimiters
+                    start, end = len(segment) - len(segment.lstrip()), len(segment.rstrip())
+                    parts.append(f"{segment[:start]}{translated[j].strip()}{segment[end:]}")
+                else:
+                    parts.append(segment)
+                j += 1
+            else:
+                parts.append(segment)
+        return "".join(parts), failed
+
+
+def scanColorCodes(text: str) -> array:
+    """Split text into color code tags ("{...}") and the text around them in a single pass.
+
+    Returns
+    -------
+    array
+        Flat array of (kind, start, end) offsets into the text,
+        where kind is ColorCodedText.TAG or ColorCodedText.TEXT.
+    """
+    segments = array("l")
+    position, length = 0, len(text)
+    while position < length:
+        start = text.find("{", position)
+        if start < 0:
+            break
+        end = text.find("}", start + 1)
+        if end < 0:
+            break
+        if start > position:
+            segments.extend((ColorCodedText.TEXT, position, start))
+        segments.extend((ColorCodedText.TAG, start, end + 1))
+        position = end + 1
+    if position < length:
+        segments.extend((ColorCodedText.TEXT, position, length))
+    return segments
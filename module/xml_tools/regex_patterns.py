@@ -1,4 +1,5 @@
 import re
+from functools import cache
 
 
 class Pattern():
@@ -7,6 +8,9 @@ class Pattern():
     # Finds: "<language id="english">"
     language_start = re.compile(r"<language id=.*?(?=>).")
 
+    # Get the value of language id
+    language_id = re.compile(r"<language id=\"(.*?)\"(?=>)")
+
     # End language tag "</language"
     language_exit = re.compile(r"<\/language>")
 
@@ -22,28 +26,36 @@ class Pattern():
     # Get the value of entry id
     entry_id = re.compile(r"<entry id(?:.*\"(.*)\")(?=><)")
 
-    # Get data from localization entries with well-formed CDATA
-    # -- Example --
-    # INPUT: "<entry id="name"><![CDATA[text[that may look]] like this]]></entry>"
-    # Finds: "text[that may look]] like this"
-    cdata = re.compile(r"\[.*\[(.*)\]{2}(?=></)")
-
-    # Get all text in the entry field.
-    # -- Example --
-    # INPUT: "<entry id="name"><![CDATA[text[that may look]] like this]]></entry>"
-    # Finds: "><![CDATA[text[that may look]] like this]]"   <--- Remember that "><" are included as well (TODO: fix that)
-    cdata_fix = re.compile(r"><.*(?=></)")
-
-    # Get data from localization entries with malformed CDATA
-    # Well-formed: "[CDATA[text[that may look]]"
-    # Works on:    "CDATAtextthat may look     <--- Missing any "[" and "]"
-    # Finds:       "textthat may look"
-    malformed_cdata = re.compile(r"\[?CDATA\[?(.*?)(?=]{0,2}></)")
-
-    # Split text and color codes. Works on all text/color code pairs in INPUT
-    # -- Example --
-    # INPUT: "{colour_start|huixiang}检测到程序错误！{colour_end}"
-    # begin_color: "{colour_start|huixiang}"
-    # text:        "检测到程序错误！"
-    # end_color:   "{colour_end}"
-    color_codes = re.compile(r"(?P<start_color>{.*?})(?P<text>.*?)(?P<end_color>{.*?})")
\ No newline at end of file
+
+class BytesPattern():
+    """ Byte-level variants of Pattern for scanning raw input buffers """
+    language_start = re.compile(Pattern.language_start.pattern.encode())
+    language_exit = re.compile(Pattern.language_exit.pattern.encode())
+    entry_start = re.compile(Pattern.entry_start.pattern.encode())
+    entry_exit = re.compile(Pattern.entry_exit.pattern.encode())
+
+
+class LanguageTag():
+    """Matches the language id of a language start tag literally, e.g. "english" in '<language id="english">'.
+
+    The tag is compared as plain text, so it is never interpreted as a regex
+    and a tag never matches a longer tag ending with it.
+    """
+    __slots__ = ("tag", "_text", "_bytes")
+
+    def __init__(self, lang_tag: str) -> None:
+        self.tag = lang_tag
+        self._text = f"\"{lang_tag}\">"
+        self._bytes = self._text.encode()
+
+    def matches(self, line: str) -> bool:
+        return self._text in line
+
+    def matchesBytes(self, line: bytes) -> bool:
+        return self._bytes in line
+
+
+@cache
+def getLanguageTag(lang_tag: str) -> LanguageTag:
+    """ The shared matcher of a language tag """
+    return LanguageTag(lang_tag)
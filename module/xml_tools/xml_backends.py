@@ -0,0 +1,108 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional
+from xml.parsers import expat
+
+from module.exceptions import XMLBackendError
+from module.xml_tools.regex_patterns import BytesPattern
+from module.xml_tools.xml_source import XMLSource
+
+
+class XMLBackend(ABC):
+    """ Abstract Base Class for all XML parser backends.
+
+    A backend locates the entries of an XML source. Sanitization and extraction of
+    the located entries are shared by all backends.
+    """
+    name = ""
+
+    @abstractmethod
+    def iterEntrySpans(self, source: XMLSource) -> Iterator[tuple[int, int]]:
+        """Yield the first and last line index of each entry in document order.
+
+        Raises
+        ------
+        XMLBackendError
+            If the backend is unable to parse the source.
+        """
+        ...
+
+
+class RegexBackend(XMLBackend):
+    """ Line-based backend using regex. Tolerates malformed XML """
+    name = "regex"
+
+    def iterEntrySpans(self, source: XMLSource, start: int=0, end: Optional[int]=None) -> Iterator[tuple[int, int]]:
+        """Yield the first and last line index of each entry in document order.
+
+        Parameters
+        ----------
+        start, end : int, optional
+            Only locate the entries within lines [start, end).
+            The range must not split an entry. By default all lines.
+        """
+        begin_entry_line = -1
+        for i, line in enumerate(source.iterLineBytes(start, end), start):
+            # Found entry start tag "<entry"
+            if begin_entry_line < 0 and BytesPattern.entry_start.search(line):
+                begin_entry_line = i
+
+            # Found entry exit tag "</entry"
+            if begin_entry_line >= 0 and BytesPattern.entry_exit.search(line):
+                yield begin_entry_line, i
+                begin_entry_line = -1
+
+
+class ExpatBackend(XMLBackend):
+    """ Streaming backend using the expat XML parser. Requires well-formed XML """
+    name = "expat"
+    chunk_size = 1 << 20
+
+    def iterEntrySpans(self, source: XMLSource) -> Iterator[tuple[int, int]]:
+        parser = expat.ParserCreate()
+        entry_starts = [] # type: list[int]
+        spans = [] # type: list[tuple[int, int]]
+
+        def onStartElement(name: str, attributes: dict) -> None:
+            if name == "entry":
+                entry_starts.append(parser.CurrentByteIndex)
+
+        def onEndElement(name: str) -> None:
+            if name == "entry":
+                begin = entry_starts.pop()
+                # Entries nested in other entries are part of the outermost entry
+                if not entry_starts:
+                    span = (source.lineIndexAt(begin), source.lineIndexAt(parser.CurrentByteIndex))
+                    # Entries sharing a line are treated as a single entry (like the regex backend)
+                    if spans and span[0] <= spans[-1][1]:
+                        spans[-1] = (spans[-1][0], span[1])
+                    else:
+                        spans.append(span)
+
+        parser.StartElementHandler = onStartElement
+        parser.EndElementHandler = onEndElement
+
+        buffer = source.getBuffer()
+        size = len(buffer)
+        with memoryview(buffer) as view:
+            for offset in range(0, size + 1, self.chunk_size):
+                try:
+                    parser.Parse(view[offset:offset + self.chunk_size], offset + self.chunk_size > size)
+                except expat.ExpatError as err:
+                    raise XMLBackendError(f"{err}") from err
+
+                # The last span might still be merged with an entry in the next chunk
+                if len(spans) > 1:
+                    yield from spans[:-1]
+                    del spans[:-1]
+        yield from spans
+
+
+_backends = {
+    RegexBackend.name: RegexBackend,
+    ExpatBackend.name: ExpatBackend
+}
+
+
+def getBackend(name: str) -> XMLBackend:
+    """Get the parser backend matching the name. Defaults to the regex backend"""
+    return _backends.get(name, RegexBackend)()
@@ -0,0 +1,95 @@
+from array import array
+from typing import NamedTuple
+
+from module.xml_tools.color_codes import ColorCodedText
+from module.xml_tools.regex_patterns import BytesPattern, LanguageTag
+from module.xml_tools.xml_source import XMLSource
+
+
+class ExtractionState():
+    """ Progress of extracting the lines of a language block """
+    OUTSIDE, EXTRACTING, DONE = range(3)
+
+
+class ParsedChunk(NamedTuple):
+    """The result of sanitizing and parsing a range of lines in a worker process.
+
+    Line numbers are relative to the first sanitized line of the chunk.
+    Line indices and positions in the source are absolute.
+    """
+    lines: array
+    overrides: list[str]
+    override_positions: list[tuple[int, int]]
+    malformed_fixed: list[str]
+    malformed_failed: list[str]
+    sanitize_positions: dict[str, str]
+    parse_positions: dict[str, str]
+    extracted_text: list[str]
+    parsed_lines: list[str]
+    parsed_line_numbers: list[int]
+    entry_color_codes: dict[int, ColorCodedText]
+    # A language tag was part of a sanitized entry. The state of the next chunks is unknown
+    ambiguous: bool
+
+
+def splitIntoChunks(source: XMLSource, count: int) -> list[tuple[int, int]]:
+    """Split the lines of the source into at most count ranges of about equal size.
+
+    Each range, except the last, ends with a line containing an entry exit tag "</entry>".
+    Thus, no entry is split between two ranges.
+
+    Returns
+    -------
+    list[tuple[int, int]]
+        The line ranges [start, end) in document order.
+    """
+    buffer = source.getBuffer()
+    size = len(buffer)
+    boundaries = [0]
+    for k in range(1, count):
+        target = max(size * k // count, source.lineRange(boundaries[-1])[0])
+        exit_tag = buffer.find(b"</entry>", target)
+        if exit_tag < 0:
+            break
+        boundary = source.lineIndexAt(exit_tag) + 1
+        if boundary >= len(source):
+            break
+        if boundary > boundaries[-1]:
+            boundaries.append(boundary)
+    boundaries.append(len(source))
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def advanceExtractionState(state: int, line: bytes, lang_tag: LanguageTag) -> int:
+    """ The extraction state after a line. Mirrors the extraction loop of the parser """
+    if state == ExtractionState.EXTRACTING and BytesPattern.language_exit.search(line):
+        return ExtractionState.DONE
+    if state != ExtractionState.DONE and BytesPattern.language_start.search(line) and lang_tag.matchesBytes(line):
+        return ExtractionState.EXTRACTING
+    return state
+
+
+def scanExtractionStates(source: XMLSource, chunks: list[tuple[int, int]], lang_tag: LanguageTag) -> list[int]:
+    """Find the extraction state at the start of each chunk.
+
+    Only the lines containing a language tag are checked. Each is located with a substring search of the buffer.
+    Language tags inside multi-line or repaired entries are not detected. Workers report those chunks as ambiguous.
+    """
+    buffer = source.getBuffer()
+    tag_lines = set() # type: set[int]
+    for needle in (b"<language id=", b"</language>"):
+        position = buffer.find(needle)
+        while position >= 0:
+            tag_lines.add(source.lineIndexAt(position))
+            position = buffer.find(needle, position + len(needle))
+
+    states = [] # type: list[int]
+    state = ExtractionState.OUTSIDE
+    tag_lines = sorted(tag_lines)
+    j = 0
+    for start, _ in chunks:
+        while j < len(tag_lines) and tag_lines[j] < start:
+            state = advanceExtractionState(state, source.lineBytes(tag_lines[j]), lang_tag)
+            j += 1
+        states.append(state)
+    return states
@@ -0,0 +1,35 @@
+from typing import NamedTuple
+
+
+class XMLEntry(NamedTuple):
+    """An entry of an XML file yielded by XMLParser.iterEntries.
+
+    entry_id : str
+        The value of the id attribute.
+
+    language : str
+        The id of the language block containing the entry. Empty if outside any language block.
+
+    text : str
+        The text to translate, as extracted by XMLParser.parse.
+        Color codes are replaced by delimiters if color code exclusion is enabled.
+
+    cdata : str
+        The CDATA text of the entry, including any color codes.
+
+    line : str
+        The sanitized entry, i.e. a single, well-formed line.
+
+    line_number : int
+        The line number of the entry in the sanitized input. Identical to the line numbers of XMLParser.parse.
+
+    position : str
+        The line number(s) of the entry in the file, e.g. '12' or '12-14'.
+    """
+    entry_id: str
+    language: str
+    text: str
+    cdata: str
+    line: str
+    line_number: int
+    position: str
@@ -0,0 +1,435 @@
+import argparse
+import csv
+import itertools
+import os
+import re
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, Mapping, NamedTuple, Optional, TextIO
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape, quoteattr
+
+from module.exceptions import ExchangeFormatError
+from module.tools.types.general import StrPath
+from module.xml_tools.xml_entry import XMLEntry
+
+# Language codes of the language tags used by exchange formats
+language_codes = {
+    "english": "en",
+    "schinese": "zh-CN"
+}
+
+
+class TranslationUnit(NamedTuple):
+    """An entry as exchanged with translation tools.
+
+    entry_id : str
+        The id of the entry. Translations are mapped back to entries by it.
+
+    source : str
+        The text of the entry.
+
+    target : str
+        The translation of the text. Empty if untranslated.
+
+    position : str
+        The line number(s) of the entry in the XML file, e.g. '12' or '12-14'. Only kept by some formats.
+    """
+    entry_id: str
+    source: str
+    target: str
+    position: str = ""
+
+
+class ExchangeFormat(ABC):
+    """ Abstract Base Class for all exchange formats.
+
+    Units are written and read one at a time, so files of any size are exchanged in constant memory.
+    """
+    name = ""
+    suffix = ""
+
+    def open(self, location: StrPath, mode: str) -> TextIO:
+        return open(location, mode, encoding="utf-8")
+
+    def writeHeader(self, file: TextIO, source_lang: str, target_lang: str, original: str) -> None:
+        pass
+
+    @abstractmethod
+    def writeUnit(self, file: TextIO, unit: TranslationUnit) -> None: ...
+
+    def writeFooter(self, file: TextIO) -> None:
+        pass
+
+    @abstractmethod
+    def iterUnits(self, location: StrPath) -> Iterator[TranslationUnit]:
+        """Yield the units of a file in document order.
+
+        Raises
+        ------
+        ExchangeFormatError
+            If the file is not valid in the format.
+        """
+        ...
+
+
+# Characters which XML 1.0 cannot represent, not even as character references
+_xml_illegal_char = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+def _escapeXML(text: str, code_points: bool=False) -> str:
+    """Escape text for XML content.
+
+    Parameters
+    ----------
+    code_points : bool, optional
+        Encode characters XML cannot represent as XLIFF 2.0 code point elements, e.g. '<cp hex="0001"/>'.
+        By default they are removed.
+    """
+    # Carriage returns are referenced, as XML parsers normalize line breaks to line feeds
+    return _xml_illegal_char.sub(lambda match: f"<cp hex=\"{ord(match[0]):04X}\"/>" if code_points else "",
+                                 escape(text, {"\r": "&#13;"}))
+
+
+def _elementText(element: ElementTree.Element) -> str:
+    """ The text of an element. XLIFF 2.0 code point elements are decoded """
+    parts = [element.text or ""]
+    for child in element:
+        if _localName(child.tag) == "cp":
+            try:
+                parts.append(chr(int(child.get("hex", ""), 16)))
+            except ValueError as err:
+                raise ExchangeFormatError(f"Invalid code point '{child.get("hex")}'") from err
+        else:
+            parts.append(_elementText(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def _localName(tag: str) -> str:
+    """ The name of an element without its namespace """
+    return tag.rsplit("}", 1)[-1]
+
+
+def _iterXLIFFUnits(location: StrPath) -> Iterator[TranslationUnit]:
+    """ Yield the units of an XLIFF 1.2 or 2.0 file. Each unit is discarded once read """
+    unit_tag = ""
+    # Open elements. Read units are removed from their parent
+    stack = [] # type: list[ElementTree.Element]
+    try:
+        for event, element in ElementTree.iterparse(location, events=("start", "end")):
+            if event == "start":
+                if not stack:
+                    if _localName(element.tag) != "xliff":
+                        raise ExchangeFormatError(f"'{os.path.split(location)[1]}' is not an XLIFF file")
+                    unit_tag = "trans-unit" if element.get("version", "1.2").startswith("1") else "unit"
+                stack.append(element)
+                continue
+
+            stack.pop()
+            if _localName(element.tag) != unit_tag:
+                continue
+            # XLIFF 1.2 keeps the text in the unit. XLIFF 2.0 splits it into segments
+            if unit_tag == "trans-unit":
+                parts = [element]
+            else:
+                parts = [child for child in element if _localName(child.tag) in ("segment", "ignorable")]
+            source, target = [], [] # type: list[str], list[str]
+            for part in parts:
+                for child in part:
+                    name = _localName(child.tag)
+                    if name == "source":
+                        source.append(_elementText(child))
+                    elif name == "target":
+                        target.append(_elementText(child))
+            yield TranslationUnit(element.get("id", ""), "".join(source), "".join(target))
+            element.clear()
+            if stack:
+                stack[-1].remove(element)
+    except ElementTree.ParseError as err:
+        raise ExchangeFormatError(f"Could not parse '{os.path.split(location)[1]}': {err}") from err
+
+
+class XLIFF12Format(ExchangeFormat):
+    """ XLIFF 1.2. Characters XML cannot represent are removed """
+    name = "xliff-1.2"
+    suffix = ".xlf"
+
+    def writeHeader(self, file: TextIO, source_lang: str, target_lang: str, original: str) -> None:
+        file.write("<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n"
+                   "<xliff version=\"1.2\" xmlns=\"urn:oasis:names:tc:xliff:document:1.2\">\n"
+                   f"  <file original={quoteattr(original)} source-language={quoteattr(source_lang)} "
+                   f"target-language={quoteattr(target_lang)} datatype=\"xml\">\n"
+                   "    <body>\n")
+
+    def writeUnit(self, file: TextIO, unit: TranslationUnit) -> None:
+        file.write(f"      <trans-unit id={quoteattr(unit.entry_id)} xml:space=\"preserve\">\n"
+                   f"        <source>{_escapeXML(unit.source)}</source>\n")
+        if unit.target:
+            file.write(f"        <target>{_escapeXML(unit.target)}</target>\n")
+        file.write("      </trans-unit>\n")
+
+    def writeFooter(self, file: TextIO) -> None:
+        file.write("    </body>\n  </file>\n</xliff>\n")
+
+    def iterUnits(self, location: StrPath) -> Iterator[TranslationUnit]:
+        return _iterXLIFFUnits(location)
+
+
+class XLIFF20Format(ExchangeFormat):
+    """ XLIFF 2.0. Characters XML cannot represent are kept as code point elements """
+    name = "xliff-2.0"
+    suffix = ".xlf"
+
+    def writeHeader(self, file: TextIO, source_lang: str, target_lang: str, original: str) -> None:
+        file.write("<?xml version=\"1.0\" encoding=\"UTF-8\"?>\n"
+                   "<xliff version=\"2.0\" xmlns=\"urn:oasis:names:tc:xliff:document:2.0\" "
+                   f"srcLang={quoteattr(source_lang)} trgLang={quoteattr(target_lang)}>\n"
+                   f"  <file id=\"f1\" original={quoteattr(original)}>\n")
+
+    def writeUnit(self, file: TextIO, unit: TranslationUnit) -> None:
+        file.write(f"    <unit id={quoteattr(unit.entry_id)}>\n"
+                   "      <segment>\n"
+                   f"        <source xml:space=\"preserve\">{_escapeXML(unit.source, code_points=True)}</source>\n")
+        if unit.target:
+            file.write(f"        <target xml:space=\"preserve\">{_escapeXML(unit.target, code_points=True)}</target>\n")
+        file.write("      </segment>\n    </unit>\n")
+
+    def writeFooter(self, file: TextIO) -> None:
+        file.write("  </file>\n</xliff>\n")
+
+    def iterUnits(self, location: StrPath) -> Iterator[TranslationUnit]:
+        return _iterXLIFFUnits(location)
+
+
+class POFormat(ExchangeFormat):
+    """ Gettext PO. The entry id is the message context (msgctxt) """
+    name = "po"
+    suffix = ".po"
+    _escapes = {"\\": "\\\\", "\"": "\\\"", "\n": "\\n", "\r": "\\r", "\t": "\\t"}
+    _unescapes = {value: key for key, value in _escapes.items()}
+    _escaped_char = re.compile(r"[\\\"\n\r\t]")
+    _escape_sequence = re.compile(r"\\[\\\"nrt]")
+    _keyword = re.compile(r"^(msgctxt|msgid_plural|msgid|msgstr(?:\[0\])?|msgstr\[\d+\])\s+\"(.*)\"$")
+
+    def _quote(self, text: str) -> str:
+        """ The text as one or more PO strings. Multi-line text is split after each newline """
+        parts = text.split("\n")
+        pieces = [f"{part}\n" for part in parts[:-1]] + ([parts[-1]] if parts[-1] else [])
+        strings = [f"\"{self._escaped_char.sub(lambda match: self._escapes[match[0]], piece)}\"" for piece in pieces]
+        if len(strings) <= 1:
+            return strings[0] if strings else "\"\""
+        return "\"\"\n" + "\n".join(strings)
+
+    def _unquote(self, string: str) -> str:
+        return self._escape_sequence.sub(lambda match: self._unescapes[match[0]], string)
+
+    def writeHeader(self, file: TextIO, source_lang: str, target_lang: str, original: str) -> None:
+        file.write("msgid \"\"\n"
+                   "msgstr \"\"\n"
+                   "\"Content-Type: text/plain; charset=UTF-8\\n\"\n"
+                   "\"Content-Transfer-Encoding: 8bit\\n\"\n"
+                   f"\"Language: {target_lang}\\n\"\n"
+                   f"\"X-Source-Language: {source_lang}\\n\"\n"
+                   f"\"X-Source-File: {self._quote(original)[1:-1]}\\n\"\n")
+        self._original = original
+
+    def writeUnit(self, file: TextIO, unit: TranslationUnit) -> None:
+        file.write("\n")
+        if unit.position:
+            file.write(f"#: {self._original}:{unit.position.split("-")[0]}\n")
+        file.write(f"msgctxt {self._quote(unit.entry_id)}\n"
+                   f"msgid {self._quote(unit.source)}\n"
+                   f"msgstr {self._quote(unit.target)}\n")
+
+    def iterUnits(self, location: StrPath) -> Iterator[TranslationUnit]:
+        fields = {} # type: dict[str, str]
+        key = None # type: Optional[str]
+
+        def unit() -> Optional[TranslationUnit]:
+            # The header has no context
+            if "msgctxt" not in fields or "msgid" not in fields:
+                return None
+            return TranslationUnit(fields["msgctxt"], fields["msgid"], fields.get("msgstr", fields.get("msgstr[0]", "")))
+
+        with self.open(location, "r") as file:
+            for line_number, line in enumerate(file, 1):
+                line = line.strip()
+                # Comments, including obsolete messages "#~", are skipped
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("\""):
+                    if key is None or not line.endswith("\"") or len(line) < 2:
+                        raise ExchangeFormatError(f"Unexpected string on line {line_number} of '{os.path.split(location)[1]}'")
+                    fields[key] += self._unquote(line[1:-1])
+                    continue
+                match = self._keyword.match(line)
+                if match is None:
+                    raise ExchangeFormatError(f"Unexpected keyword on line {line_number} of '{os.path.split(location)[1]}'")
+                # A context or id after a translation starts the next message
+                if match[1] in ("msgctxt", "msgid") and any(field.startswith("msgstr") for field in fields):
+                    if (previous := unit()) is not None:
+                        yield previous
+                    fields.clear()
+                key = match[1]
+                fields[key] = self._unquote(match[2])
+        if (previous := unit()) is not None:
+            yield previous
+
+
+class CSVFormat(ExchangeFormat):
+    """ Comma-separated values with a header row "id,source,target" """
+    name = "csv"
+    suffix = ".csv"
+    columns = ["id", "source", "target"]
+
+    def open(self, location: StrPath, mode: str) -> TextIO:
+        # A byte order mark is added by some spreadsheet programs
+        return open(location, mode, encoding="utf-8-sig" if "r" in mode else "utf-8", newline="")
+
+    def writeHeader(self, file: TextIO, source_lang: str, target_lang: str, original: str) -> None:
+        self._writer = csv.writer(file)
+        self._writer.writerow(self.columns)
+
+    def writeUnit(self, file: TextIO, unit: TranslationUnit) -> None:
+        self._writer.writerow((unit.entry_id, unit.source, unit.target))
+
+    def iterUnits(self, location: StrPath) -> Iterator[TranslationUnit]:
+        with self.open(location, "r") as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                return
+            names = [name.strip().lower() for name in header]
+            if "id" in names:
+                id_column = names.index("id")
+                source_column = names.index("source") if "source" in names else -1
+                target_column = names.index("target") if "target" in names else -1
+            else:
+                # No header. Use the default column order
+                id_column, source_column, target_column = range(3)
+                reader = itertools.chain([header], reader)
+            if target_column < 0:
+                raise ExchangeFormatError(f"'{os.path.split(location)[1]}' has no target column")
+            for row in reader:
+                if len(row) <= id_column or not row[id_column]:
+                    continue
+                yield TranslationUnit(
+                    row[id_column],
+                    row[source_column] if 0 <= source_column < len(row) else "",
+                    row[target_column] if target_column < len(row) else ""
+                )
+
+
+_formats = {
+    XLIFF12Format.name: XLIFF12Format,
+    XLIFF20Format.name: XLIFF20Format,
+    POFormat.name: POFormat,
+    CSVFormat.name: CSVFormat
+}
+_suffixes = {
+    ".xlf": XLIFF12Format,
+    ".xliff": XLIFF12Format,
+    ".po": POFormat,
+    ".pot": POFormat,
+    ".csv": CSVFormat
+}
+
+
+def getExchangeFormat(location: StrPath, name: Optional[str]=None) -> ExchangeFormat:
+    """Get the exchange format matching the name or, by default, the file extension of the location.
+    Both XLIFF versions are read by either XLIFF format.
+
+    Raises
+    ------
+    ExchangeFormatError
+        If no format matches.
+    """
+    format_type = _formats.get(name) if name else _suffixes.get(os.path.splitext(location)[1].lower())
+    if format_type is None:
+        raise ExchangeFormatError(f"Unsupported exchange format '{name or os.path.splitext(location)[1]}'")
+    return format_type()
+
+
+def exportUnits(location: StrPath, units: Iterable[TranslationUnit], source_lang_tag: str, target_lang_tag: str,
+                original: str="", format_name: Optional[str]=None) -> int:
+    """Write units to an exchange file one at a time.
+
+    Parameters
+    ----------
+    location : StrPath
+        Path-like object pointing to the exchange file.
+
+    source_lang_tag, target_lang_tag : str
+        The language tags of the text and the translations, e.g. 'schinese'.
+
+    original : str, optional
+        The name of the XML file the units are from.
+
+    format_name : str, optional
+        One of 'xliff-1.2', 'xliff-2.0', 'po' and 'csv'.
+        By default the format matching the file extension.
+
+    Returns
+    -------
+    int
+        The number of units written.
+    """
+    exchange_format = getExchangeFormat(location, format_name)
+    count = 0
+    with exchange_format.open(location, "w") as file:
+        exchange_format.writeHeader(file, language_codes.get(source_lang_tag, source_lang_tag),
+                                    language_codes.get(target_lang_tag, target_lang_tag), original)
+        for unit in units:
+            exchange_format.writeUnit(file, unit)
+            count += 1
+        exchange_format.writeFooter(file)
+    return count
+
+
+def exportEntries(location: StrPath, entries: Iterable[XMLEntry], source_lang_tag: str, target_lang_tag: str,
+                  translations: Optional[Mapping[str, str]]=None, original: str="", format_name: Optional[str]=None) -> int:
+    """Write entries, e.g. from XMLParser.iterEntries, to an exchange file one at a time.
+    The extracted text of each entry is exported, as when exporting from the entry table. Entries without text are skipped.
+
+    Parameters
+    ----------
+    translations : Mapping[str, str], optional
+        Translations keyed by entry id.
+        By default no entry is translated.
+    """
+    units = (TranslationUnit(entry.entry_id, entry.text, translations.get(entry.entry_id, "") if translations else "", entry.position)
+             for entry in entries if entry.text)
+    return exportUnits(location, units, source_lang_tag, target_lang_tag, original, format_name)
+
+
+def importUnits(location: StrPath, format_name: Optional[str]=None) -> Iterator[TranslationUnit]:
+    """Lazily read the units of an exchange file in document order.
+
+    Raises
+    ------
+    ExchangeFormatError
+        If the format is unsupported or the file is not valid in it.
+    """
+    return getExchangeFormat(location, format_name).iterUnits(location)
+
+
+def main(argv: Optional[list[str]]=None) -> None:
+    from module.config.app_config import AppConfig
+    from module.xml_tools.xml_parser import XMLParser
+
+    arg_parser = argparse.ArgumentParser(description="Stream the entries of an XML file to an XLIFF, PO or CSV file")
+    arg_parser.add_argument("xml", help="The XML file to export")
+    arg_parser.add_argument("output", help="The exchange file. Its format is chosen by the file extension")
+    arg_parser.add_argument("--lang", required=True, help="Language tag of the entries to export, e.g. schinese")
+    arg_parser.add_argument("--target", required=True, help="Language tag to translate into, e.g. english")
+    arg_parser.add_argument("--format", choices=list(_formats), help="Override the format chosen by the file extension")
+    args = arg_parser.parse_args(argv)
+
+    parser = XMLParser(AppConfig())
+    count = exportEntries(args.output, parser.iterEntries(args.xml, args.lang), args.lang, args.target,
+                          original=os.path.split(args.xml)[1], format_name=args.format)
+    print(f"Exported {count} {"entries" if count != 1 else "entry"} to '{args.output}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import os
+import shutil
+from typing import BinaryIO, Iterator, Sequence
+
+from module.tools.types.general import StrPath
+from module.xml_tools.cdata import CDATAStatus, locateCDATA
+from module.xml_tools.xml_source import SanitizedInput, XMLSource
+
+
+class XMLOutput():
+    def __init__(self, sanitized_xml: Sequence[str]) -> None:
+        """The output of a substitution.
+
+        The output is described as a plan of spans (offset, length) of the source buffer
+        and replacement payloads. Unchanged parts of the source are never copied until written.
+
+        Parameters
+        ----------
+        sanitized_xml : Sequence[str]
+            The sanitized input the output is created from.
+        """
+        if isinstance(sanitized_xml, SanitizedInput):
+            self._source = sanitized_xml.getSource() # type: XMLSource | None
+            self._source_buffer = self._source.getBuffer() # type: bytes | None
+            self._source_location = self._source.getLocation() # type: StrPath | None
+        else:
+            self._source = None
+            self._source_buffer = None
+            self._source_location = None
+        self._sanitized_xml = sanitized_xml
+        self._plan = [] # type: list[tuple[int, int] | str]
+        # Plan range and source byte range of each substituted language block. Used to patch the source file
+        self._blocks = [] # type: list[tuple[int, int, int, int]]
+        self._block_start = None # type: tuple[int, int] | None
+        self._is_patchable = self._source_buffer is not None
+        # Spans are never merged across this plan index
+        self._plan_barrier = 0
+        # Plan index of the CDATA payload (-1 if none) and output line index of each substituted entry by language
+        self._entry_fragments = {} # type: dict[str, list[tuple[int, int]]]
+        self._line_count = 0
+        # Lines which failed to translate. Used as an insertion-ordered set
+        self._failed_translations = {} # type: dict[str, None]
+
+    def beginBlock(self, index: int) -> None:
+        """ The substituted language block starts at this sanitized line """
+        self._plan_barrier = len(self._plan)
+        self._block_start = (len(self._plan), index)
+
+    def endBlock(self, index: int) -> None:
+        """ The substituted language block ends at this sanitized line """
+        self._plan_barrier = len(self._plan)
+        plan_start, start_index = self._block_start
+        self._block_start = None
+        if not self._is_patchable:
+            return
+        start_line, exit_line = self._sanitized_xml.sourceIndex(start_index), self._sanitized_xml.sourceIndex(index)
+        if start_line is None or exit_line is None:
+            self._is_patchable = False
+            return
+        source = self._sanitized_xml.getSource()
+        self._blocks.append((plan_start, len(self._plan), source.lineRange(start_line)[0], source.lineRange(exit_line)[1]))
+
+    def _appendSpan(self, offset: int, length: int) -> None:
+        """ Add a span of the source buffer to the output. Adjacent spans are merged """
+        if length <= 0:
+            return
+        if len(self._plan) > self._plan_barrier:
+            last = self._plan[-1]
+            if isinstance(last, tuple) and last[0] + last[1] == offset:
+                self._plan[-1] = (last[0], last[1] + length)
+                return
+        self._plan.append((offset, length))
+
+    def _appendPayload(self, payload: str) -> tuple[int, int]:
+        """ Add a replacement payload to the output as a separate item, allowing it to be replaced later """
+        self._plan.append(payload)
+        return len(self._plan) - 1, self._line_count
+
+    def _appendSourceRange(self, start: int, end: int) -> None:
+        """ Add the bytes [start:end] of the source buffer followed by a newline """
+        if self._source_buffer[end:end+1] == b"\n":
+            # Reuse the newline of the source
+            self._appendSpan(start, end + 1 - start)
+        else:
+            self._appendSpan(start, end - start)
+            self._plan.append("\n")
+
+    def appendLine(self, index: int) -> None:
+        """ Copy a sanitized line to the output """
+        span = self._sanitized_xml.sourceSpan(index) if self._source_buffer is not None else None
+        if span:
+            self._appendSourceRange(*span)
+        else:
+            self._plan.append(self._sanitized_xml[index] + "\n")
+        self._line_count += 1
+
+    def appendSubstitution(self, lang_tag: str, index: int, line: str, payload: str) -> None:
+        """Copy a sanitized line to the output with its CDATA replaced by the payload.
+
+        Parameters
+        ----------
+        lang_tag : str
+            The language of the substituted block.
+
+        index : int
+            Index of the line in the sanitized input.
+
+        line : str
+            The sanitized line.
+
+        payload : str
+            Replaces the CDATA of the line.
+        """
+        span = self._sanitized_xml.sourceSpan(index) if self._source_buffer is not None else None
+        location = locateCDATA(self._source_buffer, *span) if span else None
+        if location and location.status == CDATAStatus.WELLFORMED:
+            self._appendSpan(span[0], location.start - span[0])
+            fragment = self._appendPayload(payload)
+            self._appendSourceRange(location.end, span[1])
+        else:
+            location = locateCDATA(line)
+            if location.status == CDATAStatus.WELLFORMED:
+                self._plan.append(line[:location.start])
+                fragment = self._appendPayload(payload)
+                self._plan.append(f"{line[location.end:]}\n")
+            else:
+                fragment = (-1, self._line_count)
+                self._plan.append(line + "\n")
+        self._line_count += 1
+        self._entry_fragments.setdefault(lang_tag, []).append(fragment)
+
+    def appendMissingEntry(self, lang_tag: str) -> None:
+        """ An entry without a translation is left out of the output """
+        self._entry_fragments.setdefault(lang_tag, []).append((-1, -1))
+
+    def replacePayload(self, lang_tag: str, entry_index: int, line: str, payload: str) -> str | None:
+        """Replace the payload of a single entry.
+
+        Returns
+        -------
+        str | None
+            The updated output line of the entry. None if the entry has no output fragment.
+        """
+        fragments = self._entry_fragments.get(lang_tag, [])
+        if entry_index >= len(fragments):
+            return None
+        plan_index = fragments[entry_index][0]
+        location = locateCDATA(line)
+        if plan_index < 0 or location.status != CDATAStatus.WELLFORMED:
+            return None
+        self._plan[plan_index] = payload
+        return f"{line[:location.start]}{payload}{line[location.end:]}"
+
+    def hasFragment(self, lang_tag: str, entry_index: int) -> bool:
+        fragments = self._entry_fragments.get(lang_tag, [])
+        return entry_index < len(fragments) and fragments[entry_index][0] >= 0
+
+    def getEntryOutputLine(self, lang_tag: str, entry_index: int) -> int:
+        """ Line index of the entry in the output """
+        return self._entry_fragments[lang_tag][entry_index][1]
+
+    def addFailedTranslation(self, line: str) -> None:
+        self._failed_translations[line] = None
+
+    def removeFailedTranslation(self, line: str) -> None:
+        self._failed_translations.pop(line, None)
+
+    def getFailedTranslations(self) -> list[str]:
+        return list(self._failed_translations)
+
+    def isFailedTranslation(self, line: str) -> bool:
+        return line in self._failed_translations
+
+    def getFailedTranslationCount(self) -> int:
+        return len(self._failed_translations)
+
+    def _iterOutput(self, view: memoryview, start: int=0, end: int | None=None) -> Iterator[memoryview | bytes]:
+        for item in self._plan[start:end]:
+            if isinstance(item, tuple):
+                yield view[item[0]:item[0] + item[1]]
+            else:
+                yield item.encode("utf-8")
+
+    def write(self, dst_path: StrPath, patch: bool=False) -> None:
+        """Write the output to a file.
+        Unchanged parts of the source are copied directly from the source buffer.
+
+        Parameters
+        ----------
+        dst_path : StrPath
+            Path-like object pointing to the output file.
+
+        patch : bool, optional
+            Only replace the substituted language blocks of the source file. Everything else is
+            copied verbatim from the source file instead of its sanitized form.
+            Falls back to writing the full output if the source file can't be patched.
+            By default False.
+        """
+        if patch and self.canPatch():
+            self._writePatched(dst_path)
+        else:
+            with open(dst_path, "wb") as file:
+                with memoryview(self._source_buffer or b"") as view:
+                    file.writelines(self._iterOutput(view))
+
+    def canPatch(self) -> bool:
+        """ The source file is unchanged since it was parsed and every substituted block is located in it """
+        if not self._is_patchable or not self._blocks or self._block_start is not None:
+            return False
+        return not self._source.isModified()
+
+    def _writePatched(self, dst_path: StrPath) -> None:
+        """ Write the source file with each substituted language block replaced by its regenerated form """
+        with open(self._source_location, "rb") as src_file, open(dst_path, "wb") as dst_file:
+            position = 0
+            with memoryview(self._source_buffer) as view:
+                for plan_start, plan_end, block_start, block_end in self._blocks:
+                    _copyFileRange(src_file, dst_file, position, block_start - position)
+                    dst_file.writelines(self._iterOutput(view, plan_start, plan_end))
+                    dst_file.flush()
+                    position = block_end
+            _copyFileRange(src_file, dst_file, position, None)
+
+    def getPlan(self) -> list[tuple[int, int] | str]:
+        return self._plan
+
+    def getPreviewXML(self) -> list[str]:
+        """ The output as decoded chunks of text """
+        preview = [] # type: list[str]
+        for item in self._plan:
+            if isinstance(item, tuple):
+                preview.append(self._source_buffer[item[0]:item[0] + item[1]].decode("utf-8"))
+            else:
+                preview.append(item)
+        return preview
+
+    def getLanguageTags(self) -> list[str]:
+        """ The languages substituted in the output """
+        return list(self._entry_fragments)
+
+
+def _copyFileRange(src_file: BinaryIO, dst_file: BinaryIO, offset: int, count: int | None) -> None:
+    """Copy count bytes starting at offset from one file to the end of another.
+    If count is None, copy until the end of the source file.
+    Uses os.sendfile where available. Otherwise, the bytes are copied with shutil.
+    """
+    if count is None:
+        count = os.fstat(src_file.fileno()).st_size - offset
+    if count <= 0:
+        return
+    dst_file.flush()
+    if hasattr(os, "sendfile"):
+        try:
+            while count > 0:
+                sent = os.sendfile(dst_file.fileno(), src_file.fileno(), offset, count)
+                if sent == 0:
+                    break
+                offset += sent
+                count -= sent
+        except OSError:
+            # Not supported for these files. Copy the remaining bytes below
+            pass
+        # sendfile bypasses the file object. Move it to the end of the written data
+        dst_file.seek(0, os.SEEK_END)
+    if count > 0:
+        src_file.seek(offset)
+        shutil.copyfileobj(_LimitedReader(src_file, count), dst_file)
+
+
+class _LimitedReader():
+    """ Reads at most a fixed number of bytes from a file """
+
+    def __init__(self, file: BinaryIO, limit: int) -> None:
+        self._file = file
+        self._remaining = limit
+
+    def read(self, size: int=-1) -> bytes:
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
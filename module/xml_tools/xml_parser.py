@@ -1,95 +1,116 @@
+import multiprocessing
 import os
-import re
+import threading
 import traceback
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterator, Optional
 
 from app.common.signal_bus import signalBus
 
 from module.config.internal.app_args import AppArgs
+from module.exceptions import XMLBackendError
 from module.logger import logger
+from module.tools.metrics import metrics
 from module.tools.types.general import StrPath
 from module.tools.types.config import BaseConfig
+from module.tools.worker_process import initWorkerProcess, parseXMLChunk
 from module.tools.utilities import formatListForDisplay
-from module.xml_tools.regex_patterns import Pattern
+from module.xml_tools.cdata import CDATAStatus, locateCDATA, repairCDATA
+from module.xml_tools.color_codes import ColorCodedText
+from module.xml_tools.regex_patterns import BytesPattern, LanguageTag, Pattern, getLanguageTag
+from module.xml_tools.xml_backends import RegexBackend, getBackend
+from module.xml_tools.xml_chunks import ExtractionState, ParsedChunk, scanExtractionStates, splitIntoChunks
+from module.xml_tools.xml_entry import XMLEntry
+from module.xml_tools.xml_source import SanitizedInput, XMLSource
 
 
 class XMLParser():
     _logger = logger
+    # Files of at least this size are parsed in parallel, if enabled
+    parallel_min_size = 16 << 20
+    # Smallest part of a file parsed by a single process
+    parallel_chunk_size = 4 << 20
+    # Shared by all parsers. Started on first use
+    _executor = None # type: ProcessPoolExecutor | None
+    _executor_lock = threading.Lock() # Parsers of the XML server may run in several threads
 
     def __init__(self, config: BaseConfig) -> None:
         self._config = config
+        # The input file as raw bytes
+        self._source = None # type: XMLSource | None
         # The input file sanitized
-        self._sanitized_input = [] # type: list[str]
+        self._sanitized_input = [] # type: SanitizedInput | list[str]
         # Extracted part of the full line parsed
         self._extracted_text = []  # type: list[str]
         # Full line extracted
         self._parsed_lines = []    # type: list[str]
+        # Line number in the sanitized input of each full line extracted
+        self._parsed_line_numbers = [] # type: list[int]
         # Keep track of malformed CDATA entries
         self._malformed_entries = {} # type: dict[str, list[str]]
-        # Keep track of line positions of malformed CDATA entries in input
+        # Keep track of line positions of malformed CDATA entries and extracted entries in input
         self._input_line_positions = {} # type: dict[str, str]
-        # Used to extract color codes from CDATA entries
-        self._entry_color_codes = {} # type: dict[str, dict[str: list[str]]]
+        # Color codes of CDATA entries by line number
+        self._entry_color_codes = {} # type: dict[int, ColorCodedText]
+        # Chunks extracted while sanitizing in parallel. Merged when parsing
+        self._parsed_chunks = None # type: list[ParsedChunk] | None
 
-    def sanitizeXML(self, location: StrPath) -> list[str]:
-        self._sanitized_input.clear()
+    def sanitizeXML(self, location: StrPath, extract_lang_tag: Optional[str]=None) -> SanitizedInput:
+        """Read the input XML file and ensure each entry is a single, well-formed line.
+
+        Large files are split into chunks sanitized by multiple processes if the regex backend is used and parallel parsing is enabled.
+
+        Parameters
+        ----------
+        location : StrPath
+            Path-like object pointing to an XML file.
+
+        extract_lang_tag : str, optional
+            If the file is sanitized in parallel, also extract this language in the same pass.
+            The extracted text is merged when parsing.
+        """
+        self._sanitized_input = []
         self._extracted_text.clear()
         self._parsed_lines.clear()
+        self._parsed_line_numbers.clear()
         self._malformed_entries = {"fixed": [], "failed": []}
         self._input_line_positions.clear()
+        self._parsed_chunks = None
+        if self._source:
+            self._source.close()
+            self._source = None
 
         xml_file = os.path.split(location)[1]
         try:
-            raw_input = open(location, "r", encoding="utf-8").read().splitlines()
-            sanitized_list = [] # type: list[str]
-            multiple_line_entry = [] # type: list[str]
-            begin_entry_found = False
-            end_entry_found = False
-            begin_entry_line = 0
-
-            for i, line in enumerate(raw_input):
-                if line.strip() == "":
-                    continue
-
-                # Found entry start tag "<entry"
-                if re.search(Pattern.entry_start, line):
-                    begin_entry_found = True
-
-                # Found entry exit tag "</entry"
-                if re.search(Pattern.entry_exit, line):
-                    end_entry_found = True
-
-                # We're inside an entry tag
-                if begin_entry_found:
-                    if not begin_entry_line: begin_entry_line = i+1
-                    if end_entry_found:
-                        multiple_line_entry.append(line)
-                        # Construct the entire line (in case of multi-line entry)
-                        # Remove whitespaces on subsequent lines in multi-line entries
-                        completed_line = "".join([val if i == 0 else val.strip() for i, val in enumerate(multiple_line_entry)])
-
-                        # Record the line's position in the input XML
-                        self._input_line_positions |= {completed_line: f"{begin_entry_line}" if begin_entry_line == i+1 else f"{begin_entry_line}-{i+1}"}
-
-                        # Ensure line is well-formed and add to list
-                        sanitized_list.append(self._ensureWellformedLine(completed_line))
-
-                        # Cleanup
-                        multiple_line_entry.clear()
-                        begin_entry_found = False
-                        end_entry_found = False
-                        begin_entry_line = 0
-                    # This line does not have an exit entry tag on this line (this entry spans multiple lines!)
-                    else:
-                        multiple_line_entry.append(line)
-                # We're not inside an entry tag. Copy line as-is
-                elif not end_entry_found:
-                    sanitized_list.append(line)
+            self._source = XMLSource(location, memory_map=self._config.getValue("xmlMemoryMap"))
+            backend = getBackend(self._config.getValue("xmlBackend"))
+            with metrics.timer("xml.sanitize"):
+                sanitized_input = None
+                if isinstance(backend, RegexBackend) and self._config.getValue("xmlParallelParse"):
+                    sanitized_input = self._sanitizeInParallel(self._source, extract_lang_tag)
+                if sanitized_input is None:
+                    try:
+                        sanitized_input = self._sanitizeSource(self._source, backend.iterEntrySpans(self._source))
+                    except XMLBackendError as err:
+                        # The regex backend tolerates malformed XML
+                        self._logger.info(f"The {backend.name} backend could not parse '{xml_file}': {err}. "
+                                          + f"Falling back to the {RegexBackend.name} backend")
+                        metrics.count("xml.sanitize.backendFallbacks")
+                        self._malformed_entries = {"fixed": [], "failed": []}
+                        self._input_line_positions.clear()
+                        sanitized_input = self._sanitizeSource(self._source, RegexBackend().iterEntrySpans(self._source))
+            metrics.count("xml.sanitize.bytes", len(self._source.getBuffer()))
+            metrics.count("xml.sanitize.lines", len(self._source))
+            metrics.count("xml.sanitize.malformedFixed", len(self._malformed_entries["fixed"]))
+            metrics.count("xml.sanitize.malformedFailed", len(self._malformed_entries["failed"]))
 
             ### TESTING ###
             if self._config.getValue("debugXML"):
                 from pathlib import Path
                 with open(Path(AppArgs.app_dir, "SANIT.xml"), "w", encoding="utf-8") as file:
-                    file.writelines("\n".join(sanitized_list))
+                    file.writelines("\n".join(sanitized_input))
             ###############
 
             # Show any detected malformed entries
@@ -97,39 +118,184 @@ class XMLParser():
                 message_size = self._config.getValue("messageSize")
                 entry_grammar = "entries" if len(self._malformed_entries["fixed"]) != 1 else "entry"
                 msg = f"Fixed {len(self._malformed_entries["fixed"])} malformed {entry_grammar} in '{xml_file}'"
-                content = [f"Line {self._input_line_positions[val]}: {re.search(Pattern.entry_id, val)[1]}" for val in self._malformed_entries["fixed"]]
+                content = [f"Line {self._input_line_positions[val]}: {Pattern.entry_id.search(val)[1]}" for val in self._malformed_entries["fixed"]]
                 signalBus.xmlValidationError.emit("MALFIX_Sanitize", msg, formatListForDisplay(content, message_size))
                 self._logger.info(f"{msg}:\n  {formatListForDisplay(content, message_size, join_string="\n  ")}")
             elif self._malformed_entries["failed"]:
                 message_size = self._config.getValue("messageSize")
                 entry_grammar = "entries" if len(self._malformed_entries["failed"]) != 1 else "entry"
                 msg = f"Failed to fix {len(self._malformed_entries["failed"])} malformed {entry_grammar} in '{xml_file}'"
-                content = [f"Line {self._input_line_positions[val]}: {re.search(Pattern.entry_id, val)[1]}" for val in self._malformed_entries["failed"]]
+                content = [f"Line {self._input_line_positions[val]}: {Pattern.entry_id.search(val)[1]}" for val in self._malformed_entries["failed"]]
                 signalBus.xmlValidationError.emit("MAL_Sanitize", msg, formatListForDisplay(content, message_size))
                 self._logger.warning(f"{msg}:\n  {formatListForDisplay(content, message_size, join_string="\n  ")}")
 
-            self._sanitized_input = sanitized_list
-            return sanitized_list
+            self._sanitized_input = sanitized_input
+            return sanitized_input
         except Exception:
             trace = traceback.format_exc(limit=AppArgs.traceback_limit)
             msg = "An unexpected exception occurred while sanitizing XML"
             self._logger.error(msg + "\n" + trace)
             signalBus.xmlProcessException.emit("PE_Sanitize", msg, trace)
 
-    def _ensureWellformedLine(self, line: str) -> str:
-        if re.search(Pattern.cdata, line):
-            # Well-formed
-            return line
-
-        malformed_cdata = re.search(Pattern.malformed_cdata, line)
-        if malformed_cdata:
+    def _sanitizeSource(self, source: XMLSource, entry_spans: Iterator[tuple[int, int]],
+                        start: int=0, end: Optional[int]=None) -> SanitizedInput:
+        """ Build the sanitized input of lines [start, end) from the entries located by a backend """
+        sanitized_input = SanitizedInput(source)
+        entry_span = next(entry_spans, None)
+        end = len(source) if end is None else end
+        i = start
+        while i < end:
+            # We're inside an entry tag
+            if entry_span is not None and entry_span[0] == i:
+                begin_entry_line, end_entry_line = entry_span
+                completed_line = self._completeEntryLine(source, begin_entry_line, end_entry_line)
+
+                # Ensure line is well-formed and add to list
+                # Only entries changed by sanitization are decoded. All other lines are read from the source on demand
+                fixed_line = self._ensureWellformedLine(completed_line, begin_entry_line, end_entry_line)
+                if fixed_line is not None:
+                    sanitized_input.appendLine(fixed_line, begin_entry_line, end_entry_line)
+                elif begin_entry_line != end_entry_line:
+                    sanitized_input.appendLine(completed_line.decode("utf-8"), begin_entry_line, end_entry_line)
+                else:
+                    sanitized_input.appendSourceLine(i)
+
+                i = end_entry_line + 1
+                entry_span = next(entry_spans, None)
+                continue
+
+            # We're not inside an entry tag. Copy line as-is
+            if source.lineBytes(i).strip() != b"":
+                sanitized_input.appendSourceLine(i)
+            i += 1
+        return sanitized_input
+
+    @classmethod
+    def _getExecutor(cls) -> ProcessPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                # Spawn the workers on all platforms. Forking the multi-threaded app is unsafe
+                cls._executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"), initializer=initWorkerProcess)
+            return cls._executor
+
+    @classmethod
+    def _discardExecutor(cls, executor: ProcessPoolExecutor) -> None:
+        """ Replace a broken executor on next use, unless another thread already did """
+        with cls._executor_lock:
+            if cls._executor is executor:
+                cls._executor = None
+
+    def _sanitizeInParallel(self, source: XMLSource, extract_lang_tag: Optional[str]) -> SanitizedInput | None:
+        """Sanitize the source in chunks using a pool of processes. Each process memory-maps the file.
+
+        The chunks are merged in document order. Line numbers and reported positions are identical to sanitizing sequentially.
+
+        Returns
+        -------
+        SanitizedInput | None
+            None if the file is too small to benefit, or if the chunks could not be parsed independently.
+            The file must then be sanitized sequentially.
+        """
+        size = len(source.getBuffer())
+        workers = min(os.cpu_count() or 1, size // self.parallel_chunk_size)
+        if size < self.parallel_min_size or workers < 2 or source.isModified():
+            return None
+        chunks = splitIntoChunks(source, workers)
+        if len(chunks) < 2:
+            return None
+
+        if extract_lang_tag is not None:
+            states = scanExtractionStates(source, chunks, getLanguageTag(extract_lang_tag))
+        else:
+            states = [ExtractionState.DONE] * len(chunks)
+        line_starts = source.getLineStarts()
+        colorCodeOptions = self._getColorCodeOptions()
+        futures = [] # type: list[Future[ParsedChunk]]
+        try:
+            executor = self._getExecutor()
+            futures = [executor.submit(parseXMLChunk, source.getLocation(), len(line_starts), line_starts[start:end + 1],
+                                       start, end, extract_lang_tag, state, colorCodeOptions)
+                       for (start, end), state in zip(chunks, states)]
+            parsed_chunks = [future.result() for future in futures]
+        except BrokenProcessPool as err:
+            self._logger.warning(f"A process parsing '{os.path.split(source.getLocation())[1]}' stopped unexpectedly: {err}. Parsing sequentially")
+            self._discardExecutor(executor)
+            metrics.count("xml.sanitize.parallelFallbacks")
+            return None
+        except Exception:
+            # E.g. a worker could not map the file. The pool itself is still usable
+            for future in futures:
+                future.cancel()
+            self._logger.warning(f"Failed to parse '{os.path.split(source.getLocation())[1]}' in parallel. Parsing sequentially\n"
+                                 + traceback.format_exc(limit=AppArgs.traceback_limit))
+            metrics.count("xml.sanitize.parallelFallbacks")
+            return None
+
+        if any(parsed_chunk.ambiguous for parsed_chunk in parsed_chunks):
+            self._logger.info("A language tag is part of a multi-line or malformed entry. Parsing sequentially")
+            metrics.count("xml.sanitize.parallelFallbacks")
+            return None
+
+        sanitized_input = SanitizedInput(source)
+        for parsed_chunk in parsed_chunks:
+            sanitized_input.extendLines(parsed_chunk.lines, parsed_chunk.overrides, parsed_chunk.override_positions)
+            self._malformed_entries["fixed"].extend(parsed_chunk.malformed_fixed)
+            self._malformed_entries["failed"].extend(parsed_chunk.malformed_failed)
+            self._input_line_positions |= parsed_chunk.sanitize_positions
+        metrics.count("xml.sanitize.parallelChunks", len(parsed_chunks))
+        if extract_lang_tag is not None:
+            self._parsed_chunks = parsed_chunks
+        return sanitized_input
+
+    def _mergeParsedChunks(self, parsed_chunks: list[ParsedChunk]) -> None:
+        """ Merge the entries extracted from each chunk in document order """
+        offset = 0
+        for parsed_chunk in parsed_chunks:
+            self._input_line_positions |= parsed_chunk.parse_positions
+            self._extracted_text.extend(parsed_chunk.extracted_text)
+            self._parsed_lines.extend(parsed_chunk.parsed_lines)
+            self._parsed_line_numbers.extend(line_number + offset for line_number in parsed_chunk.parsed_line_numbers)
+            self._entry_color_codes |= {line_number + offset: color_coded_text
+                                        for line_number, color_coded_text in parsed_chunk.entry_color_codes.items()}
+            offset += len(parsed_chunk.lines)
+
+    def _completeEntryLine(self, source: XMLSource, begin_line: int, end_line: int) -> bytes:
+        if begin_line == end_line:
+            return source.lineBytes(begin_line)
+        # Construct the entire line (in case of multi-line entry)
+        # Remove whitespaces on subsequent lines in multi-line entries
+        return b"".join([source.lineBytes(j) if j == begin_line else source.lineBytes(j).strip()
+                         for j in range(begin_line, end_line + 1)])
+
+    def _ensureWellformedLine(self, line: bytes, begin_line: int, end_line: int) -> str | None:
+        """Check the CDATA of an entry line and repair it if malformed.
+
+        Returns
+        -------
+        str | None
+            The repaired line. None if the line is left unchanged.
+        """
+        if locateCDATA(line).status == CDATAStatus.WELLFORMED:
+            return None
+
+        with metrics.timer("xml.sanitize.repair"):
+            return self._repairLine(line, begin_line, end_line)
+
+    def _repairLine(self, line: bytes, begin_line: int, end_line: int) -> str | None:
+        position = f"{begin_line + 1}" if begin_line == end_line else f"{begin_line + 1}-{end_line + 1}"
+        decoded_line = line.decode("utf-8")
+        self._input_line_positions |= {decoded_line: position}
+        location = locateCDATA(decoded_line)
+        if location.status == CDATAStatus.FIXABLE:
             # MALFORMED!
-            self._malformed_entries["fixed"].append(line)
-            return re.sub(Pattern.cdata_fix, f"><![CDATA[{malformed_cdata[1]}]]", line)
+            fixed_line = repairCDATA(decoded_line, location)
+            self._malformed_entries["fixed"].append(decoded_line)
+            self._input_line_positions |= {fixed_line: position}
+            return fixed_line
 
         # FAILED TO FIX MALFORMED LINE!
-        self._malformed_entries["failed"].append(line)
-        return line
+        self._malformed_entries["failed"].append(decoded_line)
+        return None
 
     def _extract(self, line: str, line_number: int, colorCodeOptions: tuple) -> None:
         """
@@ -138,35 +304,76 @@ class XMLParser():
         Args:
             line (str): The current line of the file.
         """
-        match_obj = re.search(Pattern.cdata, line)
-        if match_obj:
-            text = match_obj[1]
-
-            # Enable color code exclusion
-            if colorCodeOptions[0]:
-                entry_id = self.formatEntryID(line, line_number)
-
-                # Split text and color code tags
-                matches = [val for val in re.finditer(Pattern.color_codes, text)]
-                for match in matches:
-                    start_color = match.group("start_color")
-                    text_ = match.group("text")
-                    end_color = match.group("end_color")
-
-                    # Only add text longer than this. Except if only 1 tag exists, then add regardless.
-                    # Smaller sized delimitors (or the values themselves) get lost in translation (literally)
-                    if len(matches) == 1 or len(text_) >= colorCodeOptions[1]:
-                        if entry_id not in self._entry_color_codes:
-                            self._entry_color_codes |= {entry_id: {"start_color": [], "text": [], "end_color": []}}
-                        self._entry_color_codes[entry_id]["start_color"].append(start_color)
-                        self._entry_color_codes[entry_id]["text"].append(text_)
-                        self._entry_color_codes[entry_id]["end_color"].append(end_color)
-
-                if entry_id in self._entry_color_codes and self._entry_color_codes[entry_id]["text"]:
-                    text = f" {colorCodeOptions[2] * colorCodeOptions[3]} ".join(self._entry_color_codes[entry_id]["text"])
+        location = locateCDATA(line)
+        if location.status == CDATAStatus.WELLFORMED:
+            text, color_coded_text = self._extractText(line[location.payload_start:location.payload_end], colorCodeOptions)
+            if color_coded_text is not None:
+                self._entry_color_codes[line_number] = color_coded_text
             self._parsed_lines.append(line)
+            self._parsed_line_numbers.append(line_number)
             self._extracted_text.append(text)
 
+    def _extractText(self, cdata: str, colorCodeOptions: tuple) -> tuple[str, ColorCodedText | None]:
+        """ The text to translate from the CDATA text of an entry, and its color codes if they are excluded """
+        # Enable color code exclusion
+        if colorCodeOptions[0]:
+            # Split text and color code tags. Short text is kept with the color codes
+            # as smaller sized delimitors (or the values themselves) get lost in translation (literally)
+            color_coded_text = ColorCodedText.fromText(cdata, colorCodeOptions[1])
+            if color_coded_text is not None:
+                return color_coded_text.extract(colorCodeOptions[2] * colorCodeOptions[3]), color_coded_text
+        return cdata, None
+
+    def getColorCodeDelimiter(self) -> str:
+        """ The delimiter separating the translatable segments of color coded text """
+        colorCodeOptions = self._getColorCodeOptions()
+        return colorCodeOptions[2] * colorCodeOptions[3]
+
+    def _getColorCodeOptions(self) -> tuple:
+        return (
+            self._config.getValue("colorCodeSep"),
+            self._config.getValue("colorCodeSepLength"),
+            self._config.getValue("colorCodeDelim"),
+            self._config.getValue("colorCodeDelimSize")
+        )
+
+    def _extractLanguage(self, sanitized_input: SanitizedInput, lang_tag: LanguageTag, colorCodeOptions: tuple,
+                         state: int=ExtractionState.OUTSIDE) -> None:
+        """Extract the entries of the language block matching the language tag.
+
+        Parameters
+        ----------
+        state : int, optional
+            The ExtractionState at the first line.
+            By default outside the language block.
+        """
+        if state == ExtractionState.DONE:
+            return
+        is_extracting = state == ExtractionState.EXTRACTING
+        # Scan the raw lines and only decode the lines inside the extracted language
+        for i, raw_line in enumerate(sanitized_input.iterLineBytes()):
+            if raw_line.strip() == b"":
+                continue
+
+            if is_extracting:
+                # Found language exit tag "</language". Thus, language extraction is complete
+                if BytesPattern.language_exit.search(raw_line):
+                    break
+                else:
+                    line = sanitized_input[i]
+                    self._input_line_positions |= {line: sanitized_input.inputPosition(i)}
+                    self._extract(
+                        line=line,
+                        line_number=i + 1,
+                        colorCodeOptions=colorCodeOptions
+                    )
+
+            # Found language start tag "<language id="
+            if BytesPattern.language_start.search(raw_line):
+                # The language start tag is the one we're looking for
+                if lang_tag.matchesBytes(raw_line):
+                    is_extracting = True
+
     def parse(self, location: StrPath, extract_lang_tag: str) -> None:
         """
         NOTE: The file must be specified in the config!
@@ -175,46 +382,170 @@ class XMLParser():
         Each extracted text line is written to the specified output txt file.
         """
         self._entry_color_codes = {}
-        sanitized_input = self.sanitizeXML(location)
-        colorCodeOptions = (
-            self._config.getValue("colorCodeSep"),
-            self._config.getValue("colorCodeSepLength"),
-            self._config.getValue("colorCodeDelim"),
-            self._config.getValue("colorCodeDelimSize")
-        )
+        sanitized_input = self.sanitizeXML(location, extract_lang_tag)
+        colorCodeOptions = self._getColorCodeOptions()
         try:
-            is_extracting = False
-            for i, line in enumerate(sanitized_input):
-                if line.strip() == "":
-                    continue
-
-                if is_extracting:
-                    # Found language exit tag "</language". Thus, language extraction is complete
-                    if re.search(Pattern.language_exit, line):
-                        break
-                    else:
-                        self._extract(
-                            line=line,
-                            line_number=i + 1,
-                            colorCodeOptions=colorCodeOptions
-                        )
-
-                # Found language start tag "<language id="
-                if re.search(Pattern.language_start, line):
-                    # The language start tag is the one we're looking for
-                    if re.search((f"({extract_lang_tag})(?=\">)"), line):
-                        is_extracting = True
+            with metrics.timer("xml.parse"):
+                if self._parsed_chunks is not None:
+                    with metrics.timer("xml.parse.mergeChunks"):
+                        self._mergeParsedChunks(self._parsed_chunks)
+                    self._parsed_chunks = None
+                else:
+                    # Entries are timed as a whole. A timer per entry would cost about as much as extracting it
+                    with metrics.timer("xml.parse.extract"):
+                        self._extractLanguage(sanitized_input, getLanguageTag(extract_lang_tag), colorCodeOptions)
+            metrics.count("xml.parse.entries", len(self._extracted_text))
+            metrics.count("xml.parse.colorCodeEntries", len(self._entry_color_codes))
+            metrics.publish()
         except Exception:
             trace = traceback.format_exc(limit=AppArgs.traceback_limit)
             msg = "An unexpected exception occurred while parsing XML"
             self._logger.error(msg + "\n" + trace)
             signalBus.xmlProcessException.emit("PE_Parsing", msg, trace)
 
+    def reparse(self, location: StrPath, extract_lang_tag: str) -> bool:
+        """Parse the file again if its content has changed since the last parse.
+
+        Returns
+        -------
+        bool
+            The file was parsed again.
+        """
+        if (self._source is not None and os.path.abspath(self._source.getLocation()) == os.path.abspath(location)
+                and os.path.getsize(location) == len(self._source.getBuffer())):
+            # Only hash the file if its size is unchanged. It is read in chunks
+            if XMLSource.hashFile(location) == self._source.contentHash():
+                # Only the modification time changed, e.g. the file was saved without changes
+                self._source.updateModificationTime()
+                return False
+        self.parse(location, extract_lang_tag)
+        return True
+
+    def iterEntries(self, location: StrPath, lang_tag: Optional[str]=None, id_prefix: str="") -> Iterator[XMLEntry]:
+        """Lazily yield the entries of an XML file in document order.
+
+        Entries are sanitized and extracted one at a time as they are requested, so the file can be
+        streamed through or iteration stopped early. The state of the parser is not changed.
+        Entries which cannot be repaired are skipped, as in parse.
+        The text of each entry is extracted as in parse, i.e. with color codes excluded if enabled.
+        The CDATA text is yielded alongside it.
+
+        Parameters
+        ----------
+        location : StrPath
+            Path-like object pointing to an XML file.
+
+        lang_tag : str, optional
+            Only yield the entries of this language. Iteration stops at the end of its language block.
+            By default all entries.
+
+        id_prefix : str, optional
+            Only yield entries whose id starts with this prefix.
+            By default all entries.
+
+        Yields
+        ------
+        XMLEntry
+            The entries matching the filters.
+        """
+        source = XMLSource(location, memory_map=self._config.getValue("xmlMemoryMap"))
+        try:
+            backend = getBackend(self._config.getValue("xmlBackend"))
+            entry_spans = backend.iterEntrySpans(source)
+            language_filter = getLanguageTag(lang_tag) if lang_tag is not None else None
+            colorCodeOptions = self._getColorCodeOptions()
+            language = ""
+            is_extracting = language_filter is None
+            # The sanitized input is not built. Count its lines to number the entries
+            line_number = 0
+            i = 0
+            while i < len(source):
+                try:
+                    entry_span = next(entry_spans, None)
+                except XMLBackendError as err:
+                    # Entries before the error have been yielded. The regex backend tolerates malformed XML
+                    self._logger.info(f"The {backend.name} backend could not parse '{os.path.split(location)[1]}': {err}. "
+                                      + f"Falling back to the {RegexBackend.name} backend")
+                    entry_spans = RegexBackend().iterEntrySpans(source, i)
+                    entry_span = next(entry_spans, None)
+
+                # Lines outside entries are only checked for language tags
+                begin_entry_line, end_entry_line = entry_span if entry_span is not None else (len(source), len(source))
+                while i < begin_entry_line:
+                    raw_line = source.lineBytes(i)
+                    if raw_line.strip() != b"":
+                        line_number += 1
+                        if BytesPattern.language_exit.search(raw_line):
+                            if language_filter is not None and is_extracting:
+                                return
+                            language = ""
+                        if BytesPattern.language_start.search(raw_line):
+                            if language_filter is not None:
+                                is_extracting = language_filter.matchesBytes(raw_line)
+                            language_id = Pattern.language_id.search(raw_line.decode("utf-8"))
+                            language = language_id[1] if language_id else ""
+                    i += 1
+                if entry_span is None:
+                    break
+
+                line_number += 1
+                i = end_entry_line + 1
+                if not is_extracting:
+                    continue
+                completed_line = self._completeEntryLine(source, begin_entry_line, end_entry_line)
+                # Only decode entries which might match
+                if id_prefix and id_prefix.encode() not in completed_line:
+                    continue
+
+                line = completed_line.decode("utf-8")
+                entry_id = Pattern.entry_id.search(line)
+                if entry_id is None or not entry_id[1].startswith(id_prefix):
+                    continue
+                cdata_location = locateCDATA(line)
+                if cdata_location.status == CDATAStatus.FIXABLE:
+                    line = repairCDATA(line, cdata_location)
+                    cdata_location = locateCDATA(line)
+                if cdata_location.status != CDATAStatus.WELLFORMED:
+                    continue
+                position = f"{begin_entry_line + 1}" if begin_entry_line == end_entry_line else f"{begin_entry_line + 1}-{end_entry_line + 1}"
+                cdata = line[cdata_location.payload_start:cdata_location.payload_end]
+                yield XMLEntry(
+                    entry_id=entry_id[1],
+                    language=language,
+                    text=self._extractText(cdata, colorCodeOptions)[0],
+                    cdata=cdata,
+                    line=line,
+                    line_number=line_number,
+                    position=position
+                )
+        finally:
+            source.close()
+
     def formatEntryID(self, line: str, identifier: int | str) -> str:
         prep = f"{identifier}_" if identifier != "" else ""
-        return f"{prep}{re.search(Pattern.entry_id, line)[1]}"
-
-    def getSanitizedInput(self) -> list[str]:
+        return f"{prep}{Pattern.entry_id.search(line)[1]}"
+
+    def restoreParse(self, sanitized_input: SanitizedInput, extracted_text: list[str], parsed_line_numbers: list[int],
+                     entry_color_codes: dict[int, ColorCodedText], malformed_entries: dict[str, list[str]],
+                     input_line_positions: dict[str, str]) -> None:
+        """ Restore the result of a previous parse of the source of the sanitized input, e.g. from a project snapshot """
+        if self._source and self._source is not sanitized_input.getSource():
+            self._source.close()
+        self._source = sanitized_input.getSource()
+        self._sanitized_input = sanitized_input
+        self._parsed_chunks = None
+        self._extracted_text = list(extracted_text)
+        self._parsed_line_numbers = list(parsed_line_numbers)
+        self._parsed_lines = [sanitized_input[line_number - 1] for line_number in parsed_line_numbers]
+        self._entry_color_codes = dict(entry_color_codes)
+        self._malformed_entries = {"fixed": list(malformed_entries["fixed"]), "failed": list(malformed_entries["failed"])}
+        self._input_line_positions = dict(input_line_positions)
+
+    def getSource(self) -> XMLSource | None:
+        """ The source of the latest parse """
+        return self._source
+
+    def getSanitizedInput(self) -> SanitizedInput | list[str]:
         return self._sanitized_input
 
     def getExtractedText(self) -> list[str]:
@@ -223,8 +554,59 @@ class XMLParser():
     def getParsedLines(self) -> list[str]:
         return self._parsed_lines
 
+    def getParsedLineNumbers(self) -> list[int]:
+        return self._parsed_line_numbers
+
+    def getMalformedEntries(self) -> dict[str, list[str]]:
+        """ Malformed entries of the latest parse which were fixed or failed to be fixed """
+        return self._malformed_entries
+
     def getInputLinePositions(self) -> dict[str, str]:
         return self._input_line_positions
 
-    def getEntryColorCodes(self) -> dict[str, dict[str: list[str]]]:
-        return self._entry_color_codes
\ No newline at end of file
+    def getEntryColorCodes(self) -> dict[int, ColorCodedText]:
+        """ Color coded text of the extracted entries by line number """
+        return self._entry_color_codes
+
+
+def parseChunk(location: StrPath, line_count: int, line_window: array, start: int, end: int,
+                extract_lang_tag: Optional[str], state: int, colorCodeOptions: tuple) -> ParsedChunk:
+    """Sanitize and parse lines [start, end) of an XML file. Runs in a worker process.
+
+    Parameters
+    ----------
+    line_window : array
+        Byte offset of the first character of each line from start up to and including end.
+    """
+    # Only the offsets of the lines in the chunk are known. The line indices of the whole file are kept
+    source = XMLSource.fromLineIndex(location, line_window, line_base=start, line_count=line_count)
+    try:
+        parser = XMLParser(None)
+        parser._malformed_entries = {"fixed": [], "failed": []}
+        sanitized_input = parser._sanitizeSource(source, RegexBackend().iterEntrySpans(source, start, end), start, end)
+        sanitize_positions, parser._input_line_positions = parser._input_line_positions, {}
+        lines, overrides, override_positions = sanitized_input.exportLines()
+
+        ambiguous = False
+        if state != ExtractionState.DONE:
+            # The extraction state of the next chunks was found without sanitizing. It is wrong if a sanitized entry contains a language tag
+            ambiguous = any(Pattern.language_start.search(line) or Pattern.language_exit.search(line) for line in overrides)
+            if not ambiguous:
+                parser._extractLanguage(sanitized_input, getLanguageTag(extract_lang_tag), colorCodeOptions, state)
+
+        return ParsedChunk(
+            lines=lines,
+            overrides=overrides,
+            override_positions=override_positions,
+            malformed_fixed=parser._malformed_entries["fixed"],
+            malformed_failed=parser._malformed_entries["failed"],
+            sanitize_positions=sanitize_positions,
+            parse_positions=parser._input_line_positions,
+            extracted_text=parser._extracted_text,
+            parsed_lines=parser._parsed_lines,
+            parsed_line_numbers=parser._parsed_line_numbers,
+            entry_color_codes=parser._entry_color_codes,
+            ambiguous=ambiguous
+        )
+    finally:
+        source.close()
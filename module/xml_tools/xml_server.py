@@ -0,0 +1,376 @@
+from PyQt6.QtCore import Qt
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import traceback
+from typing import Any, Callable, Optional
+
+from app.common.signal_bus import signalBus
+
+from module.config.app_config import AppConfig
+from module.config.internal.app_args import AppArgs
+from module.exceptions import RPCError
+from module.logger import logger
+from module.tools.metrics import metrics
+from module.tools.types.config import BaseConfig
+from module.tools.types.general import StrPath
+from module.xml_tools.regex_patterns import Pattern
+from module.xml_tools.xml_parser import XMLParser
+from module.xml_tools.xml_substituter import XMLSubstituter
+from module.xml_tools.xml_validator import XMLValidator
+
+
+class _ParsedFile():
+    """ The engine of an XML file parsed for a language. Requests for the file are serialized by its lock """
+
+    def __init__(self, config: BaseConfig, location: str, extract_lang_tag: str) -> None:
+        self.location = location
+        self.extract_lang_tag = extract_lang_tag
+        self.lock = threading.Lock()
+        self.parser = XMLParser(config)
+        self.substituter = XMLSubstituter(config, parser=self.parser)
+        self.validator = XMLValidator(config, parser=self.parser, substituter=self.substituter)
+        self.entries = [] # type: list[dict[str, Any]]
+        self.entry_indices = {} # type: dict[str, int]
+        # The write language tag and translations of the latest substitution
+        self.write_lang_tag = None # type: str | None
+        self.localized_text = None # type: list[str] | None
+        # The result of validating the latest substitution
+        self.validation = None # type: dict[str, Any] | None
+
+    def update(self) -> bool:
+        """Parse the file if it has never been parsed or has been modified since.
+
+        Returns
+        -------
+        bool
+            The file was parsed.
+        """
+        source = self.parser.getSource()
+        if source is not None and not source.isModified():
+            return False
+        if not self.parser.reparse(self.location, self.extract_lang_tag) and self.entries:
+            return False
+
+        self.entries.clear()
+        self.entry_indices.clear()
+        for i, (line, text, line_number) in enumerate(zip(self.parser.getParsedLines(), self.parser.getExtractedText(),
+                                                          self.parser.getParsedLineNumbers())):
+            entry_id = Pattern.entry_id.search(line)[1]
+            self.entries.append({"id": entry_id, "text": text, "line_number": line_number})
+            self.entry_indices.setdefault(entry_id, i)
+        self.write_lang_tag = None
+        self.localized_text = None
+        self.validation = None
+        return True
+
+
+class XMLServer():
+    """Keeps parsed XML files in memory and serves extract, substitute and validate requests.
+
+    Clients connect to a local socket and send JSON-RPC 2.0 requests, one per line.
+    Each response is written as a single line. Connections are handled concurrently.
+    Parsed files are kept until they are modified on disk, which is detected by their modification time.
+    """
+    _logger = logger
+
+    def __init__(self, config: Optional[BaseConfig]=None) -> None:
+        """
+        Parameters
+        ----------
+        config : BaseConfig, optional
+            The settings of the XML engine.
+            By default the app config.
+        """
+        self._config = config or AppConfig()
+        self._files = {} # type: dict[tuple[str, str], _ParsedFile]
+        self._files_lock = threading.Lock()
+        self._server = None # type: socketserver.BaseServer | None
+        # Errors reported by the XML engine while handling the request of each thread
+        self._reports = threading.local()
+        self._methods = {
+            "ping": self._ping,
+            "extract": self._extract,
+            "substitute": self._substitute,
+            "validate": self._validate,
+            "close": self._close
+        } # type: dict[str, Callable[[dict[str, Any]], Any]]
+
+        # The engine reports errors through the signal bus. Requests run outside the Qt event loop
+        signalBus.xmlProcessException.connect(self._onProcessException, Qt.ConnectionType.DirectConnection)
+        signalBus.xmlValidationError.connect(self._onValidationError, Qt.ConnectionType.DirectConnection)
+        signalBus.xmlPreviewInvalid.connect(self._onPreviewInvalid, Qt.ConnectionType.DirectConnection)
+
+    def _onProcessException(self, error_type: str, msg: str, trace: str) -> None:
+        if hasattr(self._reports, "errors"):
+            self._reports.errors.append({"type": error_type, "message": msg, "traceback": trace})
+
+    def _onValidationError(self, error_type: str, title: str, content: str) -> None:
+        if hasattr(self._reports, "warnings"):
+            self._reports.warnings.append({"type": error_type, "message": title, "content": content})
+
+    def _onPreviewInvalid(self, isValid: bool, showErrors: bool) -> None:
+        if hasattr(self._reports, "errors"):
+            self._reports.valid = isValid
+
+    def _getFile(self, params: dict[str, Any], lang_key: str="lang_tag") -> _ParsedFile:
+        location = os.path.abspath(self._getParam(params, "path", str))
+        extract_lang_tag = self._getParam(params, lang_key, str)
+        if not os.path.isfile(location):
+            raise RPCError(-32602, f"No such file: '{location}'")
+        key = (location, extract_lang_tag)
+        with self._files_lock:
+            if key not in self._files:
+                self._files[key] = _ParsedFile(self._config, location, extract_lang_tag)
+            return self._files[key]
+
+    def _getParam(self, params: dict[str, Any], name: str, param_type: type | tuple[type, ...], default: Any=...) -> Any:
+        value = params.get(name, default)
+        if value is ...:
+            raise RPCError(-32602, f"Missing parameter '{name}'")
+        if value is not default and not isinstance(value, param_type):
+            type_names = " or ".join(t.__name__ for t in (param_type if isinstance(param_type, tuple) else (param_type,)))
+            raise RPCError(-32602, f"Parameter '{name}' must be of type {type_names}")
+        return value
+
+    def _raiseProcessErrors(self) -> None:
+        if self._reports.errors:
+            error = self._reports.errors[0]
+            raise RPCError(-32000, f"{error["type"]}: {error["message"]}")
+
+    def _ping(self, params: dict[str, Any]) -> dict[str, Any]:
+        with self._files_lock:
+            files = [{"path": location, "lang_tag": lang_tag, "entries": len(parsed_file.entries)}
+                     for (location, lang_tag), parsed_file in self._files.items()]
+        return {"pid": os.getpid(), "files": files}
+
+    def _extract(self, params: dict[str, Any]) -> dict[str, Any]:
+        """ The entries of a language. Optionally only the entries whose id starts with id_prefix """
+        parsed_file = self._getFile(params)
+        id_prefix = self._getParam(params, "id_prefix", str, default="")
+        with parsed_file.lock:
+            parsed = parsed_file.update()
+            self._raiseProcessErrors()
+            entries = parsed_file.entries
+            if id_prefix:
+                entries = [entry for entry in entries if entry["id"].startswith(id_prefix)]
+            return {"parsed": parsed, "entries": entries, "warnings": list(self._reports.warnings)}
+
+    def _substitute(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Substitute translations into the write language and optionally save the output.
+
+        The translations are either a list in the order of the extracted entries or a mapping of entry id to text.
+        Untranslated entries keep their source text.
+        """
+        parsed_file = self._getFile(params, lang_key="extract_lang_tag")
+        write_lang_tag = self._getParam(params, "write_lang_tag", str)
+        translations = self._getParam(params, "translations", (list, dict))
+        output = self._getParam(params, "output", str, default=None)
+        with parsed_file.lock:
+            parsed = parsed_file.update()
+            self._raiseProcessErrors()
+            if isinstance(translations, dict):
+                localized_text = [entry["text"] for entry in parsed_file.entries]
+                for entry_id, text in translations.items():
+                    if entry_id in parsed_file.entry_indices:
+                        localized_text[parsed_file.entry_indices[entry_id]] = text
+            elif len(translations) > len(parsed_file.entries):
+                raise RPCError(-32602, f"Too many translations. Expected at most {len(parsed_file.entries)}")
+            else:
+                localized_text = translations + [entry["text"] for entry in parsed_file.entries[len(translations):]]
+            if not all(isinstance(text, str) for text in localized_text):
+                raise RPCError(-32602, "Translations must be strings")
+
+            parser, substituter = parsed_file.parser, parsed_file.substituter
+            # Repeated substitutions of the same translations reuse the latest output
+            if write_lang_tag != parsed_file.write_lang_tag or localized_text != parsed_file.localized_text:
+                substituter.substitute(
+                    write_lang_tag=write_lang_tag,
+                    parsed_xml_lines=parser.getParsedLines(),
+                    extracted_text=parser.getExtractedText(),
+                    sanitized_xml=parser.getSanitizedInput(),
+                    localized_text=localized_text
+                )
+                self._raiseProcessErrors()
+                parsed_file.write_lang_tag = write_lang_tag
+                parsed_file.localized_text = list(localized_text)
+                parsed_file.validation = None
+            if output is not None:
+                substituter.writeOutput(output, patch=self._config.getValue("xmlPatchOutput"))
+            return {"parsed": parsed, "failed": substituter.getFailedTranslationCount(), "output": output}
+
+    def _validate(self, params: dict[str, Any]) -> dict[str, Any]:
+        """ Validate the output of the latest substitution of the file. The result is kept until the next substitution """
+        parsed_file = self._getFile(params, lang_key="extract_lang_tag")
+        with parsed_file.lock:
+            if parsed_file.update() or parsed_file.write_lang_tag is None:
+                raise RPCError(-32602, "The file has not been substituted since it was parsed")
+            if parsed_file.validation is None:
+                preview = "".join(parsed_file.substituter.getPreviewXML()).splitlines()
+                parsed_file.validator.validatePreview(preview, parsed_file.extract_lang_tag, parsed_file.write_lang_tag)
+                self._raiseProcessErrors()
+                parsed_file.validation = {"valid": self._reports.valid, "warnings": list(self._reports.warnings)}
+            return parsed_file.validation
+
+    def _close(self, params: dict[str, Any]) -> dict[str, Any]:
+        """ Forget a parsed file. All languages of the file are forgotten if no language is given """
+        location = os.path.abspath(self._getParam(params, "path", str))
+        lang_tag = self._getParam(params, "lang_tag", str, default=None)
+        with self._files_lock:
+            keys = [key for key in self._files if key[0] == location and lang_tag in (None, key[1])]
+            for key in keys:
+                del self._files[key]
+        return {"closed": len(keys)}
+
+    def handleRequest(self, request: Any) -> dict[str, Any] | None:
+        """Handle a single JSON-RPC request.
+
+        Returns
+        -------
+        dict[str, Any] | None
+            The response. None if the request is a notification.
+        """
+        request_id = request.get("id") if isinstance(request, dict) else None
+        self._reports.errors = []
+        self._reports.warnings = []
+        self._reports.valid = False
+        try:
+            if not isinstance(request, dict) or request.get("jsonrpc") != "2.0" or not isinstance(request.get("method"), str):
+                raise RPCError(-32600, "Invalid request")
+            method = self._methods.get(request["method"])
+            if method is None:
+                raise RPCError(-32601, f"Unknown method '{request["method"]}'")
+            params = request.get("params", {})
+            if not isinstance(params, dict):
+                raise RPCError(-32602, "Parameters must be named")
+            with metrics.timer(f"server.{request["method"]}"):
+                result = method(params)
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except RPCError as err:
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": err.code, "message": f"{err}"}}
+        except Exception as err:
+            trace = traceback.format_exc(limit=AppArgs.traceback_limit)
+            self._logger.error(f"An unexpected exception occurred while handling a request\n{trace}")
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32603, "message": f"{err}"}}
+        finally:
+            del self._reports.errors
+            del self._reports.warnings
+            del self._reports.valid
+        return response if request_id is not None or "error" in response else None
+
+    def handleLine(self, line: bytes) -> bytes | None:
+        """ Handle a line containing a JSON-RPC request or batch of requests """
+        try:
+            request = json.loads(line)
+        except (ValueError, UnicodeDecodeError):
+            response = {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}}
+        else:
+            if isinstance(request, list) and request:
+                response = [result for result in map(self.handleRequest, request) if result is not None] or None
+            else:
+                response = self.handleRequest(request)
+        if response is None:
+            return None
+        return json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n"
+
+    def serve(self, host: str="127.0.0.1", port: int=0, unix_socket: Optional[StrPath]=None,
+              ready: Optional[Callable[[str], None]]=None) -> None:
+        """Serve requests until shutdown is called.
+
+        Parameters
+        ----------
+        host, port : str, int, optional
+            The local address to listen on. Port 0 selects a free port.
+            By default a free port on 127.0.0.1.
+
+        unix_socket : StrPath, optional
+            Listen on a Unix socket at this path instead.
+            A stale socket at the path is replaced. Anything else at the path raises FileExistsError.
+
+        ready : Callable[[str], None], optional
+            Called with the address once the server is listening.
+        """
+        xml_server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    response = xml_server.handleLine(line)
+                    if response is not None:
+                        self.wfile.write(response)
+                        self.wfile.flush()
+
+        if unix_socket is not None:
+            self._removeStaleSocket(unix_socket)
+            server = socketserver.ThreadingUnixStreamServer(os.fspath(unix_socket), Handler)
+            address = os.fspath(unix_socket)
+        else:
+            server = socketserver.ThreadingTCPServer((host, port), Handler)
+            address = "{}:{}".format(*server.server_address[:2])
+        server.daemon_threads = True
+        self._server = server
+        self._logger.info(f"XML server listening on {address}")
+        if ready is not None:
+            ready(address)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if unix_socket is not None and self._isSocket(unix_socket):
+                os.remove(unix_socket)
+
+    def _isSocket(self, path: StrPath) -> bool:
+        try:
+            # Symbolic links are not followed
+            return stat.S_ISSOCK(os.lstat(path).st_mode)
+        except FileNotFoundError:
+            return False
+
+    def _removeStaleSocket(self, path: StrPath) -> None:
+        """ Remove a socket left behind by a server which is no longer running """
+        if not os.path.lexists(path):
+            return
+        if not self._isSocket(path):
+            err_msg = f"Cannot listen on '{os.fspath(path)}': the path exists and is not a socket"
+            raise FileExistsError(err_msg)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(os.fspath(path))
+            except OSError:
+                # Nothing is listening
+                os.remove(path)
+                return
+        err_msg = f"Cannot listen on '{os.fspath(path)}': another server is listening on it"
+        raise FileExistsError(err_msg)
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+
+def main(argv: Optional[list[str]]=None) -> None:
+    arg_parser = argparse.ArgumentParser(description="Keep parsed XML files in memory and serve JSON-RPC requests on a local socket")
+    arg_parser.add_argument("--port", type=int, default=8765, help="Port on 127.0.0.1 to listen on")
+    if hasattr(socket, "AF_UNIX"):
+        arg_parser.add_argument("--unix-socket", help="Listen on a Unix socket at this path instead")
+    args = arg_parser.parse_args(argv)
+
+    xml_server = XMLServer()
+    try:
+        xml_server.serve(port=args.port, unix_socket=getattr(args, "unix_socket", None))
+    except FileExistsError as err:
+        arg_parser.error(f"{err}")
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+import json
+import os
+import pathlib
+import sqlite3
+from array import array
+from contextlib import closing
+from typing import Any, Optional, Self
+
+from module.tools.types.config import BaseConfig
+from module.tools.types.general import StrPath
+from module.xml_tools.color_codes import ColorCodedText
+from module.xml_tools.xml_parser import XMLParser
+from module.xml_tools.xml_source import SanitizedInput, XMLSource
+
+
+class XMLSnapshot():
+    """A project file storing the parse of an XML file alongside its translations.
+
+    The snapshot is an SQLite database holding the line index and sanitized lines of the source,
+    the extracted entries with their color codes, translations and validation state, and the hash of the source.
+    Reopening a project restores the parse directly if the source is unchanged.
+    """
+    suffix = ".ddlh"
+    version = 1
+    # Settings which change the result of a parse
+    parse_settings = ["xmlBackend", "colorCodeSep", "colorCodeSepLength", "colorCodeDelim", "colorCodeDelimSize"]
+
+    def __init__(self, location: StrPath, meta: dict[str, Any], translations: dict[str, str], failed_lines: list[str]) -> None:
+        self._location = location
+        self._meta = meta
+        self._translations = translations
+        self._failed_lines = failed_lines
+
+    @classmethod
+    def _connect(cls, location: StrPath) -> sqlite3.Connection:
+        return sqlite3.connect(location, isolation_level=None, uri=str(location).startswith("file:"))
+
+    @classmethod
+    def write(cls, location: StrPath, parser: XMLParser, config: BaseConfig, extract_lang_tag: str, write_lang_tag: str,
+              translations: list[str], failed_rows: set[int], preview_valid: bool) -> None:
+        """Write a snapshot of the latest parse.
+
+        Parameters
+        ----------
+        location : StrPath
+            Path-like object pointing to the project file. Replaced if it exists.
+
+        translations : list[str]
+            The translation of each extracted entry, in the order of the parse. Empty if untranslated.
+
+        failed_rows : set[int]
+            The extracted entries which failed to translate.
+
+        preview_valid : bool
+            The latest preview passed validation.
+
+        Raises
+        ------
+        ValueError
+            If no XML file is parsed, or if the number of translations differs from the number of extracted entries.
+        """
+        sanitized_input = parser.getSanitizedInput()
+        if not isinstance(sanitized_input, SanitizedInput):
+            raise ValueError("Only a parsed XML file can be saved as a project")
+        if len(translations) != len(parser.getParsedLines()):
+            raise ValueError(f"Expected {len(parser.getParsedLines())} translations, one for each extracted entry. Got {len(translations)}")
+        source = sanitized_input.getSource()
+        lines, overrides, override_positions = sanitized_input.exportLines()
+        malformed_entries = parser.getMalformedEntries()
+        meta = {
+            "version": cls.version,
+            "source": os.path.abspath(source.getLocation()),
+            "source_hash": source.contentHash().hex(),
+            "source_size": len(source.getBuffer()),
+            "extract_lang_tag": extract_lang_tag,
+            "write_lang_tag": write_lang_tag,
+            "preview_valid": preview_valid,
+            "parse_settings": {key: config.getValue(key) for key in cls.parse_settings}
+        }
+
+        tmp_location = f"{location}.tmp"
+        if os.path.exists(tmp_location):
+            os.remove(tmp_location)
+        with closing(cls._connect(tmp_location)) as connection:
+            connection.executescript("""
+                BEGIN;
+                CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE arrays (name TEXT PRIMARY KEY, data BLOB);
+                CREATE TABLE overrides (idx INTEGER PRIMARY KEY, line TEXT, begin_line INTEGER, end_line INTEGER);
+                CREATE TABLE malformed (kind TEXT, line TEXT);
+                CREATE TABLE positions (line TEXT, position TEXT);
+                CREATE TABLE entries (row INTEGER PRIMARY KEY, line_number INTEGER, line TEXT, text TEXT, translation TEXT, failed INTEGER);
+                CREATE TABLE color_codes (line_number INTEGER PRIMARY KEY, text TEXT, segments BLOB);
+            """)
+            connection.executemany("INSERT INTO meta VALUES (?, ?)", ((key, json.dumps(value)) for key, value in meta.items()))
+            connection.executemany("INSERT INTO arrays VALUES (?, ?)", (
+                ("line_starts", source.getLineStarts().tobytes()),
+                ("lines", lines.tobytes())
+            ))
+            connection.executemany("INSERT INTO overrides VALUES (?, ?, ?, ?)",
+                                   ((i, line, *position) for i, (line, position) in enumerate(zip(overrides, override_positions))))
+            connection.executemany("INSERT INTO malformed VALUES (?, ?)",
+                                   ((kind, line) for kind in ("fixed", "failed") for line in malformed_entries[kind]))
+            connection.executemany("INSERT INTO positions VALUES (?, ?)", parser.getInputLinePositions().items())
+            connection.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)", (
+                (row, line_number, line, text, translation, row in failed_rows)
+                for row, (line_number, line, text, translation)
+                in enumerate(zip(parser.getParsedLineNumbers(), parser.getParsedLines(), parser.getExtractedText(), translations))
+            ))
+            connection.executemany("INSERT INTO color_codes VALUES (?, ?, ?)",
+                                   ((line_number, color_coded_text.text, color_coded_text.segments.tobytes())
+                                    for line_number, color_coded_text in parser.getEntryColorCodes().items()))
+            connection.execute("COMMIT")
+        os.replace(tmp_location, location)
+
+    @classmethod
+    def read(cls, location: StrPath) -> Self:
+        """Read the settings and translations of a project. The parse is only read when restored.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a project file of a supported version.
+        """
+        translations = {} # type: dict[str, str]
+        failed_lines = [] # type: list[str]
+        try:
+            with closing(cls._connect(cls._readOnlyURI(location))) as connection:
+                meta = {key: json.loads(value) for key, value in connection.execute("SELECT key, value FROM meta")}
+                if meta.get("version") != cls.version:
+                    raise ValueError(f"Unsupported project version '{meta.get("version")}'")
+                for line, translation, failed in connection.execute("SELECT line, translation, failed FROM entries ORDER BY row"):
+                    if translation:
+                        translations[line] = translation
+                    if failed:
+                        failed_lines.append(line)
+        except sqlite3.DatabaseError as err:
+            raise ValueError(f"'{os.path.split(location)[1]}' is not a project file: {err}") from err
+        return cls(location, meta, translations, failed_lines)
+
+    @classmethod
+    def _readOnlyURI(cls, location: StrPath) -> str:
+        return f"{pathlib.Path(location).resolve().as_uri()}?mode=ro"
+
+    def getLocation(self) -> StrPath:
+        return self._location
+
+    def getSourceLocation(self) -> str:
+        return self._meta["source"]
+
+    def getExtractLangTag(self) -> str:
+        return self._meta["extract_lang_tag"]
+
+    def getWriteLangTag(self) -> str:
+        return self._meta["write_lang_tag"]
+
+    def isPreviewValid(self) -> bool:
+        return self._meta["preview_valid"]
+
+    def getTranslations(self) -> dict[str, str]:
+        """ The translations of the project keyed by the parsed line of their entry """
+        return self._translations
+
+    def getFailedLines(self) -> list[str]:
+        """ The parsed lines of the entries which failed to translate """
+        return self._failed_lines
+
+    def restore(self, parser: XMLParser, config: BaseConfig) -> bool:
+        """Restore the parse of the project into the parser.
+
+        Returns
+        -------
+        bool
+            The parse was restored. False if the source file or the parse settings have changed since the project was saved.
+            The source file must then be parsed again.
+        """
+        if any(config.getValue(key) != value for key, value in self._meta["parse_settings"].items()):
+            return False
+        if not os.path.isfile(self._meta["source"]) or os.path.getsize(self._meta["source"]) != self._meta["source_size"]:
+            return False
+
+        with closing(self._connect(self._readOnlyURI(self._location))) as connection:
+            line_starts = array("Q")
+            line_starts.frombytes(connection.execute("SELECT data FROM arrays WHERE name = 'line_starts'").fetchone()[0])
+            source = XMLSource(self._meta["source"], memory_map=config.getValue("xmlMemoryMap"), line_starts=line_starts)
+            if source.contentHash().hex() != self._meta["source_hash"]:
+                source.close()
+                return False
+
+            lines = array("q")
+            lines.frombytes(connection.execute("SELECT data FROM arrays WHERE name = 'lines'").fetchone()[0])
+            overrides, override_positions = [], [] # type: list[str], list[tuple[int, int]]
+            for line, begin_line, end_line in connection.execute("SELECT line, begin_line, end_line FROM overrides ORDER BY idx"):
+                overrides.append(line)
+                override_positions.append((begin_line, end_line))
+            sanitized_input = SanitizedInput(source)
+            sanitized_input.extendLines(lines, overrides, override_positions)
+
+            extracted_text, line_numbers = [], [] # type: list[str], list[int]
+            for line_number, text in connection.execute("SELECT line_number, text FROM entries ORDER BY row"):
+                line_numbers.append(line_number)
+                extracted_text.append(text)
+            entry_color_codes = {} # type: dict[int, ColorCodedText]
+            for line_number, text, segments in connection.execute("SELECT line_number, text, segments FROM color_codes"):
+                segment_array = array("l")
+                segment_array.frombytes(segments)
+                entry_color_codes[line_number] = ColorCodedText(text, segment_array)
+            malformed_entries = {"fixed": [], "failed": []} # type: dict[str, list[str]]
+            for kind, line in connection.execute("SELECT kind, line FROM malformed ORDER BY rowid"):
+                malformed_entries[kind].append(line)
+            input_line_positions = dict(connection.execute("SELECT line, position FROM positions ORDER BY rowid").fetchall())
+
+        parser.restoreParse(sanitized_input, extracted_text, line_numbers, entry_color_codes, malformed_entries, input_line_positions)
+        return True
+
+    @classmethod
+    def isSnapshot(cls, location: Optional[StrPath]) -> bool:
+        return bool(location) and os.path.splitext(location)[1].lower() == cls.suffix
@@ -0,0 +1,285 @@
+import hashlib
+import mmap
+import os
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import Iterator, Optional, Self
+
+from module.tools.types.general import StrPath
+
+
+class XMLSource():
+    def __init__(self, location: StrPath, memory_map: bool=False, line_starts: Optional[array]=None) -> None:
+        """Byte-level view of an XML file.
+
+        The file is held as a single buffer (either read into memory or memory-mapped)
+        alongside an index of line offsets. Lines are only decoded when requested.
+
+        Parameters
+        ----------
+        location : StrPath
+            Path-like object pointing to an XML file.
+
+        memory_map : bool, optional
+            Memory-map the file instead of reading it into memory.
+            Note: on some platforms the file cannot be modified while it is mapped.
+            By default False.
+
+        line_starts : array, optional
+            The line index of the file, e.g. from a project snapshot. The file is not indexed again.
+            By default the file is indexed.
+        """
+        self._location = location
+        self._is_mapped = False
+        self._mtime_ns = os.stat(location).st_mtime_ns
+        self._buffer = self._openBuffer(location, memory_map) # type: mmap.mmap | bytes
+        # Identifies the content of the file when it was opened. Used to detect changes made by other programs.
+        # Computed on first use, as hashing reads the whole buffer
+        self._content_hash = None # type: bytes | None
+        # Byte offset of the first character of each line, starting at line _line_base
+        self._line_base = 0
+        if line_starts is not None:
+            self._line_starts = line_starts
+        else:
+            self._line_starts = array("Q")
+            self._indexLines()
+        self._line_count = len(self._line_starts)
+
+    @classmethod
+    def fromLineIndex(cls, location: StrPath, line_starts: array, line_base: int=0, line_count: Optional[int]=None) -> Self:
+        """Memory-map an XML file using the line index of another XMLSource of the same file.
+
+        Used by worker processes parsing part of the file. The file is neither hashed nor indexed again.
+
+        Parameters
+        ----------
+        location : StrPath
+            Path-like object pointing to an XML file.
+
+        line_starts : array
+            Byte offset of the first character of each line, starting at line line_base.
+            Only these lines can be accessed. Line indices are still those of the whole file.
+
+        line_base : int, optional
+            Index of the line of the first offset in line_starts.
+            By default 0.
+
+        line_count : int, optional
+            The number of lines in the file.
+            By default line_base plus the number of offsets in line_starts.
+        """
+        source = cls.__new__(cls)
+        source._location = location
+        source._is_mapped = False
+        source._mtime_ns = os.stat(location).st_mtime_ns
+        source._buffer = source._openBuffer(location, memory_map=True)
+        source._content_hash = None
+        source._line_starts = line_starts
+        source._line_base = line_base
+        source._line_count = line_base + len(line_starts) if line_count is None else line_count
+        return source
+
+    def _openBuffer(self, location: StrPath, memory_map: bool) -> mmap.mmap | bytes:
+        with open(location, "rb") as file:
+            if memory_map:
+                try:
+                    buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._is_mapped = True
+                    return buffer
+                except ValueError:
+                    # Empty files cannot be mapped
+                    pass
+            return file.read()
+
+    def _indexLines(self) -> None:
+        size = len(self._buffer)
+        pos = 0
+        while pos < size:
+            self._line_starts.append(pos)
+            end = self._buffer.find(b"\n", pos)
+            if end == -1:
+                break
+            pos = end + 1
+
+    def __len__(self) -> int:
+        return self._line_count
+
+    def _windowIndex(self, index: int) -> int:
+        """ Position of the line in the index of line offsets """
+        i = index - self._line_base
+        if i < 0:
+            raise IndexError(f"Line {index} is not indexed. The index starts at line {self._line_base}")
+        return i
+
+    def lineSpan(self, index: int) -> tuple[int, int]:
+        """Byte range of a line in the buffer, excluding the line terminator"""
+        i = self._windowIndex(index)
+        start = self._line_starts[i]
+        if index + 1 < self._line_count:
+            end = self._line_starts[i + 1] - 1
+        else:
+            end = len(self._buffer)
+            if end > start and self._buffer[end - 1] == 0x0A:
+                end -= 1
+        if end > start and self._buffer[end - 1] == 0x0D:
+            end -= 1
+        return start, end
+
+    def lineRange(self, index: int) -> tuple[int, int]:
+        """Byte range of a line in the buffer, including the line terminator"""
+        i = self._windowIndex(index)
+        end = self._line_starts[i + 1] if index + 1 < self._line_count else len(self._buffer)
+        return self._line_starts[i], end
+
+    def lineIndexAt(self, offset: int) -> int:
+        """ Index of the line containing the byte offset """
+        return bisect_right(self._line_starts, offset) - 1 + self._line_base
+
+    def lineBytes(self, index: int) -> bytes:
+        start, end = self.lineSpan(index)
+        return self._buffer[start:end]
+
+    def line(self, index: int) -> str:
+        return self.lineBytes(index).decode("utf-8")
+
+    def iterLineBytes(self, start: int=0, end: Optional[int]=None) -> Iterator[bytes]:
+        """ The lines from index start up to, but excluding, index end. By default all lines """
+        for i in range(start, self._line_count if end is None else end):
+            yield self.lineBytes(i)
+
+    def getLineStarts(self) -> array:
+        """ The offsets of the indexed lines. All lines, unless the source was created from part of a line index """
+        return self._line_starts
+
+    def getBuffer(self) -> mmap.mmap | bytes:
+        return self._buffer
+
+    def getLocation(self) -> StrPath:
+        return self._location
+
+    @classmethod
+    def _newHash(cls) -> "hashlib._Hash":
+        return hashlib.blake2b(digest_size=16)
+
+    @classmethod
+    def hashFile(cls, location: StrPath) -> bytes:
+        """ Hash the content of a file in chunks. Comparable to contentHash """
+        with open(location, "rb") as file:
+            return hashlib.file_digest(file, cls._newHash).digest()
+
+    def contentHash(self) -> bytes:
+        """Hash of the content of the file when it was opened. Computed on first use.
+
+        Note: a memory-mapped file modified in place no longer holds the content it was opened with.
+        Such a change is only detected if the size of the file changed (see isModified).
+        """
+        if self._content_hash is None:
+            content_hash = self._newHash()
+            content_hash.update(self._buffer)
+            self._content_hash = content_hash.digest()
+        return self._content_hash
+
+    def isModified(self) -> bool:
+        """ The file has been modified since it was read """
+        try:
+            stat = os.stat(self._location)
+        except OSError:
+            return True
+        return stat.st_mtime_ns != self._mtime_ns or stat.st_size != len(self._buffer)
+
+    def updateModificationTime(self) -> None:
+        """ The file was written without changing its content. Keep using it as the source """
+        self._mtime_ns = os.stat(self._location).st_mtime_ns
+
+    def isMapped(self) -> bool:
+        return self._is_mapped
+
+    def close(self) -> None:
+        if self._is_mapped and not self._buffer.closed:
+            self._buffer.close()
+
+
+class SanitizedInput(Sequence):
+    def __init__(self, source: XMLSource) -> None:
+        """Sequence of sanitized lines backed by an XMLSource.
+
+        Lines copied verbatim from the source are stored as line indices into the source
+        and decoded on access. Only lines changed by sanitization are stored as strings.
+        """
+        self._source = source
+        # A value >= 0 is a line index in the source.
+        # A negative value -(n + 1) is index n in the overrides
+        self._lines = array("q")
+        self._overrides = [] # type: list[str]
+        # Line positions in the source of overridden lines
+        self._override_positions = [] # type: list[tuple[int, int]]
+
+    def appendSourceLine(self, index: int) -> None:
+        self._lines.append(index)
+
+    def appendLine(self, line: str, begin_index: int, end_index: int) -> None:
+        self._overrides.append(line)
+        self._override_positions.append((begin_index, end_index))
+        self._lines.append(-len(self._overrides))
+
+    def exportLines(self) -> tuple[array, list[str], list[tuple[int, int]]]:
+        """ The line references, overridden lines and their positions in the source. Used to pass lines between processes """
+        return self._lines, self._overrides, self._override_positions
+
+    def extendLines(self, lines: array, overrides: list[str], override_positions: list[tuple[int, int]]) -> None:
+        """ Append lines exported from another SanitizedInput of the same source """
+        offset = len(self._overrides)
+        if offset:
+            lines = array("q", (value if value >= 0 else value - offset for value in lines))
+        self._lines.extend(lines)
+        self._overrides.extend(overrides)
+        self._override_positions.extend(override_positions)
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __getitem__(self, index: int) -> str:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        value = self._lines[index]
+        if value >= 0:
+            return self._source.line(value)
+        return self._overrides[-value - 1]
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self._lines)):
+            yield self[i]
+
+    def lineBytes(self, index: int) -> bytes:
+        value = self._lines[index]
+        if value >= 0:
+            return self._source.lineBytes(value)
+        return self._overrides[-value - 1].encode("utf-8")
+
+    def iterLineBytes(self) -> Iterator[bytes]:
+        for i in range(len(self._lines)):
+            yield self.lineBytes(i)
+
+    def sourceSpan(self, index: int) -> Optional[tuple[int, int]]:
+        """Byte range in the source buffer of a line copied verbatim. Otherwise, None"""
+        value = self._lines[index]
+        if value >= 0:
+            return self._source.lineSpan(value)
+        return None
+
+    def sourceIndex(self, index: int) -> Optional[int]:
+        """Index in the source of a line copied verbatim. Otherwise, None"""
+        value = self._lines[index]
+        return value if value >= 0 else None
+
+    def inputPosition(self, index: int) -> str:
+        """The line number(s) in the source file of a sanitized line, e.g. '12' or '12-14'"""
+        value = self._lines[index]
+        if value >= 0:
+            return f"{value + 1}"
+        begin, end = self._override_positions[-value - 1]
+        return f"{begin + 1}" if begin == end else f"{begin + 1}-{end + 1}"
+
+    def getSource(self) -> XMLSource:
+        return self._source
@@ -1,13 +1,17 @@
-import re
 import traceback
+from typing import Sequence
 
 from app.common.signal_bus import signalBus
 
 from module.config.internal.app_args import AppArgs
 from module.logger import logger
+from module.tools.metrics import metrics
 from module.tools.types.config import BaseConfig
+from module.tools.types.general import StrPath
 from module.xml_tools import XMLParser
-from module.xml_tools.regex_patterns import Pattern
+from module.xml_tools.regex_patterns import BytesPattern, getLanguageTag
+from module.xml_tools.xml_output import XMLOutput
+from module.xml_tools.xml_source import SanitizedInput
 
 
 class XMLSubstituter():
@@ -16,96 +20,282 @@ class XMLSubstituter():
     def __init__(self, config: BaseConfig, parser: XMLParser) -> None:
         self._config = config
         self._parser = parser
-        self._preview_XML = [] # type: list[str]
-        self._failed_translations = [] # type: list[str]
+        # The output of the latest substitution
+        self._output = XMLOutput([])
+        self._write_lang_tag = ""
+        self._parsed_xml_lines = [] # type: list[str]
+        self._parsed_line_numbers = [] # type: list[int]
         self._processColorCodes = True
         self._colorCodeDelim = ""
         self._colorCodeDelimSize = 0
 
     def substitute(self, write_lang_tag: str, parsed_xml_lines: list[str],
-                   extracted_text: list[str], sanitized_xml: list[str],
+                   extracted_text: list[str], sanitized_xml: Sequence[str],
                    localized_text: list[str]):
         """
         Substitutes data from the translated input file.
         Uses regex to insert input text between "[ and "]]" e.g. [text goes here]].
         The replacement scope is defined by XML language tags.
         """
-        self._preview_XML.clear()
-        self._failed_translations.clear()
+        self._write_lang_tag = write_lang_tag
+        outputs = self._substitute({write_lang_tag: localized_text}, parsed_xml_lines,
+                                   extracted_text, sanitized_xml, separate=False)
+        self._output = outputs[0] if outputs else XMLOutput([])
+
+    def substituteLanguages(self, localized_texts: dict[str, list[str]], parsed_xml_lines: list[str],
+                            extracted_text: list[str], sanitized_xml: Sequence[str]) -> XMLOutput | None:
+        """Substitute several languages into a single output in one pass over the sanitized input.
+
+        Parameters
+        ----------
+        localized_texts : dict[str, list[str]]
+            The translations of each language, keyed by language tag.
+
+        Returns
+        -------
+        XMLOutput | None
+            The output containing every substituted language. None if the substitution failed.
+        """
+        outputs = self._substitute(localized_texts, parsed_xml_lines, extracted_text, sanitized_xml, separate=False)
+        return outputs[0] if outputs else None
+
+    def substituteLanguagesSeparately(self, localized_texts: dict[str, list[str]], parsed_xml_lines: list[str],
+                                      extracted_text: list[str], sanitized_xml: Sequence[str]) -> dict[str, XMLOutput]:
+        """Substitute several languages into an output per language in one pass over the sanitized input.
+
+        Parameters
+        ----------
+        localized_texts : dict[str, list[str]]
+            The translations of each language, keyed by language tag.
+
+        Returns
+        -------
+        dict[str, XMLOutput]
+            The output of each language, keyed by language tag. Empty if the substitution failed.
+        """
+        outputs = self._substitute(localized_texts, parsed_xml_lines, extracted_text, sanitized_xml, separate=True)
+        return dict(zip(localized_texts, outputs))
+
+    def _substitute(self, localized_texts: dict[str, list[str]], parsed_xml_lines: list[str],
+                    extracted_text: list[str], sanitized_xml: Sequence[str], separate: bool) -> list[XMLOutput]:
+        """Substitute languages into one output or an output per language.
+        The sanitized input is only traversed once, regardless of the number of outputs.
+        """
         self._processColorCodes = self._config.getValue("colorCodeSep")
         self._colorCodeDelim = self._config.getValue("colorCodeDelim")
         self._colorCodeDelimSize = self._config.getValue("colorCodeDelimSize")
+        if isinstance(sanitized_xml, SanitizedInput):
+            raw_lines = sanitized_xml.iterLineBytes()
+        else:
+            raw_lines = (line.encode("utf-8") for line in sanitized_xml)
+
+        parsed_line_numbers = self._parser.getParsedLineNumbers()
+        if len(parsed_line_numbers) != len(parsed_xml_lines):
+            parsed_line_numbers = [sanitized_xml.index(parsed_line) + 1 for parsed_line in parsed_xml_lines]
+        self._parsed_xml_lines = parsed_xml_lines
+        self._parsed_line_numbers = parsed_line_numbers
+
+        # Each output substitutes a set of languages
+        if separate:
+            outputs = [(XMLOutput(sanitized_xml), {lang_tag}) for lang_tag in localized_texts]
+        else:
+            outputs = [(XMLOutput(sanitized_xml), set(localized_texts))]
         try:
-            is_substituting = False
-            is_skipping = False
-
-            for line in sanitized_xml:
-                # Found language start tag "<language id="
-                if re.search(Pattern.language_start, line):
-                    # The language start tag is the one we're looking for
-                    if re.search(f"({write_lang_tag})(?=\">)", line):
-                        is_substituting = True
-                        self._preview_XML.append(line + "\n") # Add language start tag (the language write tag)
-
-                # Finished substituting. Start skipping lines that where overwritten by substituted text
-                if is_skipping:
-                    # Found language exit tag "</language"
-                    if re.search(Pattern.language_exit, line):
-                        is_skipping = False
-                        self._preview_XML.append(line + "\n")
-                    continue
-
-                # We're inside the language write tag
-                if is_substituting:
-                    # Create all entries with translated text
-                    for j, parsed_line in enumerate(parsed_xml_lines):
-                        try:
-                            # Handle case where the source text is empty
-                            localization = localized_text[0] if extracted_text[j] else ""
-                            # Insert translation into the source line
-                            line_number = sanitized_xml.index(parsed_line) + 1
-                            self._preview_XML.append(re.sub(Pattern.cdata, f"[CDATA[{self._preprocessLine(parsed_line, line_number, localization)}]]", parsed_line) + "\n")
-                            # Only pop if the translation was used
-                            if localization: localized_text.pop(0)
-                        except IndexError:
-                            # This should only occur for localized_text but both are present just in case
-                            content = f"{"Extracted XML tags" if localized_text else "Localized text"} ran out of lines at {j}/{len(parsed_xml_lines)}"
-                            self._logger.critical(content)
-                            signalBus.xmlProcessException.emit("PE_OuttaLines", "Critical error", content)
-                    is_substituting = False
-                    is_skipping = True
-                # We're not inside the language write tag. Copy line as-is
-                else:
-                    self._preview_XML.append(line + "\n")
+            with metrics.timer("xml.substitute"):
+                is_skipping = [False] * len(outputs)
+                lang_tags = [getLanguageTag(lang_tag) for lang_tag in localized_texts]
+                # The payloads of each language are created once and shared by all outputs
+                payloads = {} # type: dict[str, tuple[list[str | None], list[str]]]
+
+                for i, raw_line in enumerate(raw_lines):
+                    # Found language start tag "<language id="
+                    block_lang_tag = None
+                    if BytesPattern.language_start.search(raw_line):
+                        block_lang_tag = next((lang_tag.tag for lang_tag in lang_tags if lang_tag.matchesBytes(raw_line)), None)
+                    is_exit = any(is_skipping) and BytesPattern.language_exit.search(raw_line)
+
+                    for k, (output, output_lang_tags) in enumerate(outputs):
+                        # Finished substituting. Skip lines that where overwritten by substituted text
+                        if is_skipping[k]:
+                            # Found language exit tag "</language"
+                            if is_exit:
+                                is_skipping[k] = False
+                                output.appendLine(i)
+                                output.endBlock(i)
+                            continue
+
+                        # The language start tag is one we're looking for. Create all entries with translated text
+                        if block_lang_tag in output_lang_tags:
+                            if block_lang_tag not in payloads:
+                                payloads[block_lang_tag] = self._createPayloads(parsed_xml_lines, extracted_text,
+                                                                                localized_texts[block_lang_tag])
+                            entry_payloads, failed_lines = payloads[block_lang_tag]
+                            output.beginBlock(i)
+                            output.appendLine(i) # Add language start tag (the language write tag)
+                            for j, parsed_line in enumerate(parsed_xml_lines):
+                                if entry_payloads[j] is None:
+                                    output.appendMissingEntry(block_lang_tag)
+                                else:
+                                    output.appendSubstitution(block_lang_tag, parsed_line_numbers[j] - 1,
+                                                              parsed_line, entry_payloads[j])
+                            for line in failed_lines:
+                                output.addFailedTranslation(line)
+                            is_skipping[k] = True
+                        # We're not inside a language write tag. Copy line as-is
+                        else:
+                            output.appendLine(i)
+            metrics.count("xml.substitute.entries", len(parsed_xml_lines) * len(payloads))
+            metrics.count("xml.substitute.outputs", len(outputs))
+            metrics.publish()
+            return [output for output, _ in outputs]
         except Exception:
             trace = traceback.format_exc(limit=AppArgs.traceback_limit)
             content = "An unexpected exception occurred while translating XML"
             self._logger.error(content + "\n" + trace)
             signalBus.xmlProcessException.emit("PE_Translation", content, trace)
+            return []
 
-    def _preprocessLine(self, line: str, line_number: int, localization: str) -> str:
-        repl = localization
-        if self._processColorCodes:
-            entry_id = self._parser.formatEntryID(line, line_number)
-            entry_color_codes = self._parser.getEntryColorCodes()
+    def _createPayloads(self, parsed_xml_lines: list[str], extracted_text: list[str],
+                        localized_text: list[str]) -> tuple[list[str | None], list[str]]:
+        """Create the payload of each entry of a language.
+
+        Returns
+        -------
+        tuple[list[str | None], list[str]]
+            The payload of each entry (None if the translations ran out) and the lines which failed to translate.
+        """
+        entry_payloads = [] # type: list[str | None]
+        failed_lines = [] # type: list[str]
+        used_translations = 0
+        for j, parsed_line in enumerate(parsed_xml_lines):
+            try:
+                # Handle case where the source text is empty
+                localization = localized_text[used_translations] if extracted_text[j] else ""
+                repl, failed = self._applyColorCodes(parsed_line, self._parsed_line_numbers[j], localization)
+                entry_payloads.append(f"[CDATA[{repl}]]")
+                if failed:
+                    failed_lines.append(parsed_line)
+                # Only advance if the translation was used
+                if localization: used_translations += 1
+            except IndexError:
+                entry_payloads.append(None)
+                # This should only occur for localized_text but both are present just in case
+                content = f"{"Extracted XML tags" if used_translations < len(localized_text) else "Localized text"} ran out of lines at {j}/{len(parsed_xml_lines)}"
+                self._logger.critical(content)
+                signalBus.xmlProcessException.emit("PE_OuttaLines", "Critical error", content)
+        metrics.count("xml.substitute.translations", used_translations)
+        return entry_payloads, failed_lines
+
+    def substituteEntry(self, entry_index: int, localization: str) -> str | None:
+        """Replace the translation of a single entry in the output of the latest substitution.
+
+        Parameters
+        ----------
+        entry_index : int
+            Index of the entry in the parsed lines.
+
+        localization : str
+            The new translation of the entry.
 
+        Returns
+        -------
+        str | None
+            The updated output line of the entry. None if the entry has no output fragment.
+        """
+        rendered = self.renderEntry(entry_index, localization)
+        if rendered is None:
+            return None
+        return self.applyEntry(entry_index, *rendered)
+
+    def renderEntry(self, entry_index: int, localization: str) -> tuple[str, bool] | None:
+        """Create the payload of a single entry without modifying the output.
+        Safe to call from a worker thread.
+
+        Returns
+        -------
+        tuple[str, bool] | None
+            The payload and whether the translation failed. None if the entry has no output fragment.
+        """
+        if not self._output.hasFragment(self._write_lang_tag, entry_index):
+            return None
+        line = self._parsed_xml_lines[entry_index]
+        repl, failed = self._applyColorCodes(line, self._parsed_line_numbers[entry_index], localization)
+        return f"[CDATA[{repl}]]", failed
+
+    def applyEntry(self, entry_index: int, payload: str, failed: bool) -> str | None:
+        """Replace the payload of a single entry in the output with one created by renderEntry.
+
+        Returns
+        -------
+        str | None
+            The updated output line of the entry. None if the entry has no output fragment.
+        """
+        if entry_index >= len(self._parsed_xml_lines):
+            return None
+        line = self._parsed_xml_lines[entry_index]
+        output_line = self._output.replacePayload(self._write_lang_tag, entry_index, line, payload)
+        if output_line is None:
+            return None
+        if failed:
+            self._output.addFailedTranslation(line)
+        else:
+            # The previous translation of the entry might have failed
+            self._output.removeFailedTranslation(line)
+        return output_line
+
+    def _applyColorCodes(self, line: str, line_number: int, localization: str) -> tuple[str, bool]:
+        """ Apply the color codes of the source line to the translation. Returns the result and whether it failed """
+        if self._processColorCodes:
             # Only process color codes if the current line has any
-            if entry_id in entry_color_codes:
-                start_colors = entry_color_codes[entry_id]["start_color"] # type: list[str]
-                texts = entry_color_codes[entry_id]["text"] # type: list[str]
-                foundTexts = localization.split(f"{self._colorCodeDelim * self._colorCodeDelimSize}")
-                end_colors = entry_color_codes[entry_id]["end_color"] # type: list[str]
-
-                if len(texts) != len(foundTexts):
-                    self._failed_translations.append(line)
-                # Apply color tags to the translated text
-                # Note: Enable strict mode on zip to throw error if Iterables are not of equal size
-                # (i.e. color codes can't be applied)
-                repl = "".join(["".join(item) for item in zip(start_colors, foundTexts, end_colors)])
-        return repl
+            color_coded_text = self._parser.getEntryColorCodes().get(line_number)
+            if color_coded_text is not None:
+                return color_coded_text.apply(localization, self._colorCodeDelim * self._colorCodeDelimSize)
+        return localization, False
+
+    def writeOutput(self, dst_path: StrPath, patch: bool=False) -> None:
+        """Write the output of the latest substitution to a file.
+        Unchanged parts of the source are copied directly from the source buffer.
+
+        Parameters
+        ----------
+        dst_path : StrPath
+            Path-like object pointing to the output file.
+
+        patch : bool, optional
+            Only replace the write language block of the source file. Everything else is
+            copied verbatim from the source file instead of its sanitized form.
+            Falls back to writing the full output if the source file can't be patched.
+            By default False.
+        """
+        with metrics.timer("xml.save"):
+            self._output.write(dst_path, patch=patch)
+        metrics.publish()
+
+    def canPatch(self) -> bool:
+        return self._output.canPatch()
+
+    def getOutput(self) -> XMLOutput:
+        return self._output
+
+    def getOutputPlan(self) -> list[tuple[int, int] | str]:
+        return self._output.getPlan()
+
+    def getEntryOutputLine(self, entry_index: int) -> int:
+        """ Line index of the entry in the output of the latest substitution """
+        return self._output.getEntryOutputLine(self._write_lang_tag, entry_index)
+
+    def hasOutput(self) -> bool:
+        return bool(self._output.getPlan())
 
     def getPreviewXML(self) -> list[str]:
-        return self._preview_XML
+        """ The output of the latest substitution as decoded chunks of text """
+        return self._output.getPreviewXML()
 
     def getFailedTranslations(self) -> list[str]:
-        return self._failed_translations
\ No newline at end of file
+        return self._output.getFailedTranslations()
+
+    def isFailedTranslation(self, line: str) -> bool:
+        return self._output.isFailedTranslation(line)
+
+    def getFailedTranslationCount(self) -> int:
+        return self._output.getFailedTranslationCount()
@@ -1,15 +1,16 @@
-import re
 import traceback
+from itertools import islice
 from typing import Any, Iterable
 
 from app.common.signal_bus import signalBus
 
 from module.config.internal.app_args import AppArgs
 from module.logger import logger
+from module.tools.metrics import metrics
 from module.tools.types.config import BaseConfig
 from module.tools.utilities import formatListForDisplay
 from module.xml_tools import XMLParser, XMLSubstituter
-from module.xml_tools.regex_patterns import Pattern
+from module.xml_tools.regex_patterns import Pattern, getLanguageTag
 
 
 class XMLValidator():
@@ -20,15 +21,22 @@ class XMLValidator():
         self._config = config
         self._parser = parser
         self._substituter = substituter
+        # Result of validating the entry IDs of the latest preview
+        self._entryIDsValid = False
+        self._missingEntries = False
+        # Message of each entry which failed to translate, in the order of the substituter.
+        # Updated entry by entry when the live preview substitutes single entries
+        self._failed_messages = {} # type: dict[str, str]
 
     def _parseEntryIDs(self, preview: list[str], lang_tag: str) -> list[str]:
         entryIDs = [] # type: list[str]
+        language_tag = getLanguageTag(lang_tag)
         try:
             begin_search = False
             for line in preview:
                 if begin_search:
                     # Found language exit tag "</language". Thus, language extraction is complete
-                    if re.search(Pattern.language_exit, line):
+                    if Pattern.language_exit.search(line):
                         break
                     else:
                         try:
@@ -38,9 +46,9 @@ class XMLValidator():
                             pass
 
                 # Found language start tag "<language id="
-                if re.search(Pattern.language_start, line):
+                if Pattern.language_start.search(line):
                     # The language start tag is the one we're looking for
-                    if re.search((f"({lang_tag})(?=\">)"), line):
+                    if language_tag.matches(line):
                         begin_search = True
             return entryIDs
         except Exception:
@@ -54,6 +62,7 @@ class XMLValidator():
             I.e. find all values in source which are not in target
         """
         diff = []
+        target = set(target)
         for item in source:
             if item not in target:
                 diff.append(item)
@@ -62,9 +71,12 @@ class XMLValidator():
     def validatePreview(self, preview: list[str], extract_lang_tag: str, write_lang_tag: str) -> None:
         try:
             isValid, showErrors = True, False
-            extract_entryIDs = self._parseEntryIDs(preview, extract_lang_tag)
-            write_entryIDs = self._parseEntryIDs(preview, write_lang_tag)
-            diff = self.difference(extract_entryIDs, write_entryIDs)
+            with metrics.timer("xml.validate"):
+                extract_entryIDs = self._parseEntryIDs(preview, extract_lang_tag)
+                write_entryIDs = self._parseEntryIDs(preview, write_lang_tag)
+                diff = self.difference(extract_entryIDs, write_entryIDs)
+            metrics.count("xml.validate.entries", len(write_entryIDs))
+            metrics.count("xml.validate.missing", len(diff))
 
             # Empty set
             if not extract_entryIDs or not write_entryIDs:
@@ -79,22 +91,66 @@ class XMLValidator():
                 self._logger.warning(f"{msg}:\n  {formatListForDisplay(diff, message_size, join_string="\n  ")}")
                 signalBus.xmlValidationError.emit("VE_E1_BrokenTranslation", msg, formatListForDisplay(diff, message_size))
 
+            self._entryIDsValid, self._missingEntries = isValid, showErrors
+
             # Failed to translate some entries
-            _failed_translations = self._substituter.getFailedTranslations()
-            if _failed_translations:
+            self._failed_messages = {line: self._formatFailedTranslation(line) for line in self._substituter.getFailedTranslations()}
+            if self._validateFailedTranslations():
                 isValid, showErrors = False, True
-                line_positions = self._parser.getInputLinePositions()
-                fail_size = len(_failed_translations)
-                message_size = self._config.getValue("messageSize")
-                entry_grammar = "entries" if fail_size != 1 else "entry"
-                msg = f"Failed to translate {fail_size} {entry_grammar}"
-                content = [f"Line {line_positions[val]}: {re.search(Pattern.entry_id, val)[1]}" for val in _failed_translations]
-                self._logger.warning(f"{msg}:\n  {formatListForDisplay(content, message_size, join_string="\n  ")}")
-                signalBus.xmlValidationError.emit("VE_W1_FailTranslation", msg, formatListForDisplay(content, message_size))
 
             signalBus.xmlPreviewInvalid.emit(isValid, showErrors)
+            metrics.publish()
         except Exception:
             trace = traceback.format_exc(limit=AppArgs.traceback_limit)
             msg = "An unexpected exception occurred while validating XML"
             self._logger.error(msg + "\n" + trace)
-            signalBus.xmlProcessException.emit("PE_Validate", msg, trace)
\ No newline at end of file
+            signalBus.xmlProcessException.emit("PE_Validate", msg, trace)
+
+    def validateEntry(self, line: str, wasFailed: bool) -> None:
+        """Update the validity of the latest preview after a single entry was substituted again.
+        The entry IDs of the preview are unchanged, so only the translation of the entry is checked.
+
+        Parameters
+        ----------
+        line : str
+            The parsed line of the entry.
+
+        wasFailed : bool
+            The entry failed to translate before it was substituted again.
+        """
+        try:
+            isFailed = self._substituter.isFailedTranslation(line)
+            if isFailed == wasFailed:
+                # Nothing to report
+                return
+            if isFailed:
+                self._failed_messages[line] = self._formatFailedTranslation(line)
+            else:
+                self._failed_messages.pop(line, None)
+            isValid, showErrors = self._entryIDsValid, self._missingEntries
+            if self._validateFailedTranslations():
+                isValid, showErrors = False, True
+            signalBus.xmlPreviewInvalid.emit(isValid, showErrors)
+        except Exception:
+            trace = traceback.format_exc(limit=AppArgs.traceback_limit)
+            msg = "An unexpected exception occurred while validating XML"
+            self._logger.error(msg + "\n" + trace)
+            signalBus.xmlProcessException.emit("PE_Validate", msg, trace)
+
+    def _formatFailedTranslation(self, line: str) -> str:
+        return f"Line {self._parser.getInputLinePositions()[line]}: {Pattern.entry_id.search(line)[1]}"
+
+    def _validateFailedTranslations(self) -> bool:
+        """ Report entries the substituter failed to translate. Returns True if any failed """
+        fail_size = len(self._failed_messages)
+        if fail_size:
+            message_size = self._config.getValue("messageSize")
+            # Only the messages which are displayed are copied
+            content = list(self._failed_messages.values() if message_size == -1
+                           else islice(self._failed_messages.values(), message_size + 1))
+            entry_grammar = "entries" if fail_size != 1 else "entry"
+            msg = f"Failed to translate {fail_size} {entry_grammar}"
+            self._logger.warning(f"{msg}:\n  {formatListForDisplay(content, message_size, join_string="\n  ", total=fail_size)}")
+            signalBus.xmlValidationError.emit("VE_W1_FailTranslation", msg, formatListForDisplay(content, message_size, total=fail_size))
+            return True
+        return False
\ No newline at end of file